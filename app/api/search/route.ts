@@ -1,4 +1,5 @@
 import { NextRequest, NextResponse } from 'next/server';
+import { createHash } from 'crypto';
 import { readFile } from 'fs/promises';
 import path from 'path';
 import { SkillsData, Skill, DomainKey } from '../../lib/types';
@@ -56,15 +57,47 @@ const SMART_FACTORY_KEYWORDS: Array<{ term: string; weight: number }> = [
 ];
 
 const DATA_PATH = path.join(process.cwd(), 'public', 'data', 'skills.json');
+// scripts/generate-robot-smartfactory-data.py --route-search-index 로 생성
+const SEARCH_INDEX_PATH = path.join(process.cwd(), 'public', 'data', 'skills-search-index.json');
 let cachedData: SkillsData | null = null;
+let indexedBoosts: Map<string, number> | null = null;
+
+interface SearchIndex {
+  skill_ids: string[];
+  boosts: number[];
+  source?: { sha256?: string };
+}
 
 async function loadSkillsData(): Promise<SkillsData> {
   if (cachedData) return cachedData;
   const raw = await readFile(DATA_PATH, 'utf-8');
   cachedData = JSON.parse(raw) as SkillsData;
+  indexedBoosts = await loadIndexedBoosts(raw, flattenSkills(cachedData));
   return cachedData;
 }
 
+function boostKey(skill: FlatSkill): string {
+  return `${skill.domain.join(',')}\n${skill.id}`;
+}
+
+// 색인이 현재 skills.json으로 만들어진 경우에만 미리 계산된 가산점을 쓴다 (없거나 오래되면 직접 계산)
+async function loadIndexedBoosts(raw: string, flat: FlatSkill[]): Promise<Map<string, number> | null> {
+  let index: SearchIndex;
+  try {
+    index = JSON.parse(await readFile(SEARCH_INDEX_PATH, 'utf-8')) as SearchIndex;
+  } catch {
+    return null;
+  }
+  const digest = createHash('sha256').update(raw).digest('hex');
+  if (index.source?.sha256 !== digest || index.skill_ids.length !== flat.length) {
+    return null;
+  }
+  if (flat.some((skill, i) => index.skill_ids[i] !== skill.id)) {
+    return null;
+  }
+  return new Map(flat.map((skill, i) => [boostKey(skill), index.boosts[i]] as [string, number]));
+}
+
 function flattenSkills(data: SkillsData): FlatSkill[] {
   const flat: FlatSkill[] = [];
   (Object.keys(data) as DomainKey[]).forEach((domain) => {
@@ -87,6 +120,11 @@ interface SearchFilters {
 }
 
 function calculateSmartFactoryBoost(skill: FlatSkill): number {
+  const indexed = indexedBoosts?.get(boostKey(skill));
+  if (indexed !== undefined) {
+    return indexed;
+  }
+
   const haystack = `${skill.label} ${skill.description}`.toLowerCase();
   let score = 0;
 
@@ -0,0 +1,26 @@
+-- Migration: 003_snapshot_deltas.sql
+-- Description: ontology_snapshots를 base + 델타 체인으로 저장 (generate-robot-smartfactory-data.py --snapshot-sql이 적재 스크립트 생성)
+-- Dependencies: 002_temporal_kg.sql
+-- Created: 2026-10-17
+
+-- ============================================================================
+-- STEP 1: 스냅샷 체인 컬럼
+-- ============================================================================
+
+-- snapshot_kind = 'base'  : snapshot_data = {"seq", "records": [...]} (카탈로그 전체)
+-- snapshot_kind = 'delta' : snapshot_data = {"seq", "added", "removed", "changed", "order"?} (직전 버전 대비)
+-- 버전 N은 sequence <= N인 가장 최근 base에 이후 델타를 순서대로 적용해 복원한다.
+ALTER TABLE ontology_snapshots
+ADD COLUMN IF NOT EXISTS snapshot_kind TEXT NOT NULL DEFAULT 'base' CHECK (snapshot_kind IN ('base', 'delta')),
+ADD COLUMN IF NOT EXISTS sequence INTEGER,
+ADD COLUMN IF NOT EXISTS parent_snapshot_id UUID REFERENCES ontology_snapshots(id) ON DELETE CASCADE,
+ADD COLUMN IF NOT EXISTS content_hash TEXT;
+
+-- ============================================================================
+-- STEP 2: 인덱스
+-- ============================================================================
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_snapshots_domain_sequence ON ontology_snapshots(domain_id, sequence);
+CREATE INDEX IF NOT EXISTS idx_snapshots_domain_base
+    ON ontology_snapshots(domain_id, sequence DESC)
+    WHERE snapshot_kind = 'base';
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+로봇테크 for 스마트팩토리 생성기 벤치마크
+
+generate-robot-smartfactory-data.py의 DOMAINS/템플릿을 도메인 단위로 복제한
+합성 세트(replicated_templates, 기본 1k / 100k / 1M 스킬)로 단계별 성능을 측정한다.
+
+측정 단계 (단계마다 생성 스트림을 다시 소비):
+- generation    : iter_skill_records() 전체 소비
+- serialization : write_records()로 JSON 직렬화 (디스크 대신 null 싱크)
+- aggregation   : SkillStats 분포 집계
+
+serialization/aggregation은 생성 스트림을 CHUNK_RECORDS개씩 리스트로 받아 두고
+(시간 제외) 그 청크를 처리하는 시간만 합산하므로 생성 시간이 섞이지 않는다.
+단계마다 wall time, records/sec, tracemalloc 피크 메모리(청크 하나 포함)를 기록한다.
+
+사용 예:
+    python3 scripts/benchmark-robot-smartfactory.py --scales 1k,100k --save-baseline bench/baseline.json
+    python3 scripts/benchmark-robot-smartfactory.py --scales 1k,100k --compare bench/baseline.json
+"""
+
+import argparse
+import importlib.util
+import itertools
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+GENERATOR_PATH = Path(__file__).with_name("generate-robot-smartfactory-data.py")
+# 2: serialization/aggregation이 생성 스트림을 포함해 측정 (1과 비교 불가)
+# 3: serialization/aggregation에서 생성 시간을 제외 (2와 비교 불가)
+RESULT_VERSION = 3
+DEFAULT_SCALES = "1k,100k,1m"
+DEFAULT_TOLERANCE = 0.15
+# 이보다 짧은 단계는 측정 잡음이 커서 시간 회귀 비교에서 제외
+MIN_COMPARABLE_SECONDS = 0.05
+PHASES = ("generation", "serialization", "aggregation")
+# 처리 시간만 재기 위해 미리 만들어 두는 레코드 수 (메모리 상한)
+CHUNK_RECORDS = 10_000
+
+
+def load_generator():
+    """하이픈이 들어간 스크립트 파일을 모듈로 로드"""
+    spec = importlib.util.spec_from_file_location("generate_robot_smartfactory_data", GENERATOR_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def parse_scale(text: str) -> int:
+    text = text.strip().lower()
+    multiplier = {"k": 1_000, "m": 1_000_000}.get(text[-1:], 1)
+    digits = text[:-1] if multiplier > 1 else text
+    return int(float(digits) * multiplier)
+
+
+class NullWriter:
+    """직렬화 비용만 재기 위한 쓰기 싱크 (바이트 수만 센다)"""
+
+    def __init__(self):
+        self.chars = 0
+
+    def write(self, text: str) -> int:
+        self.chars += len(text)
+        return len(text)
+
+
+def record_chunks(gen, size: int = CHUNK_RECORDS) -> Iterator[List[Any]]:
+    """생성 스트림을 size개씩 미리 만든 리스트로 나눈다 (생성 시간을 처리 시간과 분리)"""
+    records = gen.iter_skill_records()
+    while True:
+        chunk = list(itertools.islice(records, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def measure(func: Callable[[], Optional[float]], records: int, track_memory: bool) -> Dict[str, Any]:
+    """func가 직접 잰 시간(초)을 돌려주면 그 값을, None이면 전체 wall time을 기록"""
+    if track_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    timed = func()
+    seconds = time.perf_counter() - start if timed is None else timed
+    peak = None
+    if track_memory:
+        _current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return {
+        "seconds": round(seconds, 6),
+        "records_per_sec": round(records / seconds, 1) if seconds > 0 else None,
+        "peak_bytes": peak,
+    }
+
+
+def run_scale(gen, target: int, repeat: int, track_memory: bool) -> Dict[str, Any]:
+    domains, store = gen.replicated_templates(target)
+    with gen.use_templates(domains, store):
+        # 전체를 모아 두지 않고 단계마다 생성기를 다시 소비한다 (피크 메모리 = 스트리밍 비용)
+        count = sum(1 for _record in gen.iter_skill_records())
+
+        def generation() -> None:
+            for _record in gen.iter_skill_records():
+                pass
+
+        def serialization() -> float:
+            writer = NullWriter()
+            seconds = 0.0
+            for chunk in record_chunks(gen):
+                start = time.perf_counter()
+                gen.write_records(chunk, writer, "json")
+                seconds += time.perf_counter() - start
+            return seconds
+
+        def aggregation() -> float:
+            stats = gen.SkillStats()
+            seconds = 0.0
+            for chunk in record_chunks(gen):
+                start = time.perf_counter()
+                for record in chunk:
+                    stats.add(record)
+                seconds += time.perf_counter() - start
+            start = time.perf_counter()
+            stats.by_domain, stats.by_type, stats.by_role, stats.by_proficiency
+            return seconds + time.perf_counter() - start
+
+        phases = {}
+        for name, func in (("generation", generation), ("serialization", serialization), ("aggregation", aggregation)):
+            # 시간은 tracemalloc 없이 best-of-N, 메모리는 별도 1회 측정
+            runs = [measure(func, count, False) for _ in range(repeat)]
+            best = min(runs, key=lambda run: run["seconds"])
+            if track_memory:
+                best["peak_bytes"] = measure(func, count, True)["peak_bytes"]
+            phases[name] = best
+
+    return {"records": count, "domains": len(domains), "phases": phases}
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """기준 대비 (1 + tolerance)배를 넘게 느려지거나 메모리가 늘어난 항목"""
+    regressions = []
+    for scale, current in results["results"].items():
+        previous = baseline.get("results", {}).get(scale)
+        if not previous:
+            continue
+        for phase in PHASES:
+            now, before = current["phases"].get(phase), previous["phases"].get(phase)
+            if not now or not before:
+                continue
+            for metric in ("seconds", "peak_bytes"):
+                if now.get(metric) is None or not before.get(metric):
+                    continue
+                if metric == "seconds" and before[metric] < MIN_COMPARABLE_SECONDS:
+                    continue
+                ratio = now[metric] / before[metric]
+                if ratio > 1 + tolerance:
+                    regressions.append(f"{scale} {phase} {metric}: {before[metric]} → {now[metric]} ({ratio:.2f}x)")
+    return regressions
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="로봇테크 for 스마트팩토리 생성기 벤치마크")
+    parser.add_argument("--scales", default=DEFAULT_SCALES, help=f"측정 규모 (기본: {DEFAULT_SCALES})")
+    parser.add_argument("--repeat", type=int, default=1, help="단계별 반복 횟수 (최솟값 기록, 기본: 1)")
+    parser.add_argument("--no-memory", action="store_true", help="tracemalloc 피크 메모리 측정 생략")
+    parser.add_argument("--output", type=Path, default=None, help="결과 JSON 기록 경로")
+    parser.add_argument("--save-baseline", type=Path, default=None, help="결과를 기준(baseline) 파일로 저장")
+    parser.add_argument("--compare", type=Path, default=None, help="기준 파일과 비교해 회귀가 있으면 종료 코드 1")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help=f"회귀로 판단하는 증가율 (기본: {DEFAULT_TOLERANCE})",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    gen = load_generator()
+
+    results: Dict[str, Any] = {
+        "version": RESULT_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": {},
+    }
+
+    print("⏱️  로봇테크 for 스마트팩토리 생성기 벤치마크")
+    for label in [scale.strip() for scale in args.scales.split(",") if scale.strip()]:
+        result = run_scale(gen, parse_scale(label), max(1, args.repeat), not args.no_memory)
+        results["results"][label] = result
+        print(f"\n📏 {label}: {result['records']:,}개 스킬 / {result['domains']}개 도메인")
+        for phase, metrics in result["phases"].items():
+            peak = metrics["peak_bytes"]
+            peak_text = f", 피크 {peak / 1_048_576:.1f} MiB" if peak is not None else ""
+            print(f"   {phase}: {metrics['seconds']:.3f}s ({metrics['records_per_sec']:,.0f} rec/s{peak_text})")
+
+    text = json.dumps(results, ensure_ascii=False, indent=2)
+    for path in (args.output, args.save_baseline):
+        if path:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(text, encoding="utf-8")
+            print(f"\n💾 결과 저장: {path}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        if baseline.get("version") != RESULT_VERSION:
+            print(f"\n❌ 기준 파일 버전 {baseline.get('version')} ≠ {RESULT_VERSION}: --save-baseline으로 다시 저장하세요")
+            return 1
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n❌ 회귀 {len(regressions)}건 (허용 {args.tolerance:.0%}):")
+            for line in regressions:
+                print(f"   {line}")
+            return 1
+        print(f"\n✅ 기준 대비 회귀 없음 (허용 {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
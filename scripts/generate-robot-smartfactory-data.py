@@ -11,426 +11,241 @@
 - 3개 역할 매핑 (Operator, Engineer, Developer)
 - proficiency_level 1~4 분포
 - 한영 병행 스킬명 및 설명
+
+도메인/템플릿 원본: scripts/data/robot-smartfactory/*.json
 """
 
+import argparse
+import base64
+import bisect
+import contextlib
+import cProfile
+import functools
+import gzip
+import hashlib
+import heapq
+import io
 import json
+import itertools
+import math
+import marshal
+import mmap
+import os
+import random
+import re
+import shutil
+import struct
 import uuid
 import sys
+import tempfile
+import time
+import tracemalloc
+import unicodedata
+from array import array
+from collections import Counter, deque
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import Any, BinaryIO, Callable, Collection, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+try:
+    import brotli  # 선택 의존성: 없으면 .br 사이드카를 건너뛴다
+except ImportError:
+    brotli = None
+
+try:
+    import numpy  # 선택 의존성: 있으면 임베딩 질의를 행렬 연산으로 처리
+except ImportError:
+    numpy = None
 
 # ==================== 데이터 구조 ====================
 
+# 도메인 목록과 도메인별 Knowledge/Skill/Competence 템플릿은 데이터 파일로 관리
+#   domains.json    - 도메인 키 → 이름/코드/목표 수 (출력 순서)
+#   <도메인>.json   - {"knowledge": [...], "skill": [[ko, en, desc_ko, desc_en], ...], "competence": [...]}
+TEMPLATE_DIR = Path(__file__).resolve().parent / "data" / "robot-smartfactory"
+# 스냅샷 캐시는 호출 위치(CWD)와 무관하게 저장소 루트 아래에 둔다
+TEMPLATE_CACHE_DIR = Path(__file__).resolve().parents[1] / ".cache" / "robot-smartfactory" / "templates"
+# 파이썬 버전마다 marshal 포맷이 달라질 수 있어 스냅샷 키에 함께 넣는다
+_SNAPSHOT_MAGIC = f"rsf-templates/1/{sys.version_info[0]}.{sys.version_info[1]}/{marshal.version}"
+
+
+class TemplateStore:
+    """
+    템플릿 데이터 파일 로더 (컴파일된 스냅샷 캐시 + 파일 단위 지연 로딩).
+
+    파싱 결과를 marshal 스냅샷으로 저장하고 원본의 (mtime, 크기)가 그대로면
+    스냅샷만 읽는다. mtime만 바뀌고 내용 해시가 같으면 스냅샷 키만 갱신한다.
+    도메인 템플릿은 처음 요청될 때 그 도메인 파일만 읽으므로, 도메인 수가 늘어도
+    모듈 import 비용은 domains.json 스냅샷 하나로 일정하다.
+    fallback이 있으면 이 디렉터리에 없는 파일은 fallback에서 읽는다 (조직별 덮어쓰기).
+    persist=False이면 스냅샷은 읽기만 하고, 쓸 내용은 enable_persist() 때까지 미뤄 둔다
+    (모듈 import만으로 캐시 파일이 생기지 않게).
+    """
+
+    def __init__(
+        self,
+        source_dir: Path,
+        cache_dir: Optional[Path],
+        fallback: Optional["TemplateStore"] = None,
+        persist: bool = True,
+    ):
+        self.source_dir = source_dir
+        self.cache_dir = cache_dir
+        self.fallback = fallback
+        self.persist = persist
+        self._loaded: Dict[str, Any] = {}
+        self._pending: Dict[Path, Tuple[os.stat_result, str, Any]] = {}
+
+    def _snapshot_path(self, name: str) -> Optional[Path]:
+        return self.cache_dir / f"{name}.marshal" if self.cache_dir else None
+
+    def _read_snapshot(self, path: Optional[Path]) -> Optional[Tuple[Any, ...]]:
+        if path is None:
+            return None
+        try:
+            snapshot = marshal.loads(path.read_bytes())
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        if not isinstance(snapshot, tuple) or len(snapshot) != 5 or snapshot[0] != _SNAPSHOT_MAGIC:
+            return None
+        return snapshot
+
+    def _write_snapshot(self, path: Optional[Path], stat: os.stat_result, digest: str, data: Any) -> None:
+        if path is None:
+            return
+        if not self.persist:
+            self._pending[path] = (stat, digest, data)
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f".{path.name}.tmp")
+            tmp_path.write_bytes(marshal.dumps((_SNAPSHOT_MAGIC, stat.st_mtime_ns, stat.st_size, digest, data)))
+            os.replace(tmp_path, path)
+        except OSError:
+            pass  # 캐시는 선택 사항: 읽기 전용 환경에서는 매번 파싱
+
+    def load(self, name: str) -> Any:
+        """템플릿 파일 하나(확장자 제외 이름)를 읽는다. 파일이 없으면 KeyError"""
+        if name in self._loaded:
+            return self._loaded[name]
+        source = self.source_dir / f"{name}.json"
+        try:
+            stat = source.stat()
+        except FileNotFoundError:
+            if self.fallback is not None:
+                return self.fallback.load(name)
+            raise KeyError(name) from None
+
+        snapshot_path = self._snapshot_path(name)
+        snapshot = self._read_snapshot(snapshot_path)
+        if snapshot and snapshot[1:3] == (stat.st_mtime_ns, stat.st_size):
+            data = snapshot[4]
+        else:
+            raw = source.read_bytes()
+            digest = hashlib.sha256(raw).hexdigest()
+            data = snapshot[4] if snapshot and snapshot[3] == digest else json.loads(raw)
+            self._write_snapshot(snapshot_path, stat, digest, data)
+
+        self._loaded[name] = data
+        return data
+
+    def enable_persist(self) -> None:
+        """스냅샷 쓰기를 켜고 미뤄 둔 스냅샷을 기록 (CLI 실행 시작 시)"""
+        self.persist = True
+        pending, self._pending = self._pending, {}
+        for path, (stat, digest, data) in pending.items():
+            self._write_snapshot(path, stat, digest, data)
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """메모리에 올린 파일을 버린다 (None이면 전부). 다음 load에서 다시 확인"""
+        if name is None:
+            self._loaded.clear()
+        else:
+            self._loaded.pop(name, None)
+
+
+class DomainTemplates(Mapping):
+    """도메인 키 → 템플릿 파일의 한 부분(section)을 지연 로딩하는 읽기 전용 매핑"""
+
+    def __init__(self, store: TemplateStore, domains: Dict[str, Any], sections: Tuple[str, ...]):
+        self.store = store
+        self.domains = domains
+        self.sections = sections
+
+    def __getitem__(self, domain: str) -> Any:
+        if domain not in self.domains:
+            raise KeyError(domain)
+        data = self.store.load(domain)
+        if len(self.sections) == 1:
+            return data.get(self.sections[0], [])
+        return {section: data[section] for section in self.sections if section in data}
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.domains)
+
+    def __len__(self) -> int:
+        return len(self.domains)
+
+
+TEMPLATES = TemplateStore(TEMPLATE_DIR, TEMPLATE_CACHE_DIR, persist=False)
+
 # 6개 도메인 정의
-DOMAINS = {
-    "industrial-robot-control": {
-        "name_ko": "산업용 로봇 제어",
-        "name_en": "Industrial Robot Control",
-        "code": "IRC",
-        "target_count": 22,
-    },
-    "machine-vision-sensor": {
-        "name_ko": "머신비전 & 센서 통합",
-        "name_en": "Machine Vision & Sensor Integration",
-        "code": "MVS",
-        "target_count": 21,
-    },
-    "collaborative-robot": {
-        "name_ko": "협동로봇 운용",
-        "name_en": "Collaborative Robot Operation",
-        "code": "CRO",
-        "target_count": 20,
-    },
-    "autonomous-mobile-robot": {
-        "name_ko": "자율이동로봇",
-        "name_en": "AMR/AGV Systems",
-        "code": "AMR",
-        "target_count": 22,
-    },
-    "robot-maintenance-diagnostics": {
-        "name_ko": "로봇 유지보수 & 진단",
-        "name_en": "Robot Maintenance & Diagnostics",
-        "code": "RMD",
-        "target_count": 20,
-    },
-    "digital-twin-simulation": {
-        "name_ko": "디지털트윈 & 시뮬레이션",
-        "name_en": "Digital Twin & Simulation",
-        "code": "DTS",
-        "target_count": 21,
-    },
-}
+DOMAINS = TEMPLATES.load("domains")
 
 # 3개 역할
 ROLES = ["operator", "engineer", "developer"]
 
-# ==================== 스킬 정의 (Knowledge) ====================
-
-KNOWLEDGE_SKILLS = {
-    "industrial-robot-control": [
-        {
-            "label_ko": "로봇 구조 및 운동학",
-            "label_en": "Robot Kinematics and Dynamics",
-            "description_ko": "로봇의 물리적 구조, 조인트 운동, 역운동학을 이해하는 기초 지식",
-            "description_en": "Fundamental knowledge of robot physical structure, joint motion, and inverse kinematics",
-            "proficiency": 1,
-        },
-        {
-            "label_ko": "로봇 제어 이론",
-            "label_en": "Robot Control Theory",
-            "description_ko": "PID 제어, 궤적 계획, 모션 제어의 이론적 기초",
-            "description_en": "Theoretical foundation of PID control, trajectory planning, and motion control",
-            "proficiency": 2,
-        },
-        {
-            "label_ko": "산업용 로봇 안전 기준",
-            "label_en": "Industrial Robot Safety Standards (ISO 10218)",
-            "description_ko": "ISO 10218, ANSI/NFPA 79 등 산업용 로봇 안전 표준 및 규제",
-            "description_en": "Safety standards and regulations for industrial robots including ISO 10218 and ANSI/NFPA 79",
-            "proficiency": 1,
-        },
-        {
-            "label_ko": "로봇 티칭 방법론",
-            "label_en": "Robot Teaching Methodologies",
-            "description_ko": "온라인 티칭, 오프라인 프로그래밍, 매뉴얼 가이딩 등 다양한 티칭 방식",
-            "description_en": "Various teaching approaches including online teaching, offline programming, and manual guiding",
-            "proficiency": 1,
-        },
-        {
-            "label_ko": "모션 플래닝 기초",
-            "label_en": "Motion Planning Fundamentals",
-            "description_ko": "경로 계획, 충돌 회피, 움직임 최적화의 기초 개념",
-            "description_en": "Fundamental concepts of path planning, collision avoidance, and motion optimization",
-            "proficiency": 2,
-        },
-    ],
-    "machine-vision-sensor": [
-        {
-            "label_ko": "디지털 이미지 처리",
-            "label_en": "Digital Image Processing",
-            "description_ko": "필터링, 엣지 검출, 화소 조작 등 이미지 처리 기초",
-            "description_en": "Fundamentals of image processing including filtering, edge detection, and pixel manipulation",
-            "proficiency": 2,
-        },
-        {
-            "label_ko": "머신비전 카메라 및 광학",
-            "label_en": "Machine Vision Cameras and Optics",
-            "description_ko": "카메라 센서 종류, 렌즈 특성, 조광 원리",
-            "description_en": "Camera sensor types, lens characteristics, and lighting principles",
-            "proficiency": 1,
-        },
-        {
-            "label_ko": "센서 신호 처리",
-            "label_en": "Sensor Signal Processing",
-            "description_ko": "아날로그-디지털 변환, 필터링, 노이즈 제거 기초",
-            "description_en": "Analog-to-digital conversion, filtering, and noise reduction fundamentals",
-            "proficiency": 2,
-        },
-        {
-            "label_ko": "컴퓨터 비전 알고리즘",
-            "label_en": "Computer Vision Algorithms",
-            "description_ko": "CNN, 특징 추출, 물체 인식 기초",
-            "description_en": "Fundamentals of CNNs, feature extraction, and object recognition",
-            "proficiency": 3,
-        },
-        {
-            "label_ko": "센서 캘리브레이션 이론",
-            "label_en": "Sensor Calibration Theory",
-            "description_ko": "카메라 캘리브레이션, 좌표 변환, 정확도 평가",
-            "description_en": "Camera calibration, coordinate transformation, and accuracy assessment",
-            "proficiency": 2,
-        },
-    ],
-    "collaborative-robot": [
-        {
-            "label_ko": "협동로봇 안전 개념",
-            "label_en": "Collaborative Robot Safety Concepts",
-            "description_ko": "ISO/TS 15066, 힘 제한, 속도 제한의 안전 원칙",
-            "description_en": "Safety principles including ISO/TS 15066, force limiting, and speed limiting",
-            "proficiency": 1,
-        },
-        {
-            "label_ko": "힘/토크 모니터링 원리",
-            "label_en": "Force/Torque Monitoring Principles",
-            "description_ko": "육축 센서, 임피던스 제어, 힘 피드백 제어",
-            "description_en": "Six-axis sensors, impedance control, and force feedback control",
-            "proficiency": 2,
-        },
-        {
-            "label_ko": "사용자 친화적 프로그래밍",
-            "label_en": "User-Friendly Programming Interfaces",
-            "description_ko": "드래그-앤-드롭, 그래픽 프로그래밍, 음성 인터페이스",
-            "description_en": "Drag-and-drop, graphical programming, and voice interfaces",
-            "proficiency": 1,
-        },
-        {
-            "label_ko": "협동로봇 산업 응용",
-            "label_en": "Collaborative Robot Industrial Applications",
-            "description_ko": "조립, 검사, 포장 등 협동 로봇의 주요 응용 사례",
-            "description_en": "Key collaborative robot applications in assembly, inspection, and packaging",
-            "proficiency": 2,
-        },
-        {
-            "label_ko": "인간공학 및 인적 요소",
-            "label_en": "Ergonomics and Human Factors",
-            "description_ko": "작업 설계, 사용자 편의성, 피로도 관리",
-            "description_en": "Job design, user convenience, and fatigue management",
-            "proficiency": 2,
-        },
-    ],
-    "autonomous-mobile-robot": [
-        {
-            "label_ko": "SLAM 개념",
-            "label_en": "Simultaneous Localization and Mapping (SLAM)",
-            "description_ko": "동시 위치 파악 및 맵 작성의 기초 이론",
-            "description_en": "Fundamental theory of simultaneous localization and mapping",
-            "proficiency": 3,
-        },
-        {
-            "label_ko": "경로 계획 알고리즘",
-            "label_en": "Path Planning Algorithms",
-            "description_ko": "Dijkstra, A*, RRT 등 주요 경로 계획 알고리즘",
-            "description_en": "Major path planning algorithms including Dijkstra, A*, and RRT",
-            "proficiency": 3,
-        },
-        {
-            "label_ko": "차량 동역학 및 제어",
-            "label_en": "Vehicle Dynamics and Control",
-            "description_ko": "휠 기구학, 속도 제어, 조향 제어",
-            "description_en": "Wheel kinematics, velocity control, and steering control",
-            "proficiency": 2,
-        },
-        {
-            "label_ko": "무선 네트워크 및 통신",
-            "label_en": "Wireless Networks and Communication Protocols",
-            "description_ko": "WiFi, 5G, ROS 통신, 지연 및 안정성",
-            "description_en": "WiFi, 5G, ROS communication, latency, and reliability",
-            "proficiency": 2,
-        },
-        {
-            "label_ko": "함대 관리 시스템",
-            "label_en": "Fleet Management Systems",
-            "description_ko": "멀티-로봇 조율, 중앙 제어, 교통 관제",
-            "description_en": "Multi-robot coordination, centralized control, and traffic management",
-            "proficiency": 3,
-        },
-    ],
-    "robot-maintenance-diagnostics": [
-        {
-            "label_ko": "로봇 부품 분류 및 수명 관리",
-            "label_en": "Robot Component Classification and Life Management",
-            "description_ko": "BOM(자재명세서), MTBF, 부품 수명 예측",
-            "description_en": "BOM, MTBF, and component lifespan prediction",
-            "proficiency": 2,
-        },
-        {
-            "label_ko": "신뢰성 공학",
-            "label_en": "Reliability Engineering",
-            "description_ko": "MTBF, MTTF, 가용성, 신뢰도 분석",
-            "description_en": "MTBF, MTTF, availability, and reliability analysis",
-            "proficiency": 2,
-        },
-        {
-            "label_ko": "예방적 유지보수 전략",
-            "label_en": "Preventive Maintenance Strategies",
-            "description_ko": "예방적 유지보수(PM), 예측적 유지보수(PdM), 상태 기반 유지보수",
-            "description_en": "Preventive maintenance (PM), predictive maintenance (PdM), and condition-based maintenance",
-            "proficiency": 2,
-        },
-        {
-            "label_ko": "로봇 진단 도구 및 로깅",
-            "label_en": "Robot Diagnostics Tools and Logging Systems",
-            "description_ko": "고장 코드, 센서 로깅, 성능 지표",
-            "description_en": "Fault codes, sensor logging, and performance metrics",
-            "proficiency": 2,
-        },
-        {
-            "label_ko": "윤활유 및 냉각액 관리",
-            "label_en": "Lubricant and Coolant Management",
-            "description_ko": "윤활유 종류, 냉각 시스템, 품질 관리",
-            "description_en": "Lubricant types, cooling systems, and quality management",
-            "proficiency": 1,
-        },
-    ],
-    "digital-twin-simulation": [
-        {
-            "label_ko": "디지털트윈 아키텍처",
-            "label_en": "Digital Twin Architecture",
-            "description_ko": "물리 시스템과 디지털 복제본의 동기화 아키텍처",
-            "description_en": "Synchronization architecture between physical systems and digital replicas",
-            "proficiency": 3,
-        },
-        {
-            "label_ko": "물리 시뮬레이션 엔진",
-            "label_en": "Physics Simulation Engines",
-            "description_ko": "Gazebo, CoppeliaSim, Isaac Sim 등 시뮬레이션 플랫폼",
-            "description_en": "Simulation platforms including Gazebo, CoppeliaSim, and Isaac Sim",
-            "proficiency": 2,
-        },
-        {
-            "label_ko": "3D 모델링 및 메시 생성",
-            "label_en": "3D Modeling and Mesh Generation",
-            "description_ko": "CAD, STL, URDF, 메시 최적화",
-            "description_en": "CAD, STL, URDF, and mesh optimization",
-            "proficiency": 2,
-        },
-        {
-            "label_ko": "로봇 시뮬레이션 소프트웨어",
-            "label_en": "Robot Simulation Software",
-            "description_ko": "ROS, MoveIt, URSim 등 로봇 시뮬레이션 플랫폼",
-            "description_en": "Robot simulation platforms including ROS, MoveIt, and URSim",
-            "proficiency": 3,
-        },
-        {
-            "label_ko": "실시간 데이터 파이프라인",
-            "label_en": "Real-Time Data Pipelines",
-            "description_ko": "센서 데이터 수집, 스트리밍, 클라우드 연결",
-            "description_en": "Sensor data collection, streaming, and cloud integration",
-            "proficiency": 3,
-        },
-    ],
-}
-
-# ==================== 스킬 정의 (Skill & Competence) ====================
-
-SKILL_COMPETENCE_TEMPLATES = {
-    "industrial-robot-control": {
-        "skill": [
-            ("로봇 매뉴얼 티칭", "Robot Manual Teaching", "손으로 로봇 팔을 조작하여 작업 경로를 기록", "Record work paths by manually manipulating robot arm"),
-            ("로봇 프로그래밍", "Robot Programming", "로봇 고유 언어(RAPID, KRL 등)로 프로그래밍", "Program using robot-specific languages (RAPID, KRL, etc.)"),
-            ("좌표계 설정 및 보정", "Coordinate Frame Setup and Calibration", "로봇의 기준점을 설정하고 정확성 검증", "Set robot reference points and validate accuracy"),
-            ("모션 제어 파라미터 조정", "Motion Control Parameter Adjustment", "속도, 가속도, 감속도 등 파라미터 최적화", "Optimize parameters such as speed and acceleration"),
-            ("경로 최적화", "Path Optimization", "충돌 회피하면서 이동 거리 최소화", "Minimize travel distance while avoiding collisions"),
-            ("로봇 안전 설정", "Robot Safety Configuration", "안전 펜스, 속도 제한 등 안전 기능 설정", "Configure safety features including fences and speed limits"),
-            ("시뮬레이션 기반 프로그래밍", "Simulation-Based Programming", "시뮬레이션 환경에서 프로그램 테스트", "Test programs in simulation environment"),
-            ("다축 동기 제어", "Multi-Axis Synchronized Control", "여러 로봇의 협력 동작 제어", "Control coordinated movements of multiple robots"),
-            ("센서 입출력 처리", "Sensor Input/Output Processing", "센서 신호를 로봇 동작에 반영", "Integrate sensor signals into robot motion"),
-            ("에러 로그 분석", "Error Log Analysis", "로봇 에러 코드 해석 및 해결 방법 찾기", "Interpret robot error codes and find solutions"),
-        ],
-        "competence": [
-            ("생산 라인 로봇 운용", "Production Line Robot Operation", "실제 제조 환경에서 로봇 운용", "Operate robots in actual manufacturing environment"),
-            ("사이클 타임 달성", "Cycle Time Achievement", "정해진 시간 내에 작업 완료", "Complete work within specified cycle time"),
-            ("로봇 고장 대응", "Robot Fault Response", "로봇 오류 발생 시 신속한 진단 및 복구", "Quickly diagnose and recover from robot failures"),
-            ("작업 문서화", "Work Documentation", "프로그램 및 설정 내용 상세히 기록", "Document programs and configurations in detail"),
-            ("라인 밸런싱", "Line Balancing", "여러 로봇의 작업 시간을 균등하게 배분", "Balance work time across multiple robots"),
-            ("협력업체 기술 지원", "Technical Support to Contractors", "외부 인력에게 로봇 운용 방법 교육", "Train external staff on robot operation"),
-            ("생산성 향상 제안", "Productivity Improvement Proposal", "로봇 운용 효율성 개선 방안 제시", "Propose improvements to robot operation efficiency"),
-        ],
-    },
-    "machine-vision-sensor": {
-        "skill": [
-            ("카메라 설정 및 조광", "Camera Setup and Illumination Adjustment", "카메라 해상도, 노출, 포커스 조정", "Adjust camera resolution, exposure, and focus"),
-            ("이미지 기반 결함 검출", "Image-Based Defect Detection", "비전 소프트웨어를 이용한 결함 검출 설정", "Configure defect detection using vision software"),
-            ("센서 신호 수집 및 필터링", "Sensor Signal Acquisition and Filtering", "여러 센서에서 신호 수집 및 노이즈 제거", "Collect sensor signals and remove noise"),
-            ("센서-로봇 동기화", "Sensor-Robot Synchronization", "센서 신호를 로봇 동작과 동기화", "Synchronize sensor signals with robot motion"),
-            ("시뮬레이션 비전 파이프라인", "Simulation Vision Pipeline", "시뮬레이션 환경에서 비전 시스템 구성", "Configure vision system in simulation"),
-            ("카메라 캘리브레이션", "Camera Calibration", "카메라의 왜곡 보정 및 좌표 변환", "Correct camera distortion and coordinate transformation"),
-            ("특징 추출 및 매칭", "Feature Extraction and Matching", "이미지에서 특징 찾기 및 매칭", "Extract and match features in images"),
-            ("실시간 이미지 처리", "Real-Time Image Processing", "고속으로 이미지를 처리하고 결과 전달", "Process images in real-time and deliver results"),
-            ("멀티 센서 융합", "Multi-Sensor Fusion", "여러 센서의 정보를 통합하여 의사결정", "Integrate information from multiple sensors for decision-making"),
-        ],
-        "competence": [
-            ("제조 환경 비전 시스템 구축", "Manufacturing Vision System Implementation", "실제 제조 라인에 비전 시스템 설치 및 검증", "Install and verify vision system on actual production line"),
-            ("검출율 목표 달성", "Defect Detection Rate Achievement", "정해진 검출율(95% 이상) 달성", "Achieve specified detection rate (95% or higher)"),
-            ("센서 고장 진단", "Sensor Fault Diagnosis", "센서 고장을 정확히 식별하고 원인 파악", "Identify sensor faults and determine root causes"),
-            ("대체 센서 제안", "Alternative Sensor Proposal", "고장난 센서 대신 다른 센서 제안 및 적용", "Propose and implement alternative sensors"),
-            ("센서 데이터 로깅", "Sensor Data Logging", "센서 데이터를 자동으로 기록하고 분석", "Automatically log and analyze sensor data"),
-            ("성능 보고서 작성", "Performance Report Generation", "비전 시스템 성능 지표 정리 및 보고", "Compile and report vision system performance metrics"),
-            ("카메라 교체 작업", "Camera Replacement", "고장난 카메라를 신제품으로 교체", "Replace faulty cameras with new ones"),
-        ],
-    },
-    "collaborative-robot": {
-        "skill": [
-            ("협동로봇 안전 설정", "Collaborative Robot Safety Configuration", "속도 제한, 힘 제한, 안전 영역 설정", "Configure speed limits, force limits, and safety zones"),
-            ("드래그-앤-드롭 티칭", "Drag-and-Drop Teaching", "GUI를 통한 간편 티칭", "Teach using graphical user interface"),
-            ("협동로봇 프로그래밍", "Collaborative Robot Programming", "URScript, Python 등으로 협동로봇 프로그래밍", "Program collaborative robots using URScript, Python, etc."),
-            ("인간-로봇 상호작용 설계", "Human-Robot Interaction Design", "안전한 협동 작업 시나리오 설계", "Design safe collaborative work scenarios"),
-            ("협동 작업 태스크 분석", "Collaborative Task Analysis", "인간과 로봇의 작업 분담 계획", "Plan task allocation between human and robot"),
-            ("터치 감지 및 안전 반응", "Touch Sensing and Safety Response", "접촉 감지 시 로봇의 안전한 반응 설정", "Configure safe robot reactions to touch detection"),
-            ("협동 작업 시뮬레이션", "Collaborative Work Simulation", "시뮬레이션에서 인간-로봇 협력 검증", "Verify human-robot collaboration in simulation"),
-            ("사용자 안전 교육", "User Safety Training", "협동로봇 사용자에게 안전 교육", "Provide safety training to collaborative robot users"),
-            ("힘 제어 파라미터 튜닝", "Force Control Parameter Tuning", "힘 제어의 감도 및 응답성 조정", "Adjust force control sensitivity and responsiveness"),
-        ],
-        "competence": [
-            ("협동 워크셀 안전성 검증", "Collaborative Workcell Safety Verification", "실제 환경에서 협동 작업의 안전성 확인", "Verify safety of collaborative operations in actual environment"),
-            ("사용자 가이드 작성", "User Guide Documentation", "협동로봇 사용자를 위한 상세 매뉴얼 작성", "Write detailed manual for collaborative robot users"),
-            ("협동 작업 사이클 타임 측정", "Collaborative Work Cycle Time Measurement", "인간-로봇 협력 작업의 소요 시간 측정", "Measure time required for human-robot collaborative work"),
-            ("안전성 평가 보고서", "Safety Assessment Report", "협동 작업의 안전성 평가 결과 보고", "Report safety assessment results for collaborative work"),
-            ("작업 개선 제안", "Work Improvement Proposal", "협동 작업 효율 개선 방안 제안", "Propose improvements to collaborative work efficiency"),
-            ("인간공학 평가", "Ergonomic Assessment", "작업자의 피로도 및 편의성 평가", "Assess worker fatigue and convenience"),
-            ("협동 로봇 배치 최적화", "Collaborative Robot Placement Optimization", "작업 공간 내 협동로봇의 최적 위치 결정", "Determine optimal placement of collaborative robots in workspace"),
-        ],
-    },
-    "autonomous-mobile-robot": {
-        "skill": [
-            ("환경 맵 작성", "Environment Mapping", "LiDAR, 카메라를 이용한 환경 맵 생성", "Generate environment map using LiDAR and camera"),
-            ("경로 계획 매개변수 조정", "Path Planning Parameter Adjustment", "목표점까지의 경로 계획 최적화", "Optimize path planning to destination"),
-            ("충돌 회피 설정", "Collision Avoidance Configuration", "장애물 감지 및 회피 설정", "Configure obstacle detection and avoidance"),
-            ("멀티-로봇 교통 관제", "Multi-Robot Traffic Management", "여러 AMR의 움직임을 조율하여 충돌 방지", "Coordinate movements of multiple AMRs to prevent collisions"),
-            ("함대 성능 모니터링", "Fleet Performance Monitoring", "전체 함대의 운영 현황 모니터링", "Monitor operational status of entire robot fleet"),
-            ("GPS 및 GNSS 활용", "GPS and GNSS Utilization", "글로벌 위치 정보를 이용한 네비게이션", "Navigation using global positioning information"),
-            ("수동 조종 모드", "Manual Control Mode", "필요시 원격으로 AMR 제어", "Remotely control AMR when necessary"),
-            ("스테이션 도킹 설정", "Station Docking Configuration", "충전소 및 화물 거래소 자동 도킹 설정", "Configure automatic docking at charging and transfer stations"),
-            ("네트워크 통신 설정", "Network Communication Configuration", "중앙 제어 시스템과 통신 설정", "Configure communication with central control system"),
-        ],
-        "competence": [
-            ("제조 환경 맵 생성", "Manufacturing Environment Mapping", "실제 제조 현장의 정확한 맵 생성", "Generate accurate map of actual manufacturing facility"),
-            ("맵 정확도 검증", "Map Accuracy Verification", "생성된 맵의 정확성 확인 및 개선", "Verify and improve accuracy of generated map"),
-            ("자율 주행 운영", "Autonomous Navigation Operation", "정해진 경로 내에서 자율 주행 실현", "Achieve autonomous navigation within specified routes"),
-            ("충돌 발생 시 분석", "Collision Incident Analysis", "충돌 발생 원인 파악 및 개선", "Identify causes of collisions and improve"),
-            ("운영 매뉴얼 작성", "Operations Manual Documentation", "AMR 운영자를 위한 상세 매뉴얼 작성", "Write detailed manual for AMR operators"),
-            ("성능 지표 분석", "Performance Metrics Analysis", "주행 거리, 배터리 소모, 업타임 등 분석", "Analyze traveled distance, battery consumption, uptime, etc."),
-            ("확장성 계획", "Scalability Planning", "로봇 수 증가 시 시스템 확장 방안", "Plan system expansion as robot count increases"),
-        ],
-    },
-    "robot-maintenance-diagnostics": {
-        "skill": [
-            ("로봇 상태 모니터링", "Robot Status Monitoring", "센서 데이터를 통한 로봇 상태 실시간 모니터링", "Real-time robot status monitoring through sensor data"),
-            ("트렌드 분석", "Trend Analysis", "시간에 따른 성능 변화 추적 및 분석", "Track and analyze performance changes over time"),
-            ("고장 코드 해석", "Fault Code Interpretation", "로봇 진단 코드의 의미 파악", "Understand robot diagnostic codes"),
-            ("베어링 검사 및 교체", "Bearing Inspection and Replacement", "베어링 마모 상태 확인 및 교체", "Check bearing wear and replace"),
-            ("기어 및 모터 검사", "Gear and Motor Inspection", "기어 손상, 모터 성능 검사", "Inspect gear damage and motor performance"),
-            ("소프트웨어 업그레이드", "Software Upgrade", "로봇 펌웨어 및 소프트웨어 업데이트", "Update robot firmware and software"),
-            ("성능 벤치마크 테스트", "Performance Benchmark Testing", "정해진 기준으로 로봇 성능 측정", "Measure robot performance against standards"),
-            ("부품 청소 및 검사", "Component Cleaning and Inspection", "부품의 먼지, 이물질 제거 및 상태 확인", "Clean components and check condition"),
-            ("윤활유 교체", "Lubricant Replacement", "로봇 관절 및 기어의 윤활유 교체", "Replace lubricant in robot joints and gears"),
-        ],
-        "competence": [
-            ("예방적 유지보수 계획 수립", "Preventive Maintenance Plan Development", "장기 유지보수 일정 개발 및 실행", "Develop and execute long-term maintenance schedule"),
-            ("긴급 고장 대응", "Emergency Fault Response", "생산 중단 상황에서 신속한 복구", "Quickly restore service during production stoppage"),
-            ("부품 수명 예측", "Component Lifespan Prediction", "부품 교체 시기 미리 예측", "Predict when components need replacement"),
-            ("재고 관리", "Spare Parts Inventory Management", "필요한 예비 부품 보유 및 관리", "Maintain and manage spare parts inventory"),
-            ("유지보수 보고서 작성", "Maintenance Report Documentation", "유지보수 활동 상세 기록 및 보고", "Document and report maintenance activities in detail"),
-            ("성능 지표 개선", "Performance Metrics Improvement", "가동률, 신뢰도 등 개선", "Improve availability, reliability, and other metrics"),
-            ("부품 공급업체 관리", "Supplier Relationship Management", "부품 공급업체와의 협력 및 품질 관리", "Collaborate with suppliers and manage quality"),
-        ],
-    },
-    "digital-twin-simulation": {
-        "skill": [
-            ("3D 모델 CAD 임포트", "3D CAD Model Import", "CAD 파일을 시뮬레이션 환경으로 가져오기", "Import CAD files into simulation environment"),
-            ("로봇 시뮬레이션 환경 구성", "Robot Simulation Environment Setup", "Gazebo, CoppeliaSim 등에서 로봇 환경 설정", "Configure robot environment in Gazebo, CoppeliaSim, etc."),
-            ("생산 라인 레이아웃 검증", "Production Line Layout Validation", "장비 배치의 충돌 여부 확인", "Verify equipment placement for collisions"),
-            ("사이클 타임 시뮬레이션", "Cycle Time Simulation", "프로그램 실행 시간 측정", "Measure program execution time"),
-            ("실제 로봇 동기화", "Real Robot Synchronization", "시뮬레이션과 실제 로봇 동기화", "Synchronize simulation with actual robot"),
-            ("성능 데이터 수집", "Performance Data Collection", "시뮬레이션에서 성능 지표 추출", "Extract performance metrics from simulation"),
-            ("시나리오 시뮬레이션", "Scenario Simulation", "고장, 병목 상황 시뮬레이션", "Simulate failure and bottleneck scenarios"),
-            ("최적화 시뮬레이션", "Optimization Simulation", "최적의 파라미터 찾기 위한 시뮬레이션", "Simulate to find optimal parameters"),
-            ("결과 분석 및 시각화", "Result Analysis and Visualization", "시뮬레이션 결과를 그래프, 표로 표현", "Present simulation results as graphs and tables"),
-        ],
-        "competence": [
-            ("신규 라인 설계 시뮬레이션", "New Production Line Design Simulation", "신규 제조 라인 설계 시 시뮬레이션 검증 완료", "Complete simulation validation for new production line design"),
-            ("설계 리스크 식별", "Design Risk Identification", "시뮬레이션 기반 설계 문제 사전 발견", "Identify design issues through simulation before implementation"),
-            ("운영 시나리오 시뮬레이션", "Operational Scenario Simulation", "고장, 지연 등 운영 상황 사전 검토", "Pre-evaluate operational situations including failures and delays"),
-            ("최적화된 사이클 타임 달성", "Optimized Cycle Time Achievement", "시뮬레이션으로 검증된 최적 사이클 타임 달성", "Achieve optimized cycle time verified through simulation"),
-            ("디지털트윈 유지보수", "Digital Twin Maintenance", "시뮬레이션 모델을 최신 상태로 유지", "Keep simulation model up to date"),
-            ("설계-운영 연동", "Design-Operations Integration", "설계 변경 사항을 빠르게 운영에 반영", "Quickly reflect design changes in operations"),
-            ("의사결정 지원", "Decision Support", "시뮬레이션 기반 운영 개선 방안 제시", "Propose operational improvements based on simulation"),
-        ],
-    },
-}
+KNOWLEDGE_SKILLS = DomainTemplates(TEMPLATES, DOMAINS, ("knowledge",))
+SKILL_COMPETENCE_TEMPLATES = DomainTemplates(TEMPLATES, DOMAINS, ("skill", "competence"))
 
 # ==================== 메인 데이터 생성 로직 ====================
 
+SKILL_TYPES = ("knowledge", "skill", "competence")
+
+
+class InternTable:
+    """반복되는 문자열을 작은 정수 코드로 intern (코드는 등록 순서대로 0부터)"""
+
+    __slots__ = ("values", "_codes")
+
+    def __init__(self, values: Iterable[str] = ()):
+        self.values: List[str] = []
+        self._codes: Dict[str, int] = {}
+        for value in values:
+            self.code(value)
+
+    def code(self, value: str) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self._codes[value] = code
+            self.values.append(value)
+        return code
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+DOMAIN_TABLE = InternTable(DOMAINS)
+SKILL_TYPE_TABLE = InternTable(SKILL_TYPES)
+
+# 역할은 ROLES 순서의 비트마스크로 보관한다 (role_mapping도 이 순서로 직렬화).
+ROLE_BITS = {role: 1 << i for i, role in enumerate(ROLES)}
+
+
+def role_mask(roles: Iterable[str]) -> int:
+    mask = 0
+    for role in roles:
+        mask |= ROLE_BITS[role]
+    return mask
+
+
+def roles_from_mask(mask: int) -> List[str]:
+    return [role for role in ROLES if mask & ROLE_BITS[role]]
+
+
 def generate_skill_id(domain_code: str, index: int) -> str:
     """스킬 ID 생성: RSF-[도메인코드]-[번호]"""
     return f"RSF-{domain_code}-{index:03d}"
@@ -442,188 +257,4416 @@ def generate_esco_uri(domain_code: str, index: int) -> str:
     return f"http://data.europa.eu/esco/skill/rsf-{domain_code.lower()}-{index:04d}"
 
 
-def create_skill_object(
-    domain: str,
-    domain_code: str,
-    skill_type: str,  # "knowledge", "skill", "competence"
-    label_ko: str,
-    label_en: str,
-    description_ko: str,
-    description_en: str,
-    proficiency_level: int,
-    role_mappings: List[str],
-    parent_skill_id: str = None,
-    related_skills: List[str] = None,
-    smartfactory_context: str = None,
-    index: int = 1,
-) -> Dict[str, Any]:
-    """스킬 객체 생성"""
-    skill_id = generate_skill_id(domain_code, index)
-
-    return {
-        "skill_id": skill_id,
-        "domain": domain,
-        "domain_en": DOMAINS[domain]["name_en"],
-        "esco_uri": generate_esco_uri(domain_code, index),
-        "preferred_label_ko": label_ko,
-        "preferred_label_en": label_en,
-        "description_ko": description_ko,
-        "description_en": description_en,
-        "skill_type": skill_type,
-        "proficiency_level": proficiency_level,
-        "role_mapping": role_mappings,
-        "parent_skill_id": parent_skill_id,
-        "related_skills": related_skills or [],
-        "esco_broader": None,
-        "smartfactory_context": smartfactory_context,
-    }
+class SkillRecord:
+    """
+    스킬 하나의 compact 표현.
 
+    도메인/타입은 intern 코드, 역할은 비트마스크, 부모는 도메인 내 번호로 보관하고
+    레이블·설명은 템플릿 문자열을 그대로 참조한다. skill_id, esco_uri(실제 ESCO
+    매칭이 없을 때), smartfactory_context 같은 파생 문자열은 to_dict()에서
+    직렬화할 때만 만든다.
+    """
 
-def generate_robot_smartfactory_data() -> List[Dict[str, Any]]:
-    """전체 로봇테크 for 스마트팩토리 데이터 생성"""
-    all_skills = []
+    __slots__ = (
+        "domain_idx",
+        "type_idx",
+        "index",
+        "label_ko",
+        "label_en",
+        "description_ko",
+        "description_en",
+        "proficiency_level",
+        "role_mask",
+        "parent_index",
+        "related_skills",
+        "esco_uri",
+        "esco_broader",
+        "context",
+    )
 
-    for domain, domain_info in DOMAINS.items():
+    # skill_type별 smartfactory_context 형식 (context가 None일 때 사용)
+    CONTEXT_FORMATS = (
+        "{domain_ko}의 이론적 기초",
+        "{domain_ko} 현장에서 {label_ko} 역량 구현",
+        "현장 검증: {label_ko} 수행 능력 입증",
+    )
+
+    def __init__(
+        self,
+        domain_idx: int,
+        type_idx: int,
+        index: int,
+        label_ko: str,
+        label_en: str,
+        description_ko: str,
+        description_en: str,
+        proficiency_level: int,
+        role_mask: int,
+        parent_index: int = 0,
+        related_skills: Optional[List[str]] = None,
+        esco_uri: Optional[str] = None,
+        esco_broader: Optional[str] = None,
+        context: Optional[str] = None,
+    ):
+        self.domain_idx = domain_idx
+        self.type_idx = type_idx
+        self.index = index
+        self.label_ko = label_ko
+        self.label_en = label_en
+        self.description_ko = description_ko
+        self.description_en = description_en
+        self.proficiency_level = proficiency_level
+        self.role_mask = role_mask
+        self.parent_index = parent_index
+        self.related_skills = related_skills
+        self.esco_uri = esco_uri
+        self.esco_broader = esco_broader
+        self.context = context
+
+    @property
+    def domain(self) -> str:
+        return DOMAIN_TABLE.values[self.domain_idx]
+
+    @property
+    def skill_type(self) -> str:
+        return SKILL_TYPE_TABLE.values[self.type_idx]
+
+    @property
+    def skill_id(self) -> str:
+        return generate_skill_id(DOMAINS[self.domain]["code"], self.index)
+
+    @property
+    def parent_skill_id(self) -> Optional[str]:
+        if not self.parent_index:
+            return None
+        return generate_skill_id(DOMAINS[self.domain]["code"], self.parent_index)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """현재 JSON 스키마(15개 키)로 변환"""
+        domain = self.domain
+        domain_info = DOMAINS[domain]
         domain_code = domain_info["code"]
-        index = 1
-
-        # Knowledge 스킬 생성
-        knowledge_list = KNOWLEDGE_SKILLS.get(domain, [])
-        for kn in knowledge_list:
-            skill = create_skill_object(
-                domain=domain,
-                domain_code=domain_code,
-                skill_type="knowledge",
-                label_ko=kn["label_ko"],
-                label_en=kn["label_en"],
-                description_ko=kn["description_ko"],
-                description_en=kn["description_en"],
-                proficiency_level=kn["proficiency"],
-                role_mappings=["engineer", "developer"],  # Knowledge는 엔지니어, 개발자 대상
-                smartfactory_context=f"{domain_info['name_ko']}의 이론적 기초",
-                index=index,
-            )
-            all_skills.append(skill)
-            index += 1
-
-        # Skill 및 Competence 생성
-        skill_competence = SKILL_COMPETENCE_TEMPLATES.get(domain, {})
-        skill_list = skill_competence.get("skill", [])
-        competence_list = skill_competence.get("competence", [])
-
-        # Skill 스킬 생성
-        for i, (label_ko, label_en, desc_ko, desc_en) in enumerate(skill_list):
-            # proficiency_level은 스킬 타입에 따라 분배
-            proficiency = 2 if i < 3 else (3 if i < 7 else 2)
-
-            # 역할 매핑: domain과 index에 따라 다양하게 분배
-            if domain == "digital-twin-simulation":
-                roles = ["engineer", "developer"]
-            elif domain == "collaborative-robot":
-                roles = ["operator", "engineer"]
-            else:
-                roles = ["operator", "engineer"] if i < 5 else ["engineer"]
-
-            skill = create_skill_object(
-                domain=domain,
-                domain_code=domain_code,
-                skill_type="skill",
-                label_ko=label_ko,
-                label_en=label_en,
-                description_ko=desc_ko,
-                description_en=desc_en,
-                proficiency_level=proficiency,
-                role_mappings=roles,
-                parent_skill_id=f"RSF-{domain_code}-{min(i // 2 + 1, 5):03d}" if i < len(knowledge_list) else None,
-                smartfactory_context=f"{domain_info['name_ko']} 현장에서 {label_ko} 역량 구현",
-                index=index,
+        context = self.context
+        if context is None and self.type_idx < len(self.CONTEXT_FORMATS):
+            context = self.CONTEXT_FORMATS[self.type_idx].format(
+                domain_ko=domain_info["name_ko"], label_ko=self.label_ko
             )
-            all_skills.append(skill)
-            index += 1
-
-        # Competence 스킬 생성
-        for i, (label_ko, label_en, desc_ko, desc_en) in enumerate(competence_list):
-            # proficiency_level은 competence이므로 3~4 레벨
-            proficiency = 3 if i < 4 else 4
-            roles = ["operator", "engineer"] if i < 3 else ["engineer"]
-
-            skill = create_skill_object(
-                domain=domain,
-                domain_code=domain_code,
-                skill_type="competence",
-                label_ko=label_ko,
-                label_en=label_en,
-                description_ko=desc_ko,
-                description_en=desc_en,
-                proficiency_level=proficiency,
-                role_mappings=roles,
-                parent_skill_id=f"RSF-{domain_code}-{len(knowledge_list) + (i // 2) + 1:03d}",
-                smartfactory_context=f"현장 검증: {label_ko} 수행 능력 입증",
-                index=index,
+
+        return {
+            "skill_id": generate_skill_id(domain_code, self.index),
+            "domain": domain,
+            "domain_en": domain_info["name_en"],
+            "esco_uri": self.esco_uri or generate_esco_uri(domain_code, self.index),
+            "preferred_label_ko": self.label_ko,
+            "preferred_label_en": self.label_en,
+            "description_ko": self.description_ko,
+            "description_en": self.description_en,
+            "skill_type": SKILL_TYPE_TABLE.values[self.type_idx],
+            "proficiency_level": self.proficiency_level,
+            "role_mapping": roles_from_mask(self.role_mask),
+            "parent_skill_id": generate_skill_id(domain_code, self.parent_index) if self.parent_index else None,
+            "related_skills": list(self.related_skills) if self.related_skills else [],
+            "esco_broader": self.esco_broader,
+            "smartfactory_context": context,
+        }
+
+
+_KNOWLEDGE_ROLES = role_mask(["engineer", "developer"])  # Knowledge는 엔지니어, 개발자 대상
+_OPERATOR_ENGINEER = role_mask(["operator", "engineer"])
+_ENGINEER_ONLY = role_mask(["engineer"])
+_ENGINEER_DEVELOPER = role_mask(["engineer", "developer"])
+
+
+def iter_domain_records(domain: str, domain_info: Dict[str, Any]) -> Iterator[SkillRecord]:
+    """단일 도메인의 스킬 레코드를 하나씩 생성 (도메인마다 index가 1부터 시작)"""
+    domain_idx = DOMAIN_TABLE.code(domain)
+    index = 1
+
+    # Knowledge 스킬 생성
+    knowledge_list = KNOWLEDGE_SKILLS.get(domain, [])
+    for kn in knowledge_list:
+        yield SkillRecord(
+            domain_idx,
+            0,
+            index,
+            kn["label_ko"],
+            kn["label_en"],
+            kn["description_ko"],
+            kn["description_en"],
+            kn["proficiency"],
+            _KNOWLEDGE_ROLES,
+        )
+        index += 1
+
+    # Skill 및 Competence 생성
+    skill_competence = SKILL_COMPETENCE_TEMPLATES.get(domain, {})
+    skill_list = skill_competence.get("skill", [])
+    competence_list = skill_competence.get("competence", [])
+
+    # Skill 스킬 생성
+    for i, (label_ko, label_en, desc_ko, desc_en) in enumerate(skill_list):
+        # proficiency_level은 스킬 타입에 따라 분배
+        proficiency = 2 if i < 3 else (3 if i < 7 else 2)
+
+        # 역할 매핑: domain과 index에 따라 다양하게 분배
+        if domain == "digital-twin-simulation":
+            roles = _ENGINEER_DEVELOPER
+        elif domain == "collaborative-robot":
+            roles = _OPERATOR_ENGINEER
+        else:
+            roles = _OPERATOR_ENGINEER if i < 5 else _ENGINEER_ONLY
+
+        yield SkillRecord(
+            domain_idx,
+            1,
+            index,
+            label_ko,
+            label_en,
+            desc_ko,
+            desc_en,
+            proficiency,
+            roles,
+            parent_index=min(i // 2 + 1, 5) if i < len(knowledge_list) else 0,
+        )
+        index += 1
+
+    # Competence 스킬 생성
+    for i, (label_ko, label_en, desc_ko, desc_en) in enumerate(competence_list):
+        # proficiency_level은 competence이므로 3~4 레벨
+        proficiency = 3 if i < 4 else 4
+        roles = _OPERATOR_ENGINEER if i < 3 else _ENGINEER_ONLY
+
+        yield SkillRecord(
+            domain_idx,
+            2,
+            index,
+            label_ko,
+            label_en,
+            desc_ko,
+            desc_en,
+            proficiency,
+            roles,
+            parent_index=len(knowledge_list) + (i // 2) + 1,
+        )
+        index += 1
+
+
+# 템플릿 위치와 무관하게 skill_id를 고정하는 레지스트리 (템플릿 옆에 함께 커밋)
+ID_REGISTRY_PATH = TEMPLATE_DIR.parent / "robot-smartfactory-ids.json"
+ID_REGISTRY_VERSION = 1
+# 조직 레지스트리가 새로 배정하는 번호의 시작 (공유 레지스트리 번호와 겹치지 않게)
+ORGANIZATION_ID_OFFSET = 900
+
+
+def skill_content_key(skill: SkillRecord) -> str:
+    """도메인 안에서 스킬을 식별하는 콘텐츠 키 (타입 + label_en)"""
+    return f"{skill.skill_type}|{skill.label_en}"
+
+
+class IdRegistry:
+    """
+    콘텐츠 키(도메인 + 타입 + label_en) → 도메인 내 번호 레지스트리.
+
+    한 번 배정된 번호는 바뀌지 않고(append-only), 처음 보는 키는 그 도메인의
+    다음 번호를 받는다. 템플릿 중간에 스킬을 끼워 넣어도 기존 skill_id/esco_uri와
+    parent_skill_id가 유지되어 실제로 바뀐 레코드만 캐시가 무효화된다.
+    같은 키가 한 도메인에 여러 번 나오면 두 번째부터 "#2", "#3"을 붙인다.
+
+    base가 있으면 조직용 덧씌움 레지스트리로 동작한다. base에 있는 키는 base 번호를
+    그대로 쓰고, 나머지만 offset 뒤 번호를 받아 이 파일에만 기록하므로 조직 실행이
+    공유 레지스트리를 건드리지 않는다.
+    """
+
+    def __init__(self, path: Path, base: Optional["IdRegistry"] = None, offset: int = 0):
+        self.path = path
+        self.base = base
+        self.offset = offset
+        self.dirty = False
+        self._domains: Optional[Dict[str, Dict[str, int]]] = None
+
+    def _load(self) -> Dict[str, Dict[str, int]]:
+        if self._domains is None:
+            self._domains = {}
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == ID_REGISTRY_VERSION:
+                    self._domains = data["domains"]
+            except (OSError, ValueError):
+                pass
+        return self._domains
+
+    def domain_ids(self, domain: str) -> Dict[str, int]:
+        if self.base is None:
+            return self._load().get(domain, {})
+        return {**self.base.domain_ids(domain), **self._load().get(domain, {})}
+
+    def assign(self, domain: str, skills: Iterable[SkillRecord]) -> List[SkillRecord]:
+        """도메인 레코드의 index/parent_index를 레지스트리 번호로 바꾼다 (새 키는 배정)"""
+        own = self._load().setdefault(domain, {})
+        ids = own
+        if self.base is not None:
+            shared = self.base.domain_ids(domain)
+            if max(shared.values(), default=0) >= self.offset:
+                raise ValueError(f"{domain}: 공유 레지스트리 번호가 조직 번호 시작({self.offset})에 닿음")
+            ids = {**shared, **own}
+        next_index = max(own.values(), default=self.offset) + 1
+        skills = list(skills)  # 부모가 뒤에 나와도 바꿀 수 있게 도메인 단위로 모은다
+        positions: Dict[int, int] = {}
+        occurrences: Dict[str, int] = {}
+        for skill in skills:
+            key = skill_content_key(skill)
+            occurrences[key] = occurrences.get(key, 0) + 1
+            if occurrences[key] > 1:
+                key = f"{key}#{occurrences[key]}"
+            index = ids.get(key)
+            if index is None:
+                index = ids[key] = own[key] = next_index
+                next_index += 1
+                self.dirty = True
+            positions[skill.index] = index
+            skill.index = index
+        for skill in skills:
+            if skill.parent_index:
+                skill.parent_index = positions.get(skill.parent_index, skill.parent_index)
+        return skills
+
+    def save(self) -> bool:
+        """새로 배정한 번호가 있으면 기록"""
+        if not self.dirty:
+            return False
+        atomic_write_text(
+            self.path,
+            json.dumps(
+                {"version": ID_REGISTRY_VERSION, "domains": {domain: ids for domain, ids in self._load().items() if ids}},
+                ensure_ascii=False,
+                indent=2,
             )
-            all_skills.append(skill)
-            index += 1
+            + "\n",
+        )
+        self.dirty = False
+        return True
 
-    return all_skills
 
+ID_REGISTRY = IdRegistry(ID_REGISTRY_PATH)
 
-# ==================== 메인 실행 ====================
 
-def main():
-    print("🚀 로봇테크 for 스마트팩토리 스킬 데이터 생성 시작...")
+# 전체 카탈로그를 본 뒤에야 정해지는 필드(related_skills 등)는
+# 도메인 → 도메인 내 번호 → {필드: 값} 형태의 annotation으로 덧씌운다.
+Annotations = Dict[str, Dict[int, Dict[str, Any]]]
 
-    # 데이터 생성
-    skills = generate_robot_smartfactory_data()
 
-    # JSON 파일로 저장
-    output_path = Path("public/data/robot-smartfactory.json")
-    output_path.parent.mkdir(parents=True, exist_ok=True)
+def merge_annotations(*parts: Annotations) -> Annotations:
+    """여러 단계의 annotation을 하나로 합친다 (같은 필드는 뒤쪽이 우선)"""
+    merged: Annotations = {}
+    for part in parts:
+        for domain, by_index in part.items():
+            target = merged.setdefault(domain, {})
+            for index, fields in by_index.items():
+                target.setdefault(index, {}).update(fields)
+    return merged
+
+
+def apply_annotations(skills: Iterable[SkillRecord], annotations: Dict[int, Dict[str, Any]]) -> Iterator[SkillRecord]:
+    for skill in skills:
+        fields = annotations.get(skill.index)
+        if fields:
+            for name, value in fields.items():
+                setattr(skill, name, value)
+        yield skill
+
+
+def iter_domain_catalog(domain: str, annotations: Optional[Annotations] = None) -> Iterator[SkillRecord]:
+    """도메인 하나의 최종 레코드 (ID 레지스트리 번호, annotation 적용 후)"""
+    skills: Iterable[SkillRecord] = ID_REGISTRY.assign(domain, iter_domain_records(domain, DOMAINS[domain]))
+    if annotations and annotations.get(domain):
+        skills = apply_annotations(skills, annotations[domain])
+    return iter(skills)
+
+
+def iter_skill_records(annotations: Optional[Annotations] = None) -> Iterator[SkillRecord]:
+    """전체 스킬 레코드를 스트리밍으로 생성 (카탈로그 크기와 무관하게 메모리 일정)"""
+    for domain in DOMAINS:
+        yield from iter_domain_catalog(domain, annotations)
+
+
+def assign_skill_ids(domains: Optional[Iterable[str]] = None) -> int:
+    """
+    새 템플릿 항목에 ID를 배정하고 레지스트리를 저장한다 (배정 건수 반환).
+
+    병렬 워커와 증분 빌드는 저장된 레지스트리를 읽으므로 생성 전에 한 번 호출한다.
+    domains를 주면 그 도메인만 훑는다 (감시 모드: 바뀐 템플릿 파일만).
+    """
+    domains = list(DOMAINS if domains is None else domains)
+    before = sum(len(ID_REGISTRY.domain_ids(domain)) for domain in domains)
+    for domain in domains:
+        for _skill in iter_domain_catalog(domain):
+            pass
+    ID_REGISTRY.save()
+    return sum(len(ID_REGISTRY.domain_ids(domain)) for domain in domains) - before
+
+
+def iter_robot_smartfactory_data() -> Iterator[Dict[str, Any]]:
+    """전체 스킬을 JSON 스키마 dict로 하나씩 생성"""
+    for record in iter_skill_records():
+        yield record.to_dict()
+
+
+def generate_robot_smartfactory_data() -> List[Dict[str, Any]]:
+    """전체 로봇테크 for 스마트팩토리 데이터 생성"""
+    return list(iter_robot_smartfactory_data())
+
+
+# ==================== 스트리밍 출력 ====================
+
+OUTPUT_FORMATS = ("json", "ndjson")
+
+
+def encode_json_record(skill: SkillRecord) -> str:
+    """JSON 배열 원소 하나 (배열 안쪽 들여쓰기 포함)"""
+    return json.dumps(skill.to_dict(), ensure_ascii=False, indent=2).replace("\n", "\n  ")
+
+
+def encode_ndjson_record(skill: SkillRecord) -> str:
+    return json.dumps(skill.to_dict(), ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+# 포맷별 (레코드 인코더, 시작, 구분자, 끝, 빈 출력)
+# json은 json.dump(indent=2)와 동일한 바이트를 만든다.
+FORMAT_SPECS = {
+    "json": (encode_json_record, "[\n  ", ",\n  ", "\n]", "[]"),
+    "ndjson": (encode_ndjson_record, "", "", "", ""),
+}
+
+
+def write_records(skills: Iterable[SkillRecord], f: TextIO, fmt: str = "json") -> int:
+    """레코드를 생성되는 즉시 기록"""
+    encode, head, sep, tail, empty = FORMAT_SPECS[fmt]
+    count = 0
+    for skill in skills:
+        f.write((head if count == 0 else sep) + encode(skill))
+        count += 1
+    f.write(tail if count else empty)
+    return count
+
+
+CUBE_ALL = "*"  # 집계 큐브에서 축 전체 합계를 나타내는 값
+
+
+class SkillStats:
+    """
+    스트리밍 중 분포 통계를 누적.
+
+    레코드마다 (도메인, 타입, 숙련도, 역할 마스크) 정수 키 하나만 세고,
+    도메인/타입/역할/숙련도별 분포는 조회할 때 이 셀들을 합산해서 만든다.
+    """
+
+    def __init__(self):
+        self.total = 0
+        self.cells: Dict[Tuple[int, int, int, int], int] = {}
+
+    def add(self, skill: SkillRecord) -> None:
+        key = (skill.domain_idx, skill.type_idx, skill.proficiency_level, skill.role_mask)
+        self.cells[key] = self.cells.get(key, 0) + 1
+        self.total += 1
+
+    def _rollup(self, axis: int) -> Dict[int, int]:
+        counts: Dict[int, int] = {}
+        for key, count in self.cells.items():
+            counts[key[axis]] = counts.get(key[axis], 0) + count
+        return counts
+
+    @property
+    def by_domain(self) -> Dict[str, int]:
+        return {DOMAIN_TABLE.values[code]: count for code, count in self._rollup(0).items()}
+
+    @property
+    def by_type(self) -> Dict[str, int]:
+        return {SKILL_TYPE_TABLE.values[code]: count for code, count in self._rollup(1).items()}
+
+    @property
+    def by_proficiency(self) -> Dict[int, int]:
+        return self._rollup(2)
+
+    @property
+    def by_role(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for mask, count in self._rollup(3).items():
+            for role in roles_from_mask(mask):
+                counts[role] = counts.get(role, 0) + count
+        return counts
+
+    def merge(self, other: "SkillStats") -> None:
+        self.total += other.total
+        for key, count in other.cells.items():
+            self.cells[key] = self.cells.get(key, 0) + count
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total": self.total,
+            "cells": [
+                [DOMAIN_TABLE.values[d], SKILL_TYPE_TABLE.values[t], level, roles_from_mask(mask), count]
+                for (d, t, level, mask), count in self.cells.items()
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SkillStats":
+        stats = cls()
+        stats.total = data["total"]
+        for domain, skill_type, level, roles, count in data["cells"]:
+            key = (DOMAIN_TABLE.code(domain), SKILL_TYPE_TABLE.code(skill_type), level, role_mask(roles))
+            stats.cells[key] = count
+        return stats
+
+    def to_cube(self) -> Dict[str, Any]:
+        """
+        도메인 × 타입 × 역할 × 숙련도 집계 큐브 (조회 시 카탈로그 재스캔 불필요).
+
+        축마다 마지막 값 CUBE_ALL("*")이 해당 축 전체 합계라서 어떤 슬라이스/롤업이든
+        counts[Σ 인덱스 × stride] 한 번으로 읽는다. 역할은 다중 값이므로 역할별 칸은
+        역할마다 세고, 역할 "*" 칸은 스킬당 한 번만 센다.
+        """
+        levels = sorted(self.by_proficiency)
+        axes = [
+            ("domain", list(DOMAIN_TABLE.values)),
+            ("skill_type", list(SKILL_TYPE_TABLE.values)),
+            ("role", list(ROLES)),
+            ("proficiency_level", levels),
+        ]
+        shape = [len(values) + 1 for _name, values in axes]
+        strides = [1] * len(shape)
+        for axis in range(len(shape) - 2, -1, -1):
+            strides[axis] = strides[axis + 1] * shape[axis + 1]
+        counts = [0] * (strides[0] * shape[0])
+
+        level_pos = {level: i for i, level in enumerate(levels)}
+        role_pos = {bit: i for i, bit in enumerate(ROLE_BITS.values())}
+        for (d, t, level, mask), count in self.cells.items():
+            roles = [pos for bit, pos in role_pos.items() if mask & bit]
+            # 도메인/타입 축은 intern 코드 순서 그대로라 코드가 곧 축 인덱스
+            for di in (d, shape[0] - 1):
+                for ti in (t, shape[1] - 1):
+                    for ri in roles + [shape[2] - 1]:
+                        for li in (level_pos[level], shape[3] - 1):
+                            counts[di * strides[0] + ti * strides[1] + ri * strides[2] + li] += count
+
+        return {
+            "version": 1,
+            "all": CUBE_ALL,
+            "dimensions": [{"name": name, "values": values + [CUBE_ALL]} for name, values in axes],
+            "strides": strides,
+            "counts": counts,
+        }
+
+    def track(self, skills: Iterable[SkillRecord]) -> Iterator[SkillRecord]:
+        """스킬을 그대로 흘려보내면서 통계에 반영"""
+        for skill in skills:
+            self.add(skill)
+            yield skill
+
+    def print_report(self) -> None:
+        by_domain = self.by_domain
+        print("\n📊 도메인별 분포:")
+        for domain in DOMAINS.keys():
+            count = by_domain.get(domain, 0)
+            name = DOMAINS[domain]["name_ko"]
+            print(f"   {name}: {count}개")
+
+        print("\n📊 스킬 타입별 분포:")
+        for skill_type, count in sorted(self.by_type.items()):
+            print(f"   {skill_type}: {count}개")
+
+        print("\n📊 역할별 분포:")
+        for role, count in sorted(self.by_role.items()):
+            print(f"   {role}: {count}개")
+
+        print("\n📊 숙련도 레벨별 분포:")
+        by_proficiency = self.by_proficiency
+        for level in sorted(by_proficiency.keys()):
+            count = by_proficiency[level]
+            print(f"   Level {level}: {count}개")
+
+
+# ==================== 도메인 조각 & 병렬 생성 ====================
+
+def encode_domain_fragment(skills: Iterable[SkillRecord], fmt: str) -> str:
+    """도메인 하나의 레코드를 출력 포맷의 조각(시작/끝 제외)으로 직렬화"""
+    encode, _head, sep, _tail, _empty = FORMAT_SPECS[fmt]
+    return sep.join(encode(skill) for skill in skills)
+
+
+def write_fragments(fragments: Iterable[str], f: TextIO, fmt: str) -> None:
+    """도메인 조각들을 순서대로 이어 붙여 완전한 출력으로 기록"""
+    _encode, head, sep, tail, empty = FORMAT_SPECS[fmt]
+    first = True
+    for fragment in fragments:
+        if not fragment:
+            continue
+        f.write((head if first else sep) + fragment)
+        first = False
+    f.write(empty if first else tail)
+
+
+def assemble_fragments(fragments: Iterable[str], fmt: str) -> str:
+    buffer = io.StringIO()
+    write_fragments(fragments, buffer, fmt)
+    return buffer.getvalue()
+
+
+def build_domain_fragment(
+    domain: str,
+    fmt: str,
+    annotations: Optional[Dict[int, Dict[str, Any]]] = None,
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    도메인 하나를 생성·직렬화한다 (워커 프로세스에서 실행되는 단위 작업).
+
+    도메인마다 index가 1부터 시작하므로 도메인 간 의존성이 없다. 카탈로그 전체에
+    의존하는 필드는 부모가 계산한 해당 도메인의 annotation으로만 전달받는다.
+    통계는 intern 코드가 프로세스마다 다를 수 있어 이름 기반 dict로 돌려준다.
+    """
+    stats = SkillStats()
+    skills = iter_domain_catalog(domain, {domain: annotations} if annotations else None)
+    fragment = encode_domain_fragment(stats.track(skills), fmt)
+    return fragment, stats.to_dict()
+
+
+def map_domain_fragments(
+    domains: Iterable[str],
+    fmt: str,
+    workers: int = 1,
+    annotations: Optional[Annotations] = None,
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """도메인별 (조각, 통계)를 입력 순서대로 돌려준다. workers > 1이면 프로세스 풀 사용"""
+    domains = list(domains)
+    slices = [(annotations or {}).get(domain) for domain in domains]
+    if workers <= 1 or len(domains) <= 1:
+        for domain, domain_annotations in zip(domains, slices):
+            yield build_domain_fragment(domain, fmt, domain_annotations)
+        return
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(domains))) as pool:
+        yield from pool.map(build_domain_fragment, domains, [fmt] * len(domains), slices)
+
+
+def build_parallel(
+    output_path: Path,
+    fmt: str,
+    workers: int,
+    annotations: Optional[Annotations] = None,
+) -> SkillStats:
+    """도메인 단위로 병렬 생성하고, 완료된 조각을 DOMAINS 순서대로 기록 (직렬 실행과 동일한 바이트)"""
+    stats = SkillStats()
+
+    def fragments() -> Iterator[str]:
+        for fragment, domain_stats in map_domain_fragments(DOMAINS, fmt, workers, annotations):
+            stats.merge(SkillStats.from_dict(domain_stats))
+            yield fragment
 
     with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(skills, f, ensure_ascii=False, indent=2)
+        write_fragments(fragments(), f, fmt)
+    return stats
+
+
+# ==================== 증분 빌드 ====================
+
+DEFAULT_CACHE_DIR = Path(".cache/robot-smartfactory")
+MANIFEST_VERSION = 3
+
+# 직렬화 경로(encode_json_record, FORMAT_SPECS, apply_annotations 등)까지 포함해
+# 생성 결과에 영향을 주는 코드는 모두 이 파일에 있으므로 스크립트 전체를 해시한다.
+# 스크립트가 바뀌면 모든 도메인이 다시 생성된다.
+GENERATOR_SOURCE = Path(__file__).resolve()
+
+
+@functools.lru_cache(maxsize=1)
+def _generator_fingerprint() -> str:
+    return hashlib.sha256(GENERATOR_SOURCE.read_bytes()).hexdigest()
+
+
+def domain_input_hash(
+    domain: str,
+    fmt: str,
+    fingerprint: str,
+    annotations: Optional[Dict[int, Dict[str, Any]]] = None,
+) -> str:
+    """도메인 입력(DOMAINS 항목, Knowledge 목록, 템플릿, ID 레지스트리, annotation)의 콘텐츠 해시"""
+    payload = {
+        "domain": domain,
+        "info": DOMAINS[domain],
+        "ids": ID_REGISTRY.domain_ids(domain),
+        "knowledge": KNOWLEDGE_SKILLS.get(domain, []),
+        "templates": SKILL_COMPETENCE_TEMPLATES.get(domain, {}),
+        "annotations": annotations or {},
+        "format": fmt,
+        "generator": fingerprint,
+    }
+    encoded = json.dumps(payload, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    """임시 파일에 기록한 뒤 교체하여 읽는 쪽이 반쯤 쓰인 파일을 보지 않게 한다"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """atomic_write_text의 바이너리판"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+def _load_manifest(manifest_path: Path) -> Dict[str, Any]:
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get("version") != MANIFEST_VERSION:
+        return {}
+    return manifest
+
+
+def build_incremental(
+    output_path: Path,
+    fmt: str,
+    cache_dir: Path = DEFAULT_CACHE_DIR,
+    workers: int = 1,
+    annotations: Optional[Annotations] = None,
+) -> Tuple[SkillStats, List[str]]:
+    """
+    바뀐 도메인만 다시 생성한다.
+
+    도메인별 직렬화 조각과 입력 해시를 캐시에 보관하고, 해시가 같은 도메인은
+    이전 조각과 통계를 그대로 재사용한다. 반환값은 (전체 통계, 재생성된 도메인 목록).
+    """
+    manifest_path = cache_dir / f"manifest.{fmt}.json"
+    manifest = _load_manifest(manifest_path)
+    previous = manifest.get("domains", {})
+    fingerprint = _generator_fingerprint()
+
+    annotations = annotations or {}
+    keys = {domain: domain_input_hash(domain, fmt, fingerprint, annotations.get(domain)) for domain in DOMAINS}
+    rebuilt = [
+        domain
+        for domain, key in keys.items()
+        if previous.get(domain, {}).get("hash") != key or not (cache_dir / f"{domain}.{fmt}").exists()
+    ]
+
+    entries: Dict[str, Any] = {}
+    fresh: Dict[str, str] = {}
+    for domain, (fragment, domain_stats) in zip(rebuilt, map_domain_fragments(rebuilt, fmt, workers, annotations)):
+        atomic_write_text(cache_dir / f"{domain}.{fmt}", fragment)
+        entries[domain] = {"hash": keys[domain], "stats": domain_stats}
+        fresh[domain] = fragment
+
+    stats = SkillStats()
+    fragments: List[str] = []
+    for domain in DOMAINS:
+        entry = entries.setdefault(domain, previous.get(domain))
+        if domain in fresh:
+            fragments.append(fresh[domain])
+        else:
+            fragments.append((cache_dir / f"{domain}.{fmt}").read_text(encoding="utf-8"))
+        stats.merge(SkillStats.from_dict(entry["stats"]))
+
+    order_changed = list(previous.keys()) != list(DOMAINS.keys())
+    if rebuilt or order_changed or manifest.get("output") != str(output_path) or not output_path.exists():
+        atomic_write_text(output_path, assemble_fragments(fragments, fmt))
+
+    for stale in set(previous) - set(DOMAINS):
+        for stale_path in cache_dir.glob(f"{stale}.*"):
+            stale_path.unlink()
+
+    atomic_write_text(
+        manifest_path,
+        json.dumps(
+            {"version": MANIFEST_VERSION, "format": fmt, "output": str(output_path), "domains": entries},
+            ensure_ascii=False,
+            indent=2,
+        ),
+    )
+    return stats, rebuilt
+
+
+# ==================== 감시 모드 ====================
+
+DEFAULT_WATCH_INTERVAL = 0.05
+
+
+def template_mtimes(source_dir: Path) -> Dict[str, Tuple[int, int]]:
+    """템플릿 파일 이름(확장자 제외) → (mtime_ns, 크기)"""
+    mtimes = {}
+    with os.scandir(source_dir) as entries:
+        for entry in entries:
+            if entry.name.endswith(".json") and entry.is_file():
+                stat = entry.stat()
+                mtimes[entry.name[: -len(".json")]] = (stat.st_mtime_ns, stat.st_size)
+    return mtimes
+
+
+def reload_domains(store: TemplateStore = TEMPLATES) -> None:
+    """domains.json을 다시 읽어 DOMAINS를 제자리에서 갱신 (템플릿 매핑이 같은 dict를 참조)"""
+    store.invalidate("domains")
+    fresh = store.load("domains")
+    DOMAINS.clear()
+    DOMAINS.update(fresh)
+
+
+class WatchSession:
+    """
+    템플릿 파일을 감시하며 바뀐 도메인만 다시 생성하는 상주 빌드.
+
+    도메인별 직렬화 조각과 입력 해시를 메모리에 들고 있다가, 변경된 파일만 다시 읽고
+    입력 해시가 달라진 도메인만 재생성한 뒤 출력 파일을 원자적으로 교체한다.
+    ID 배정은 바뀐 도메인만 훑고, 카탈로그 전체에 의존하는 annotation(related_skills
+    등)은 compute_annotations(바뀐 도메인)이 돌려준 (annotation, 영향받은 도메인) 중
+    영향받은 도메인만 입력 해시를 다시 구한다.
+    """
+
+    def __init__(
+        self,
+        output_path: Path,
+        fmt: str,
+        compute_annotations: Callable[[Optional[Collection[str]]], Tuple[Annotations, List[str]]],
+        store: TemplateStore = TEMPLATES,
+    ):
+        self.output_path = output_path
+        self.fmt = fmt
+        self.compute_annotations = compute_annotations
+        self.store = store
+        self.fingerprint = _generator_fingerprint()
+        self.keys: Dict[str, str] = {}
+        self.fragments: Dict[str, str] = {}
+        self.order: List[str] = []
+        self.mtimes = template_mtimes(store.source_dir)
+
+    def rebuild(self, domains: Optional[Collection[str]] = None, write: bool = True) -> List[str]:
+        """
+        입력 해시가 바뀐 도메인을 재생성하고, 달라진 것이 있으면 출력을 교체.
 
-    print(f"✅ 데이터 생성 완료: {output_path}")
-    print(f"   총 스킬 수: {len(skills)}개")
+        domains(바뀐 템플릿의 도메인)를 주면 그 도메인과 annotation이 바뀐 도메인만 확인한다.
+        """
+        if domains is not None:
+            domains = [domain for domain in domains if domain in DOMAINS]
+        assign_skill_ids(domains)
+        annotations, touched = self.compute_annotations(domains)
+        candidates = set(DOMAINS if domains is None else [*domains, *touched])
+        rebuilt = []
+        for domain in DOMAINS:
+            if domain in self.keys and domain not in candidates:
+                continue
+            key = domain_input_hash(domain, self.fmt, self.fingerprint, annotations.get(domain))
+            if self.keys.get(domain) == key:
+                continue
+            fragment, _stats = build_domain_fragment(domain, self.fmt, annotations.get(domain))
+            self.keys[domain] = key
+            self.fragments[domain] = fragment
+            rebuilt.append(domain)
 
-    # 통계 출력
-    stats_by_domain = {}
-    stats_by_type = {}
-    stats_by_role = {}
-    stats_by_proficiency = {}
+        for stale in set(self.fragments) - set(DOMAINS):
+            del self.fragments[stale], self.keys[stale]
 
+        if rebuilt or self.order != list(DOMAINS):
+            self.order = list(DOMAINS)
+            if write:
+                tmp_path = self.output_path.with_name(f".{self.output_path.name}.tmp")
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    write_fragments((self.fragments[domain] for domain in self.order), f, self.fmt)
+                os.replace(tmp_path, self.output_path)
+        return rebuilt
+
+    def poll(self) -> Optional[List[str]]:
+        """템플릿 파일이 바뀌었으면 해당 파일만 다시 읽고 재생성. 변경이 없으면 None"""
+        current = template_mtimes(self.store.source_dir)
+        changed = {name for name in current.keys() | self.mtimes.keys() if current.get(name) != self.mtimes.get(name)}
+        if not changed:
+            return None
+        self.mtimes = current
+        for name in changed:
+            self.store.invalidate(name)
+        if "domains" in changed:
+            reload_domains(self.store)
+            return self.rebuild()
+        # 도메인 템플릿 파일 이름이 곧 도메인 키
+        return self.rebuild(changed)
+
+    def step(self) -> Optional[List[str]]:
+        """poll 한 번과 결과 출력. 템플릿 오류는 알리고 이전 출력을 유지한다 (None)"""
+        start = time.perf_counter()
+        try:
+            rebuilt = self.poll()
+        except (ValueError, KeyError, TypeError) as exc:
+            # 편집 도중의 깨진 JSON 등: 이전 출력을 그대로 두고 다음 저장을 기다린다
+            print(f"⚠️  템플릿 오류, 이전 출력 유지: {exc!r}")
+            return None
+        if rebuilt is None:
+            return None
+        elapsed = (time.perf_counter() - start) * 1000
+        names = ", ".join(DOMAINS[domain]["name_ko"] for domain in rebuilt) or "변경 없음"
+        print(f"♻️  {names} → {self.output_path} ({elapsed:.0f} ms)")
+        return rebuilt
+
+    def run(self, interval: float = DEFAULT_WATCH_INTERVAL) -> None:
+        print(f"👀 템플릿 감시 중: {self.store.source_dir} (Ctrl+C로 종료)")
+        try:
+            while True:
+                time.sleep(interval)
+                self.step()
+        except KeyboardInterrupt:
+            print("\n👋 감시 종료")
+
+
+# ==================== 검색 인덱스 ====================
+
+DEFAULT_ARTIFACT_DIR = Path("public/data/robot-smartfactory")
+
+# app/api/search/route.ts의 SMART_FACTORY_KEYWORDS와 동일한 가중치
+SMART_FACTORY_KEYWORDS = (
+    ("plc", 22),
+    ("programmable logic controller", 22),
+    ("scada", 20),
+    ("mes", 18),
+    ("opc ua", 16),
+    ("opcu", 16),
+    ("iiot", 14),
+    ("industrial iot", 14),
+    ("fieldbus", 12),
+    ("modbus", 12),
+    ("profibus", 12),
+    ("profinet", 12),
+    ("ethercat", 12),
+    ("industrial ethernet", 10),
+    ("motion control", 10),
+    ("servo", 10),
+    ("robot cell", 12),
+    ("cell integration", 12),
+    ("line integration", 12),
+    ("automation", 8),
+    ("industrial automation", 10),
+    ("vision inspection", 10),
+    ("machine vision", 10),
+    ("quality control", 8),
+    ("safety plc", 10),
+    ("functional safety", 8),
+    ("risk assessment", 6),
+    ("predictive maintenance", 8),
+    ("condition monitoring", 8),
+    ("digital twin", 6),
+    ("asset tracking", 6),
+)
+
+# app/api/search/route.ts의 SMART_FACTORY_DOMAIN_BOOSTS와 동일 (skills.json 도메인 키)
+SMART_FACTORY_DOMAIN_BOOSTS = {
+    "manufacturing": 15,
+    "integration": 12,
+    "control": 10,
+    "safety": 8,
+    "perception": 6,
+    "robotics": 6,
+    "mechatronics": 5,
+    "manipulation": 4,
+    "navigation": 3,
+    "ai_ml": 2,
+}
+
+# 검색 API(route.ts)가 제공하는 카탈로그와 그 역색인
+ROUTE_SEARCH_SOURCE = Path("public/data/skills.json")
+DEFAULT_ROUTE_SEARCH_INDEX = Path("public/data/skills-search-index.json")
+
+SEARCH_LABEL_WEIGHT = 3
+SEARCH_DESCRIPTION_WEIGHT = 1
+KOREAN_NGRAM = 2
+
+_SEARCH_TOKEN_RE = re.compile(r"[a-z0-9]+|[가-힣]+")
+
+
+def search_tokens(text: str) -> List[str]:
+    """
+    검색 토큰 분해.
+
+    영문/숫자는 소문자 단어 단위, 한글 연속 구간은 KOREAN_NGRAM 글자 n-gram
+    (구간이 더 짧으면 구간 전체)으로 자른다. 질의도 같은 규칙으로 분해해 조회한다.
+    """
+    tokens = []
+    for run in _SEARCH_TOKEN_RE.findall(unicodedata.normalize("NFC", text).lower()):
+        if run[0] < "가" or len(run) <= KOREAN_NGRAM:
+            tokens.append(run)
+        else:
+            tokens.extend(run[i:i + KOREAN_NGRAM] for i in range(len(run) - KOREAN_NGRAM + 1))
+    return tokens
+
+
+def smart_factory_boost(text: str) -> int:
+    haystack = text.lower()
+    return sum(weight for term, weight in SMART_FACTORY_KEYWORDS if term in haystack)
+
+
+class SearchIndexBuilder:
+    """
+    카탈로그와 함께 배포되는 역색인.
+
+    출력 형식:
+      skill_ids[i]  - 순번 i의 스킬 ID (카탈로그 기록 순서)
+      boosts[i]     - 순번 i의 스마트팩토리 가산점
+      postings[tok] - [[순번, 점수], ...] (순번 오름차순, 점수는 레이블 3 / 설명 1 가중 빈도)
+
+    add()는 생성 레코드를, add_route_skill()은 검색 API가 읽는 skills.json 항목을 넣는다.
+    """
+
+    def __init__(self):
+        self.skill_ids: List[str] = []
+        self.boosts: List[int] = []
+        self.postings: Dict[str, List[List[int]]] = {}
+
+    def _add(self, skill_id: str, boost: int, texts: Iterable[Tuple[str, int]]) -> None:
+        ordinal = len(self.skill_ids)
+        self.skill_ids.append(skill_id)
+        self.boosts.append(boost)
+
+        scores: Dict[str, int] = {}
+        for text, weight in texts:
+            for token in search_tokens(text):
+                scores[token] = scores.get(token, 0) + weight
+
+        for token, score in scores.items():
+            self.postings.setdefault(token, []).append([ordinal, score])
+
+    def add(self, skill: SkillRecord) -> None:
+        self._add(
+            skill.skill_id,
+            smart_factory_boost(f"{skill.label_en} {skill.description_en}"),
+            (
+                (skill.label_en, SEARCH_LABEL_WEIGHT),
+                (skill.label_ko, SEARCH_LABEL_WEIGHT),
+                (skill.description_en, SEARCH_DESCRIPTION_WEIGHT),
+                (skill.description_ko, SEARCH_DESCRIPTION_WEIGHT),
+            ),
+        )
+
+    def add_route_skill(self, domain: str, skill: Dict[str, Any]) -> None:
+        """
+        skills.json 항목 하나. ID와 가산점은 route.ts의 flattenSkills/calculateSmartFactoryBoost와
+        같게(uri 또는 "도메인:레이블", 키워드 + 도메인 가산점) 미리 계산한다.
+        """
+        label, description = skill.get("label", ""), skill.get("description", "")
+        self._add(
+            skill.get("uri") or f"{domain}:{label}",
+            smart_factory_boost(f"{label} {description}") + SMART_FACTORY_DOMAIN_BOOSTS.get(domain, 0),
+            ((label, SEARCH_LABEL_WEIGHT), (description, SEARCH_DESCRIPTION_WEIGHT)),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": 1,
+            "korean_ngram": KOREAN_NGRAM,
+            "skill_ids": self.skill_ids,
+            "boosts": self.boosts,
+            "postings": dict(sorted(self.postings.items())),
+        }
+
+    def write(self, path: Path) -> List[Tuple[Path, int]]:
+        return [(path, write_artifact(path, self.to_dict()))]
+
+
+def write_route_search_index(source: Path, path: Path) -> List[Tuple[Path, int]]:
+    """
+    검색 API가 제공하는 skills.json의 역색인을 기록.
+
+    원본의 SHA-256을 함께 넣어 route.ts가 원본이 바뀐 뒤의 오래된 색인을 쓰지 않게 한다.
+    """
+    builder = SearchIndexBuilder()
+    for domain, skill in iter_esco_skills(source):
+        builder.add_route_skill(domain or "", skill)
+    payload = builder.to_dict()
+    payload["source"] = {"file": source.name, "sha256": hashlib.sha256(source.read_bytes()).hexdigest()}
+    return [(path, write_artifact(path, payload))]
+
+
+def feed_sinks(skills: Iterable[SkillRecord], sinks: List[Any]) -> Iterator[SkillRecord]:
+    """레코드를 흘려보내면서 각 산출물 빌더(add 메서드 보유)에 전달"""
     for skill in skills:
-        domain = skill["domain"]
-        skill_type = skill["skill_type"]
-        proficiency = skill["proficiency_level"]
+        for sink in sinks:
+            sink.add(skill)
+        yield skill
 
-        stats_by_domain[domain] = stats_by_domain.get(domain, 0) + 1
-        stats_by_type[skill_type] = stats_by_type.get(skill_type, 0) + 1
-        stats_by_proficiency[proficiency] = stats_by_proficiency.get(proficiency, 0) + 1
 
-        for role in skill["role_mapping"]:
-            stats_by_role[role] = stats_by_role.get(role, 0) + 1
+def write_artifact(path: Path, payload: Any) -> int:
+    """부가 산출물을 공백 없는 JSON으로 원자적으로 기록하고 바이트 수를 돌려준다"""
+    text = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+    atomic_write_text(path, text)
+    return len(text.encode("utf-8"))
 
-    print("\n📊 도메인별 분포:")
-    for domain in DOMAINS.keys():
-        count = stats_by_domain.get(domain, 0)
-        name = DOMAINS[domain]["name_ko"]
-        print(f"   {name}: {count}개")
 
-    print("\n📊 스킬 타입별 분포:")
-    for skill_type, count in sorted(stats_by_type.items()):
-        print(f"   {skill_type}: {count}개")
+# ==================== 한글 검색 키 ====================
 
-    print("\n📊 역할별 분포:")
-    for role, count in sorted(stats_by_role.items()):
-        print(f"   {role}: {count}개")
+HANGUL_BASE = 0xAC00
+HANGUL_LAST = 0xD7A3
+HANGUL_CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+HANGUL_JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+HANGUL_JONGSEONG = ("", *"ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ")
+# 겹모음/겹받침은 자판 입력 순서대로 풀어서 입력 중인 음절("롭")도 접두어가 되게 한다
+HANGUL_KEYSTROKES = {
+    "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ", "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ", "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ",
+    "ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ",
+    "ㄽ": "ㄹㅅ", "ㄾ": "ㄹㅌ", "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ",
+}
+# 키는 앞부분만 보관하고, 더 긴 질의는 잘라서 찾은 뒤 원문으로 다시 확인한다
+KOREAN_JAMO_KEY_LENGTH = 24
+KOREAN_CHOSEONG_KEY_LENGTH = 12
+KOREAN_KEY_FIELDS = ("label", "description")
 
-    print("\n📊 숙련도 레벨별 분포:")
-    for level in sorted(stats_by_proficiency.keys()):
-        count = stats_by_proficiency[level]
-        print(f"   Level {level}: {count}개")
+_HANGUL_WORD_RE = re.compile(r"[가-힣]")
 
-    print("\n✨ 데이터 생성 완료!")
+
+def _is_syllable(char: str) -> bool:
+    return HANGUL_BASE <= ord(char) <= HANGUL_LAST
+
+
+def hangul_jamo(text: str) -> str:
+    """NFC 정규화 후 완성형 음절을 자판 입력 단위 자모로 분해 (공백 제거, 영문 소문자)"""
+    out = []
+    for char in unicodedata.normalize("NFC", text).lower():
+        if _is_syllable(char):
+            code = ord(char) - HANGUL_BASE
+            cho, rest = divmod(code, 588)
+            jung, jong = divmod(rest, 28)
+            out.append(HANGUL_CHOSEONG[cho])
+            out.append(HANGUL_KEYSTROKES.get(HANGUL_JUNGSEONG[jung], HANGUL_JUNGSEONG[jung]))
+            out.append(HANGUL_KEYSTROKES.get(HANGUL_JONGSEONG[jong], HANGUL_JONGSEONG[jong]))
+        elif not char.isspace():
+            out.append(HANGUL_KEYSTROKES.get(char, char))
+    return "".join(out)
+
+
+def hangul_choseong(text: str) -> str:
+    """완성형 음절은 초성으로, 나머지 글자는 그대로 (공백 제거, 영문 소문자)"""
+    out = []
+    for char in unicodedata.normalize("NFC", text).lower():
+        if _is_syllable(char):
+            out.append(HANGUL_CHOSEONG[(ord(char) - HANGUL_BASE) // 588])
+        elif not char.isspace():
+            out.append(char)
+    return "".join(out)
+
+
+def is_choseong_query(text: str) -> bool:
+    """초성만으로 된 질의인지 ("ㄹㅂ")"""
+    letters = [char for char in text if not char.isspace()]
+    return bool(letters) and all(char in HANGUL_CHOSEONG for char in letters)
+
+
+def korean_word_suffixes(text: str) -> Iterator[str]:
+    """한글이 들어 있는 단어마다 그 단어부터 끝까지의 문자열 (단어 시작 위치 검색용)"""
+    words = unicodedata.normalize("NFC", text).split()
+    for i, word in enumerate(words):
+        if _HANGUL_WORD_RE.search(word):
+            yield " ".join(words[i:])
+
+
+class KoreanKeyTableBuilder:
+    """
+    한글 접두어/초성 검색용 정렬 키 테이블.
+
+    preferred_label_ko/description_ko의 각 한글 단어 위치에서 시작하는 자모 키와
+    초성 키를 만들어 정렬해 둔다. 질의도 같은 규칙으로 바꾼 뒤 [q, q + U+FFFF)
+    범위를 이분 탐색하면 되므로 요청마다 카탈로그 전체를 분해할 필요가 없다.
+
+    출력 형식:
+      skill_ids[i]    - 순번 i의 스킬 ID
+      texts[i]        - [NFC label_ko, NFC description_ko]
+      jamo/choseong   - {"keys": 정렬된 고유 키, "offsets": CSR 오프셋, "refs": 순번 * 2 + 필드}
+                        (필드 0 = label, 1 = description, 키 i의 refs는 refs[offsets[i]:offsets[i + 1]])
+    """
+
+    def __init__(self):
+        self.skill_ids: List[str] = []
+        self.texts: List[List[str]] = []
+        self.tables: Dict[str, Dict[str, List[int]]] = {"jamo": {}, "choseong": {}}
+
+    def add(self, skill: SkillRecord) -> None:
+        ordinal = len(self.skill_ids)
+        self.skill_ids.append(skill.skill_id)
+        fields = [unicodedata.normalize("NFC", skill.label_ko), unicodedata.normalize("NFC", skill.description_ko)]
+        self.texts.append(fields)
+        for field, text in enumerate(fields):
+            ref = ordinal * 2 + field
+            for suffix in korean_word_suffixes(text):
+                for name, key in (
+                    ("jamo", hangul_jamo(suffix)[:KOREAN_JAMO_KEY_LENGTH]),
+                    ("choseong", hangul_choseong(suffix)[:KOREAN_CHOSEONG_KEY_LENGTH]),
+                ):
+                    refs = self.tables[name].setdefault(key, [])
+                    if not refs or refs[-1] != ref:
+                        refs.append(ref)
+
+    @staticmethod
+    def _columns(table: Dict[str, List[int]]) -> Dict[str, List[Any]]:
+        keys = sorted(table)
+        offsets, refs = [0], []
+        for key in keys:
+            refs.extend(table[key])
+            offsets.append(len(refs))
+        return {"keys": keys, "offsets": offsets, "refs": refs}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": 1,
+            "fields": list(KOREAN_KEY_FIELDS),
+            "key_lengths": {"jamo": KOREAN_JAMO_KEY_LENGTH, "choseong": KOREAN_CHOSEONG_KEY_LENGTH},
+            "skill_ids": self.skill_ids,
+            "texts": self.texts,
+            "jamo": self._columns(self.tables["jamo"]),
+            "choseong": self._columns(self.tables["choseong"]),
+        }
+
+    def write(self, path: Path) -> List[Tuple[Path, int]]:
+        return [(path, write_artifact(path, self.to_dict()))]
+
+
+class KoreanKeyTable:
+    """KoreanKeyTableBuilder 출력의 조회기 (초성 질의는 초성 키, 그 외는 자모 키로 범위 검색)"""
+
+    def __init__(self, path: Path):
+        with open(path, encoding="utf-8") as f:
+            self.data = json.load(f)
+
+    def lookup(self, query: str, limit: Optional[int] = None) -> List[Tuple[str, str]]:
+        """질의가 단어 시작에 접두어로 맞는 (skill_id, 필드) 목록 (label 먼저, 카탈로그 순)"""
+        name = "choseong" if is_choseong_query(query) else "jamo"
+        convert = hangul_choseong if name == "choseong" else hangul_jamo
+        key = convert(query)
+        if not key:
+            return []
+        table = self.data[name]
+        probe = key[: self.data["key_lengths"][name]]
+        lo = bisect.bisect_left(table["keys"], probe)
+        hi = bisect.bisect_left(table["keys"], probe + "\uffff")
+        refs = sorted(
+            {ref for i in range(lo, hi) for ref in table["refs"][table["offsets"][i]:table["offsets"][i + 1]]},
+            key=lambda ref: (ref % 2, ref),
+        )
+        matches = []
+        for ref in refs:
+            ordinal, field = divmod(ref, 2)
+            # 키 길이보다 긴 질의는 잘린 키로 찾았으므로 원문에서 다시 확인
+            if len(key) > len(probe) and not any(
+                convert(suffix).startswith(key) for suffix in korean_word_suffixes(self.data["texts"][ordinal][field])
+            ):
+                continue
+            matches.append((self.data["skill_ids"][ordinal], KOREAN_KEY_FIELDS[field]))
+            if limit and len(matches) >= limit:
+                break
+        return matches
+
+
+# ==================== 계층 인덱스 ====================
+
+class HierarchyIndexBuilder:
+    """
+    Knowledge → Skill → Competence 계층(parent_skill_id)의 사전 계산 인덱스.
+
+    모든 배열은 카탈로그 순번(ordinal)으로 인덱싱한다.
+      parent[i]            - 부모 순번 (루트는 -1)
+      depth[i]             - 루트 깊이 0
+      child_offsets/children - CSR 형식 자식 목록 (children[child_offsets[i]:child_offsets[i+1]])
+      pre[i], last[i]      - 전위 순회 번호와 서브트리의 마지막 전위 번호
+      preorder[k]          - 전위 번호 k의 순번
+
+    "A가 B의 조상인가"는 pre[A] < pre[B] <= last[A] (O(1)),
+    "A의 모든 자손"은 preorder[pre[A] + 1 : last[A] + 1] 범위 조회로 답한다.
+    부모 ID가 카탈로그에 없으면 루트로 취급하고 orphans에 기록한다.
+    """
+
+    def __init__(self):
+        self.skill_ids: List[str] = []
+        self.parent_ids: List[Optional[str]] = []
+
+    def add(self, skill: SkillRecord) -> None:
+        self.skill_ids.append(skill.skill_id)
+        self.parent_ids.append(skill.parent_skill_id)
+
+    def to_dict(self) -> Dict[str, Any]:
+        count = len(self.skill_ids)
+        ordinals = {skill_id: i for i, skill_id in enumerate(self.skill_ids)}
+        parent = [ordinals.get(parent_id, -1) if parent_id else -1 for parent_id in self.parent_ids]
+        orphans = [
+            self.skill_ids[i] for i, parent_id in enumerate(self.parent_ids) if parent_id and parent_id not in ordinals
+        ]
+
+        child_lists: List[List[int]] = [[] for _ in range(count)]
+        for i, p in enumerate(parent):
+            if p >= 0:
+                child_lists[p].append(i)
+        child_offsets = [0]
+        children: List[int] = []
+        for kids in child_lists:
+            children.extend(kids)
+            child_offsets.append(len(children))
+
+        depth = [0] * count
+        pre = [-1] * count
+        last = [-1] * count
+        preorder: List[int] = []
+        # 루트부터 반복 DFS. 순환에 갇혀 루트에서 닿지 않는 노드는 그 자리에서 루트로 삼는다.
+        roots = [i for i in range(count) if parent[i] < 0] + list(range(count))
+        cycles = []
+        for root in roots:
+            if pre[root] >= 0:
+                continue
+            if parent[root] >= 0:
+                cycles.append(self.skill_ids[root])
+            depth[root] = 0
+            stack = [(root, False)]
+            while stack:
+                node, exiting = stack.pop()
+                if exiting:
+                    last[node] = len(preorder) - 1
+                    continue
+                pre[node] = len(preorder)
+                preorder.append(node)
+                stack.append((node, True))
+                for child in reversed(child_lists[node]):
+                    if pre[child] < 0:
+                        depth[child] = depth[node] + 1
+                        stack.append((child, False))
+
+        return {
+            "version": 1,
+            "skill_ids": self.skill_ids,
+            "parent": parent,
+            "depth": depth,
+            "child_offsets": child_offsets,
+            "children": children,
+            "pre": pre,
+            "last": last,
+            "preorder": preorder,
+            "orphans": orphans,
+            "cycles": cycles,
+        }
+
+    def write(self, path: Path) -> List[Tuple[Path, int]]:
+        return [(path, write_artifact(path, self.to_dict()))]
+
+
+# ==================== 검증 ====================
+
+# scripts/validate-robot-data.js와 같은 기준
+VALIDATION_MIN_SKILLS = 120
+VALIDATION_LEVELS = (1, 2, 3, 4)
+VALIDATION_REQUIRED_FIELDS = (
+    "skill_id",
+    "domain",
+    "esco_uri",
+    "preferred_label_ko",
+    "preferred_label_en",
+    "skill_type",
+    "proficiency_level",
+    "role_mapping",
+)
+# 검사 항목별로 보고서에 남기는 상세 건수 (개수는 전부 센다)
+VALIDATION_MAX_DETAILS = 20
+
+
+class CatalogValidator:
+    """
+    생성 스트림을 한 번 훑으며 카탈로그를 검증 (출력 파일을 다시 읽지 않는다).
+
+    skill_id/esco_uri 해시 색인으로 중복을 바로 잡고, parent_skill_id·related_skills
+    참조는 끝에서 색인 조회로 확인한다. 순환은 부모 포인터를 방문 상태와 함께
+    한 번씩만 따라가므로 전체가 O(n)이다.
+
+    오류(errors)가 하나라도 있으면 실패, 경고(warnings)는 보고만 한다.
+    """
+
+    def __init__(self):
+        self.total = 0
+        self.ordinals: Dict[str, int] = {}
+        self.uris: Dict[str, str] = {}
+        self.parents: List[Optional[str]] = []
+        self.skill_ids: List[str] = []
+        self.related: List[Tuple[int, str]] = []
+        self.domains: Dict[str, int] = {}
+        self.types: Dict[str, int] = {}
+        self.roles: Dict[str, int] = {}
+        self.levels: Dict[int, int] = {}
+        self.errors: Dict[str, List[Dict[str, Any]]] = {}
+        self.warnings: Dict[str, List[Dict[str, Any]]] = {}
+        self.counts: Dict[str, int] = {}
+
+    def _report(self, bucket: Dict[str, List[Dict[str, Any]]], check: str, **detail: Any) -> None:
+        self.counts[check] = self.counts.get(check, 0) + 1
+        details = bucket.setdefault(check, [])
+        if len(details) < VALIDATION_MAX_DETAILS:
+            details.append(detail)
+
+    def add(self, skill: SkillRecord) -> None:
+        record = skill.to_dict()
+        ordinal = self.total
+        self.total += 1
+        skill_id = record.get("skill_id")
+
+        for field in VALIDATION_REQUIRED_FIELDS:
+            if not record.get(field):
+                self._report(self.errors, "missing_field", skill_id=skill_id, field=field)
+
+        if skill_id in self.ordinals:
+            self._report(self.errors, "duplicate_id", skill_id=skill_id)
+        else:
+            self.ordinals[skill_id] = ordinal
+        uri = record.get("esco_uri")
+        if uri:
+            if uri in self.uris:
+                self._report(self.errors, "duplicate_uri", skill_id=skill_id, esco_uri=uri, first=self.uris[uri])
+            else:
+                self.uris[uri] = skill_id
+
+        self.skill_ids.append(skill_id)
+        self.parents.append(record.get("parent_skill_id"))
+        for related_id in record.get("related_skills") or ():
+            self.related.append((ordinal, related_id))
+
+        for counts, key in ((self.domains, record.get("domain")), (self.types, record.get("skill_type"))):
+            counts[key] = counts.get(key, 0) + 1
+        level = record.get("proficiency_level")
+        self.levels[level] = self.levels.get(level, 0) + 1
+        for role in record.get("role_mapping") or ():
+            self.roles[role] = self.roles.get(role, 0) + 1
+
+    def _check_references(self) -> None:
+        for ordinal, parent_id in enumerate(self.parents):
+            if parent_id and parent_id not in self.ordinals:
+                self._report(self.errors, "orphan_parent", skill_id=self.skill_ids[ordinal], parent_skill_id=parent_id)
+        for ordinal, related_id in self.related:
+            if related_id not in self.ordinals:
+                self._report(self.warnings, "invalid_related", skill_id=self.skill_ids[ordinal], related_skill_id=related_id)
+
+    def _check_cycles(self) -> None:
+        # 0 미방문, 1 현재 경로, 2 완료. 노드마다 한 번만 경로에 오른다.
+        state = [0] * self.total
+        for start in range(self.total):
+            path = []
+            node = start
+            while node is not None and state[node] == 0:
+                state[node] = 1
+                path.append(node)
+                parent_id = self.parents[node]
+                node = self.ordinals.get(parent_id) if parent_id else None
+            if node is not None and state[node] == 1:
+                cycle = path[path.index(node):]
+                self._report(self.errors, "cycle", skill_ids=[self.skill_ids[i] for i in cycle])
+            for visited in path:
+                state[visited] = 2
+
+    def _check_distribution(self) -> None:
+        if self.total < VALIDATION_MIN_SKILLS:
+            self._report(self.warnings, "min_skills", total=self.total, required=VALIDATION_MIN_SKILLS)
+        for check, expected, counts in (
+            ("missing_domain", DOMAINS, self.domains),
+            ("missing_skill_type", SKILL_TYPES, self.types),
+            ("missing_role", ROLES, self.roles),
+        ):
+            for value in expected:
+                if not counts.get(value):
+                    self._report(self.errors, check, value=value)
+        for level in VALIDATION_LEVELS:
+            if not self.levels.get(level):
+                self._report(self.warnings, "missing_level", value=level)
+
+    def finish(self) -> Dict[str, Any]:
+        self._check_references()
+        self._check_cycles()
+        self._check_distribution()
+        return {
+            "ok": not self.errors,
+            "total": self.total,
+            "counts": self.counts,
+            "errors": self.errors,
+            "warnings": self.warnings,
+            "distribution": {
+                "domain": self.domains,
+                "skill_type": self.types,
+                "role": self.roles,
+                "proficiency_level": {str(level): count for level, count in sorted(self.levels.items())},
+            },
+        }
+
+
+def validate_records(skills: Iterable[SkillRecord]) -> Dict[str, Any]:
+    validator = CatalogValidator()
+    for skill in skills:
+        validator.add(skill)
+    return validator.finish()
+
+
+# ==================== 온톨로지 스냅샷 (델타 체인) ====================
+
+DEFAULT_SNAPSHOT_DIR = DEFAULT_CACHE_DIR / "snapshots"
+SNAPSHOT_VERSION = 1
+# 마지막 base 이후 델타가 이만큼 쌓이면 다음 스냅샷은 base로 압축
+DEFAULT_SNAPSHOT_COMPACT_EVERY = 20
+# ontology_snapshots.domain_id (스냅샷은 카탈로그 전체 단위)
+SNAPSHOT_DOMAIN_ID = "robot-smartfactory"
+
+
+def catalog_hash(records: List[Dict[str, Any]]) -> str:
+    encoded = json.dumps(records, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def diff_catalogs(previous: List[Dict[str, Any]], current: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    skill_id 기준 델타: added(레코드 전체), removed(ID), changed(필드 단위 set/unset).
+
+    필드 순서가 바뀐 레코드는 keys, 레코드 순서가 "이전 순서 - 삭제 + 추가"와
+    다르면 order를 함께 기록해 apply_delta가 바이트 단위로 같은 카탈로그를 만든다.
+    """
+    old = {record["skill_id"]: record for record in previous}
+    new_ids = [record["skill_id"] for record in current]
+    new_set = set(new_ids)
+
+    added = [record for record in current if record["skill_id"] not in old]
+    removed = [skill_id for skill_id in old if skill_id not in new_set]
+    changed: Dict[str, Dict[str, Any]] = {}
+    for record in current:
+        before = old.get(record["skill_id"])
+        if before is None or before == record and list(before) == list(record):
+            continue
+        change: Dict[str, Any] = {"set": {key: value for key, value in record.items() if key not in before or before[key] != value}}
+        unset = [key for key in before if key not in record]
+        if unset:
+            change["unset"] = unset
+        merged = [key for key in before if key not in unset] + [key for key in record if key not in before]
+        if merged != list(record):
+            change["keys"] = list(record)
+        changed[record["skill_id"]] = change
+
+    delta: Dict[str, Any] = {"added": added, "removed": removed, "changed": changed}
+    removed_set = set(removed)
+    natural = [skill_id for skill_id in old if skill_id not in removed_set] + [record["skill_id"] for record in added]
+    if natural != new_ids:
+        delta["order"] = new_ids
+    return delta
+
+
+def apply_delta(records: List[Dict[str, Any]], delta: Dict[str, Any]) -> List[Dict[str, Any]]:
+    removed = set(delta["removed"])
+    by_id = {record["skill_id"]: record for record in records if record["skill_id"] not in removed}
+    for skill_id, change in delta["changed"].items():
+        record = dict(by_id[skill_id])
+        for key in change.get("unset", ()):
+            del record[key]
+        record.update(change["set"])
+        if "keys" in change:
+            record = {key: record[key] for key in change["keys"]}
+        by_id[skill_id] = record
+    for record in delta["added"]:
+        by_id[record["skill_id"]] = record
+    order = delta.get("order") or list(by_id)
+    return [by_id[skill_id] for skill_id in order]
+
+
+class SnapshotChain:
+    """
+    base 스냅샷 + 델타 체인으로 카탈로그 버전을 보관하는 디렉터리.
+
+      chain.json               - 버전 목록 (seq, kind, file, hash, 변경 건수)와 SQL로 내보낸 마지막 seq
+      000001.base.json         - 카탈로그 전체
+      000002.delta.json        - 직전 버전 대비 델타
+
+    어떤 버전이든 가장 가까운 이전 base에서 최대 compact_every개 델타만 적용해 복원한다.
+    복원 결과는 기록된 해시로 확인한다.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self.entries: List[Dict[str, Any]] = []
+        self.sql_exported = 0
+        try:
+            with open(directory / "chain.json", encoding="utf-8") as f:
+                chain = json.load(f)
+            if chain.get("version") == SNAPSHOT_VERSION:
+                self.entries = chain["entries"]
+                self.sql_exported = chain.get("sql_exported", 0)
+        except (OSError, ValueError):
+            pass
+
+    def _save(self) -> None:
+        atomic_write_text(
+            self.directory / "chain.json",
+            json.dumps(
+                {"version": SNAPSHOT_VERSION, "sql_exported": self.sql_exported, "entries": self.entries},
+                ensure_ascii=False,
+                indent=2,
+            ),
+        )
+
+    def _read(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        with open(self.directory / entry["file"], encoding="utf-8") as f:
+            return json.load(f)
+
+    def restore(self, seq: Optional[int] = None) -> List[Dict[str, Any]]:
+        """seq 버전(생략 시 최신)의 카탈로그 레코드 목록"""
+        if not self.entries:
+            raise KeyError("스냅샷이 없습니다")
+        target = len(self.entries) - 1 if seq is None else next(
+            (i for i, entry in enumerate(self.entries) if entry["seq"] == seq), None
+        )
+        if target is None:
+            raise KeyError(f"스냅샷 {seq}이(가) 없습니다")
+        start = max(i for i in range(target + 1) if self.entries[i]["kind"] == "base")
+
+        records = self._read(self.entries[start])["records"]
+        for entry in self.entries[start + 1 : target + 1]:
+            records = apply_delta(records, self._read(entry))
+        if catalog_hash(records) != self.entries[target]["hash"]:
+            raise ValueError(f"스냅샷 {self.entries[target]['seq']} 복원 해시 불일치")
+        return records
+
+    def record(self, records: List[Dict[str, Any]], compact_every: int = DEFAULT_SNAPSHOT_COMPACT_EVERY) -> Optional[Path]:
+        """직전 버전과 내용이 다르면 새 버전을 추가하고 기록한 파일 경로를 돌려준다"""
+        digest = catalog_hash(records)
+        if self.entries and self.entries[-1]["hash"] == digest:
+            return None
+
+        seq = self.entries[-1]["seq"] + 1 if self.entries else 1
+        since_base = next(
+            (n for n, entry in enumerate(reversed(self.entries)) if entry["kind"] == "base"), len(self.entries)
+        )
+        entry: Dict[str, Any] = {
+            "seq": seq,
+            "hash": digest,
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "records": len(records),
+        }
+        if not self.entries or since_base >= compact_every:
+            entry.update(kind="base", file=f"{seq:06d}.base.json")
+            payload: Dict[str, Any] = {"seq": seq, "records": records}
+        else:
+            delta = diff_catalogs(self.restore(), records)
+            entry.update(
+                kind="delta",
+                file=f"{seq:06d}.delta.json",
+                parent=self.entries[-1]["hash"],
+                added=len(delta["added"]),
+                removed=len(delta["removed"]),
+                changed=len(delta["changed"]),
+            )
+            payload = dict(seq=seq, **delta)
+
+        path = self.directory / entry["file"]
+        write_artifact(path, payload)
+        self.entries.append(entry)
+        self._save()
+        return path
+
+    def write_sql(self, path: Path, since: Optional[int] = None, domain_id: str = SNAPSHOT_DOMAIN_ID) -> int:
+        """
+        seq > since인 버전만 ontology_snapshots INSERT 스크립트로 기록 (migration 003의 컬럼).
+
+        since를 생략하면 지난 내보내기 이후 추가된 버전만 쓰므로 스크립트 크기가 체인
+        길이가 아니라 변경 크기에 비례한다 (실행마다 적재하거나, 빠뜨렸으면 since로 다시
+        뽑는다). 새 버전이 없으면 파일을 건드리지 않는다. parent_snapshot_id는 직전
+        sequence 행을 조회해 채우고, 이미 적재된 sequence는 ON CONFLICT로 건너뛴다.
+        기록한 버전 수를 돌려준다.
+        """
+        if since is None:
+            since = self.sql_exported
+        pending = [(i, entry) for i, entry in enumerate(self.entries) if entry["seq"] > since]
+        if not pending:
+            return 0
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write("-- 로봇테크 for 스마트팩토리 스냅샷 체인 (generate-robot-smartfactory-data.py 생성)\n")
+            f.write(f"-- sequence {pending[0][1]['seq']}..{pending[-1][1]['seq']}\n")
+            f.write("BEGIN;\n\n")
+            for i, entry in pending:
+                payload = (self.directory / entry["file"]).read_text(encoding="utf-8")
+                parent = "NULL"
+                if entry["kind"] == "delta" and i > 0:
+                    previous = self.entries[i - 1]
+                    parent = (
+                        f"(SELECT id FROM ontology_snapshots WHERE domain_id = {sql_literal(domain_id)}"
+                        f" AND sequence = {previous['seq']})"
+                    )
+                values = ", ".join(
+                    (
+                        sql_literal(f"{domain_id} #{entry['seq']:06d}"),
+                        sql_literal(domain_id),
+                        f"{sql_literal(payload)}::jsonb",
+                        sql_literal(entry["created_at"]),
+                        sql_literal(entry["kind"]),
+                        str(entry["seq"]),
+                        parent,
+                        sql_literal(entry["hash"]),
+                    )
+                )
+                f.write(
+                    "INSERT INTO ontology_snapshots"
+                    " (snapshot_name, domain_id, snapshot_data, created_at, snapshot_kind, sequence, parent_snapshot_id, content_hash)\n"
+                    f"VALUES ({values})\n"
+                    "ON CONFLICT (domain_id, sequence) DO NOTHING;\n"
+                )
+            f.write("\nCOMMIT;\n")
+        os.replace(tmp_path, path)
+        self.sql_exported = max(self.sql_exported, pending[-1][1]["seq"])
+        self._save()
+        return len(pending)
+
+
+class SnapshotRecorder:
+    """
+    생성 스트림의 레코드를 모아 스냅샷 체인에 새 버전으로 기록하는 부가 산출물.
+
+    sql_path가 있으면 지난 내보내기(또는 sql_since) 이후 버전의 ontology_snapshots 적재
+    스크립트도 함께 기록한다.
+    """
+
+    def __init__(
+        self,
+        compact_every: int = DEFAULT_SNAPSHOT_COMPACT_EVERY,
+        sql_path: Optional[Path] = None,
+        sql_since: Optional[int] = None,
+    ):
+        self.compact_every = compact_every
+        self.sql_path = sql_path
+        self.sql_since = sql_since
+        self.records: List[Dict[str, Any]] = []
+
+    def add(self, skill: SkillRecord) -> None:
+        self.records.append(skill.to_dict())
+
+    def write(self, directory: Path) -> List[Tuple[Path, int]]:
+        chain = SnapshotChain(directory)
+        path = chain.record(self.records, self.compact_every)
+        written = [path] if path else []
+        if self.sql_path and chain.write_sql(self.sql_path, self.sql_since):
+            written.append(self.sql_path)
+        return [(written_path, written_path.stat().st_size) for written_path in written]
+
+
+class _StoredRecord:
+    """이미 dict로 된 레코드를 FORMAT_SPECS 인코더에 넘기기 위한 래퍼"""
+
+    __slots__ = ("data",)
+
+    def __init__(self, data: Dict[str, Any]):
+        self.data = data
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self.data
+
+
+def restore_snapshot(directory: Path, seq: Optional[int], output_path: Path, fmt: str) -> int:
+    """스냅샷 버전을 생성 출력과 같은 바이트로 기록"""
+    records = SnapshotChain(directory).restore(seq)
+    tmp_path = output_path.with_name(f".{output_path.name}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        count = write_records((_StoredRecord(record) for record in records), f, fmt)
+    os.replace(tmp_path, output_path)
+    return count
+
+
+# ==================== 도메인 샤드 ====================
+
+DEFAULT_SHARD_DIR = DEFAULT_ARTIFACT_DIR / "shards"
+SHARD_MANIFEST_VERSION = 1
+SHARD_HASH_LENGTH = 16
+# 현재 도메인 샤드 버퍼가 이보다 커지면 디스크로 넘긴다
+SHARD_BUFFER_BYTES = 1 << 20
+# <도메인>[.<타입>].<콘텐츠 해시>.json
+SHARD_FILE_PATTERN = re.compile(
+    rf"[a-z0-9-]+(?:\.(?:{'|'.join(SKILL_TYPES)}))?\.[0-9a-f]{{{SHARD_HASH_LENGTH}}}\.json"
+)
+
+
+class ShardedCatalogBuilder:
+    """
+    도메인별(옵션: 도메인 × skill_type별) 샤드와 매니페스트.
+
+      <도메인>[.<타입>].<콘텐츠 해시>.json - 그 샤드 레코드의 공백 없는 JSON 배열
+      manifest.json                       - 샤드 목록 (파일, 해시, 레코드 수, 바이트 수)
+
+    파일 이름에 내용 해시가 들어가므로 클라이언트는 매니페스트만 새로 받고 샤드는
+    영구 캐시할 수 있다. 내용이 같은 샤드는 다시 쓰지 않는다. 새 매니페스트를 원자적으로
+    교체한 뒤에야 그것이 가리키지 않는 샤드 파일을 지우므로, 읽는 쪽이 보는 매니페스트의
+    샤드는 항상 존재한다.
+
+    레코드는 도메인 순서로 들어오므로 현재 도메인의 샤드만 버퍼에 모으고, 도메인이 바뀌면
+    한 임시 스풀 파일 끝에 이어 붙여 (오프셋, 길이) 구간만 기억한다. 도메인이 수백 개여도
+    열린 파일은 스풀 하나와 현재 도메인의 버퍼뿐이다.
+    """
+
+    def __init__(self, by_type: bool = False):
+        self.by_type = by_type
+        self.shards: Dict[str, Dict[str, Any]] = {}
+        self._spool: Optional[BinaryIO] = None
+        self._buffers: Dict[str, BinaryIO] = {}
+        self._domain: Optional[str] = None
+
+    def add(self, skill: SkillRecord) -> None:
+        if skill.domain != self._domain:
+            self._spill()
+            self._domain = skill.domain
+        key = f"{skill.domain}.{skill.skill_type}" if self.by_type else skill.domain
+        shard = self.shards.get(key)
+        if shard is None:
+            shard = self.shards[key] = {
+                "domain": skill.domain,
+                "skill_type": skill.skill_type if self.by_type else None,
+                "records": 0,
+                "bytes": 0,
+                "spans": [],
+                "digest": hashlib.sha256(),
+            }
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            buffer = self._buffers[key] = tempfile.SpooledTemporaryFile(max_size=SHARD_BUFFER_BYTES)
+        body = ("," if shard["records"] else "[") + json.dumps(
+            skill.to_dict(), ensure_ascii=False, separators=(",", ":")
+        )
+        chunk = body.encode("utf-8")
+        buffer.write(chunk)
+        shard["digest"].update(chunk)
+        shard["bytes"] += len(chunk)
+        shard["records"] += 1
+
+    def _spill(self) -> None:
+        """현재 도메인 샤드 버퍼를 스풀 끝에 옮기고 닫는다"""
+        if not self._buffers:
+            return
+        if self._spool is None:
+            self._spool = tempfile.TemporaryFile()
+        for key, buffer in self._buffers.items():
+            offset = self._spool.seek(0, os.SEEK_END)
+            buffer.seek(0)
+            shutil.copyfileobj(buffer, self._spool)
+            self.shards[key]["spans"].append((offset, self._spool.tell() - offset))
+            buffer.close()
+        self._buffers = {}
+
+    def _copy_shard(self, shard: Dict[str, Any], f: BinaryIO) -> None:
+        for offset, length in shard["spans"]:
+            self._spool.seek(offset)
+            while length:
+                chunk = self._spool.read(min(length, 1 << 20))
+                f.write(chunk)
+                length -= len(chunk)
+        f.write(b"]")
+
+    def write(self, directory: Path) -> List[Tuple[Path, int]]:
+        directory.mkdir(parents=True, exist_ok=True)
+        manifest_path = directory / "manifest.json"
+        try:
+            with open(manifest_path, encoding="utf-8") as f:
+                previous = json.load(f).get("shards", [])
+        except (OSError, ValueError):
+            previous = []
+
+        self._spill()
+        entries, written = [], []
+        for key, shard in self.shards.items():
+            shard["digest"].update(b"]")
+            shard["bytes"] += 1
+            digest = shard["digest"].hexdigest()[:SHARD_HASH_LENGTH]
+            path = directory / f"{key}.{digest}.json"
+            if not path.exists() or path.stat().st_size != shard["bytes"]:
+                tmp_path = path.with_name(f".{path.name}.tmp")
+                with open(tmp_path, "wb") as f:
+                    self._copy_shard(shard, f)
+                os.replace(tmp_path, path)
+            entry = {"file": path.name, "domain": shard["domain"]}
+            if self.by_type:
+                entry["skill_type"] = shard["skill_type"]
+            entry.update(hash=digest, records=shard["records"], bytes=shard["bytes"])
+            entries.append(entry)
+            written.append((path, shard["bytes"]))
+
+        manifest = {
+            "version": SHARD_MANIFEST_VERSION,
+            "by_type": self.by_type,
+            "total": sum(entry["records"] for entry in entries),
+            "shards": entries,
+        }
+        written.append((manifest_path, write_artifact(manifest_path, manifest)))
+        if self._spool is not None:
+            self._spool.close()
+            self._spool = None
+
+        # 직전 매니페스트의 샤드 + 중단된 실행이 남긴 샤드 이름 파일 중 참조되지 않는 것
+        current = {entry["file"] for entry in entries}
+        stale = {entry.get("file") for entry in previous} | {
+            path.name for path in directory.iterdir() if SHARD_FILE_PATTERN.fullmatch(path.name)
+        }
+        for name in stale - current:
+            if name:
+                (directory / name).unlink(missing_ok=True)
+        return written
+
+
+# ==================== 패킹 아카이브 ====================
+
+PACK_MAGIC = b"RSFPACK1"
+PACK_VERSION = 1
+# 헤더: magic, version, 레코드 수, 키 폭, 데이터 시작 오프셋 (32바이트로 패딩)
+PACK_HEADER = struct.Struct("<8sIIIQ4x")
+
+
+def _pack_entry_struct(key_width: int) -> struct.Struct:
+    """색인 항목: NUL 패딩된 skill_id, 데이터 내 오프셋, 길이"""
+    return struct.Struct(f"<{key_width}sQI")
+
+
+class PackedArchiveBuilder:
+    """
+    스킬별 JSON 파일 대신 쓰는 단일 아카이브.
+
+    [헤더][skill_id로 정렬된 고정 폭 색인][공백 없는 JSON 레코드들]
+    색인이 고정 폭이라 mmap 후 이진 탐색 한 번, 슬라이스 한 번으로 레코드 하나를
+    읽는다 (전체 파싱 없음). 레코드 본문은 생성 순서대로 임시 파일에 흘려 쓴다.
+    """
+
+    def __init__(self):
+        self._data = tempfile.TemporaryFile()
+        self._entries: List[Tuple[bytes, int, int]] = []
+        self._size = 0
+
+    def add(self, skill: SkillRecord) -> None:
+        body = json.dumps(skill.to_dict(), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self._data.write(body)
+        self._entries.append((skill.skill_id.encode("utf-8"), self._size, len(body)))
+        self._size += len(body)
+
+    def write(self, path: Path) -> List[Tuple[Path, int]]:
+        self._entries.sort()
+        key_width = max((len(key) for key, _offset, _length in self._entries), default=0)
+        entry = _pack_entry_struct(key_width)
+        data_offset = PACK_HEADER.size + entry.size * len(self._entries)
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(PACK_HEADER.pack(PACK_MAGIC, PACK_VERSION, len(self._entries), key_width, data_offset))
+            for key, offset, length in self._entries:
+                f.write(entry.pack(key, offset, length))
+            self._data.seek(0)
+            shutil.copyfileobj(self._data, f)
+        self._data.close()
+        os.replace(tmp_path, path)
+        return [(path, data_offset + self._size)]
+
+
+class PackedArchive:
+    """PackedArchiveBuilder 출력의 mmap 리더 (skill_id 조회는 O(log n) 비교 + 슬라이스 1회)"""
+
+    def __init__(self, path: Path):
+        self._file = open(path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.count, self.key_width, self.data_offset = PACK_HEADER.unpack_from(self._mm, 0)
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            self.close()
+            raise ValueError(f"패킹 아카이브가 아닙니다: {path}")
+        self._entry = _pack_entry_struct(self.key_width)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __enter__(self) -> "PackedArchive":
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._mm.close()
+        self._file.close()
+
+    def _entry_at(self, i: int) -> Tuple[bytes, int, int]:
+        return self._entry.unpack_from(self._mm, PACK_HEADER.size + i * self._entry.size)
+
+    def get_bytes(self, skill_id: str) -> Optional[bytes]:
+        key = skill_id.encode("utf-8")
+        if len(key) > self.key_width:
+            return None
+        key = key.ljust(self.key_width, b"\0")
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._entry_at(mid)[0] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == self.count:
+            return None
+        found, offset, length = self._entry_at(lo)
+        if found != key:
+            return None
+        start = self.data_offset + offset
+        return self._mm[start : start + length]
+
+    def get(self, skill_id: str) -> Optional[Dict[str, Any]]:
+        body = self.get_bytes(skill_id)
+        return json.loads(body) if body is not None else None
+
+
+# ==================== 비트맵 색인 ====================
+
+BITMAP_ENCODINGS = ("dense", "roaring")
+# roaring 방식 컨테이너 크기 (비트 65536개 = 8192바이트)
+ROARING_CHUNK_BITS = 1 << 16
+ROARING_CHUNK_BYTES = ROARING_CHUNK_BITS // 8
+
+
+def _set_bits(value: int) -> Iterator[int]:
+    while value:
+        low = value & -value
+        yield low.bit_length() - 1
+        value ^= low
+
+
+def encode_bitmap(bits: bytes, encoding: str) -> Any:
+    """
+    비트셋(순번 i = 바이트 i//8의 비트 i%8) 인코딩.
+
+    dense   - 리틀 엔디언 바이트열의 base64
+    roaring - 65536비트 청크마다 가장 작은 컨테이너를 고른다
+              [상위 16비트, "array", [하위 위치...]] / [.., "run", [시작, 길이-1, ...]] /
+              [.., "bitmap", base64]. 빈 청크는 생략.
+    """
+    if encoding == "dense":
+        return base64.b64encode(bits).decode("ascii")
+    containers = []
+    for high, start in enumerate(range(0, len(bits), ROARING_CHUNK_BYTES)):
+        chunk = bits[start : start + ROARING_CHUNK_BYTES]
+        positions = list(_set_bits(int.from_bytes(chunk, "little")))
+        if not positions:
+            continue
+        runs: List[int] = []
+        for position in positions:
+            if runs and runs[-2] + runs[-1] + 1 == position:
+                runs[-1] += 1
+            else:
+                runs.extend((position, 0))
+        sizes = {"array": 2 * len(positions), "run": 2 * len(runs), "bitmap": ROARING_CHUNK_BYTES}
+        kind = min(sizes, key=sizes.get)
+        if kind == "array":
+            containers.append([high, kind, positions])
+        elif kind == "run":
+            containers.append([high, kind, runs])
+        else:
+            containers.append([high, kind, base64.b64encode(chunk.ljust(ROARING_CHUNK_BYTES, b"\0")).decode("ascii")])
+    return containers
+
+
+def decode_bitmap(encoded: Any, encoding: str) -> int:
+    """encode_bitmap의 역변환 → 파이썬 정수 비트셋 (AND/OR/ANDNOT은 &, |, & ~)"""
+    if encoding == "dense":
+        return int.from_bytes(base64.b64decode(encoded), "little")
+    value = 0
+    for high, kind, payload in encoded:
+        if kind == "array":
+            chunk = 0
+            for position in payload:
+                chunk |= 1 << position
+        elif kind == "run":
+            chunk = 0
+            for start, extra in zip(payload[::2], payload[1::2]):
+                chunk |= ((1 << (extra + 1)) - 1) << start
+        else:
+            chunk = int.from_bytes(base64.b64decode(payload), "little")
+        value |= chunk << (high * ROARING_CHUNK_BITS)
+    return value
+
+
+class BitmapIndexBuilder:
+    """
+    스킬 순번에 대한 비트맵 색인: 역할, 숙련도(정확히 / 이상), skill_type, 도메인별 비트셋.
+
+    "engineer, 레벨 3 이상, MVS, 보유 스킬 제외" 같은 갭 질의는
+    role & proficiency_min & domain & ~held 비트 연산 몇 번으로 끝난다 (BitmapIndex).
+    비트는 bytearray에 바로 세워서 카탈로그 크기에 선형으로 쌓는다.
+    """
+
+    def __init__(self, encoding: str = "dense"):
+        self.encoding = encoding
+        self.skill_ids: List[str] = []
+        self.bitmaps: Dict[str, Dict[str, bytearray]] = {
+            "role": {},
+            "proficiency_level": {},
+            "skill_type": {},
+            "domain": {},
+        }
+
+    def _set(self, dimension: str, value: Any, ordinal: int) -> None:
+        bits = self.bitmaps[dimension].setdefault(str(value), bytearray())
+        byte = ordinal >> 3
+        if len(bits) <= byte:
+            bits.extend(bytes(byte + 1 - len(bits)))
+        bits[byte] |= 1 << (ordinal & 7)
+
+    def add(self, skill: SkillRecord) -> None:
+        ordinal = len(self.skill_ids)
+        self.skill_ids.append(skill.skill_id)
+        for role in roles_from_mask(skill.role_mask):
+            self._set("role", role, ordinal)
+        self._set("proficiency_level", skill.proficiency_level, ordinal)
+        self._set("skill_type", skill.skill_type, ordinal)
+        self._set("domain", skill.domain, ordinal)
+
+    def to_dict(self) -> Dict[str, Any]:
+        size = (len(self.skill_ids) + 7) // 8
+        bitmaps = {
+            dimension: {value: bytes(bits).ljust(size, b"\0") for value, bits in values.items()}
+            for dimension, values in self.bitmaps.items()
+        }
+        # 레벨 k 이상 = 레벨 k..max의 OR (높은 레벨부터 누적)
+        levels = sorted(bitmaps["proficiency_level"], key=int, reverse=True)
+        cumulative = 0
+        at_least = {}
+        for level in levels:
+            cumulative |= int.from_bytes(bitmaps["proficiency_level"][level], "little")
+            at_least[level] = cumulative.to_bytes(size, "little")
+        bitmaps["proficiency_min"] = dict(sorted(at_least.items(), key=lambda item: int(item[0])))
+
+        return {
+            "version": 1,
+            "encoding": self.encoding,
+            "count": len(self.skill_ids),
+            "skill_ids": self.skill_ids,
+            "bitmaps": {
+                dimension: {value: encode_bitmap(bits, self.encoding) for value, bits in values.items()}
+                for dimension, values in bitmaps.items()
+            },
+        }
+
+    def write(self, path: Path) -> List[Tuple[Path, int]]:
+        return [(path, write_artifact(path, self.to_dict()))]
+
+
+class BitmapIndex:
+    """BitmapIndexBuilder 출력의 질의기"""
+
+    def __init__(self, data: Dict[str, Any]):
+        self.skill_ids: List[str] = data["skill_ids"]
+        self.ordinals = {skill_id: i for i, skill_id in enumerate(self.skill_ids)}
+        self.all = (1 << data["count"]) - 1
+        self.bitmaps = {
+            dimension: {value: decode_bitmap(encoded, data["encoding"]) for value, encoded in values.items()}
+            for dimension, values in data["bitmaps"].items()
+        }
+
+    @classmethod
+    def load(cls, path: Path) -> "BitmapIndex":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def bitmap(self, dimension: str, value: Any) -> int:
+        return self.bitmaps[dimension].get(str(value), 0)
+
+    def at_least(self, min_level: int) -> int:
+        """레벨 min_level 이상 비트셋 (없는 레벨은 그 이상 중 가장 낮은 레벨로, 최저 레벨 이하는 전체)"""
+        levels = [int(level) for level in self.bitmaps["proficiency_min"] if int(level) >= int(min_level)]
+        return self.bitmap("proficiency_min", min(levels)) if levels else 0
+
+    def held(self, skill_ids: Iterable[str]) -> int:
+        bits = 0
+        for skill_id in skill_ids:
+            if skill_id in self.ordinals:
+                bits |= 1 << self.ordinals[skill_id]
+        return bits
+
+    def gap(
+        self,
+        role: Optional[str] = None,
+        min_level: Optional[int] = None,
+        domain: Optional[str] = None,
+        skill_type: Optional[str] = None,
+        held: Iterable[str] = (),
+    ) -> List[str]:
+        """조건을 만족하는 스킬 중 보유하지 않은 것 (카탈로그 순서)"""
+        bits = self.all
+        if min_level is not None:
+            bits &= self.at_least(min_level)
+        for dimension, value in (
+            ("role", role),
+            ("domain", domain),
+            ("skill_type", skill_type),
+        ):
+            if value is not None:
+                bits &= self.bitmap(dimension, value)
+        bits &= ~self.held(held)
+        return [self.skill_ids[i] for i in sorted(_set_bits(bits))]
+
+
+# ==================== DB 일괄 적재 (SQL / COPY) ====================
+
+DEFAULT_SQL_BATCH_SIZE = 500
+
+# database/supabase_schema.sql의 skills 테이블 컬럼
+SKILL_TABLE_COLUMNS = ("label", "korean_label", "english_label", "type", "uri", "description")
+RELATION_COLUMNS = ("uri", "enabler_code", "proficiency")
+
+
+def skill_table_row(skill: Dict[str, Any]) -> Tuple[Any, ...]:
+    """카탈로그 레코드 → skills 행 (type은 스키마 CHECK 제약의 값으로 변환)"""
+    return (
+        skill["preferred_label_en"],
+        skill["preferred_label_ko"],
+        skill["preferred_label_en"],
+        "knowledge" if skill["skill_type"] == "knowledge" else "skill/competence",
+        skill["esco_uri"],
+        skill["description_en"],
+    )
+
+
+def sql_literal(value: Any) -> str:
+    if value is None:
+        return "NULL"
+    if isinstance(value, (int, float)):
+        return str(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def copy_field(value: Any) -> str:
+    """COPY text 포맷 필드 (NULL은 \\N, 역슬래시·탭·개행은 이스케이프)"""
+    if value is None:
+        return "\\N"
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+class SqlExportWriter:
+    """
+    skills(및 선택적으로 enablers, skill_enabler_relations) 일괄 적재 스크립트.
+
+    mode="sql"  - batch_size 행씩 묶은 INSERT ... ON CONFLICT (uri) DO UPDATE.
+                  표준 SQL만 쓰므로 같은 스키마의 SQLite에서도 실행된다.
+    mode="copy" - COPY ... FROM STDIN으로 임시 스테이징 테이블에 적재한 뒤
+                  INSERT ... SELECT ... ON CONFLICT 한 번으로 upsert (psql -f 로 실행).
+
+    organization이 주어지면 도메인을 해당 조직의 enabler(code = 도메인 키)로 upsert하고
+    스킬-enabler 관계를 uri/code 조인으로 연결한다 (PostgreSQL 전용). copy 모드에서는
+    도메인이 바뀌거나 batch_size에 이를 때마다 스킬 COPY를 끊고 관계 COPY 블록을 쓴다.
+    레코드는 받는 즉시(관계는 최대 batch_size행 단위로) 기록하므로 카탈로그 크기와
+    무관하게 메모리가 일정하다. 임시 파일은 첫 레코드에서 열므로 --validate 실패로
+    레코드가 오지 않으면 아무 파일도 남지 않는다.
+    """
+
+    def __init__(self, path: Path, mode: str, batch_size: int = DEFAULT_SQL_BATCH_SIZE, organization: Optional[str] = None):
+        self.path = path
+        self.mode = mode
+        self.batch_size = max(1, batch_size)
+        self.organization = organization
+        self.rows = 0
+        self._batch: List[Tuple[Tuple[Any, ...], Tuple[Any, ...]]] = []
+        self._tmp_path = path.with_name(f".{path.name}.tmp")
+        self._f: Optional[TextIO] = None
+
+    def _open(self) -> TextIO:
+        """임시 파일을 열고 머리말을 기록 (처음 한 번)"""
+        if self._f is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._f = open(self._tmp_path, "w", encoding="utf-8")
+            self._write_header()
+        return self._f
+
+    def _write_header(self) -> None:
+        f = self._f
+        f.write("-- 로봇테크 for 스마트팩토리 스킬 일괄 적재 (generate-robot-smartfactory-data.py 생성)\n")
+        f.write("BEGIN;\n\n")
+        if self.organization:
+            f.write(self._enabler_upsert())
+        if self.mode == "copy":
+            f.write("CREATE TEMP TABLE rsf_skills_stage (\n")
+            f.write("    label TEXT, korean_label TEXT, english_label TEXT, type TEXT, uri TEXT, description TEXT\n")
+            f.write(") ON COMMIT DROP;\n")
+            if self.organization:
+                f.write("CREATE TEMP TABLE rsf_relations_stage (uri TEXT, enabler_code TEXT, proficiency TEXT) ON COMMIT DROP;\n")
+            f.write(f"COPY rsf_skills_stage ({', '.join(SKILL_TABLE_COLUMNS)}) FROM STDIN;\n")
+
+    def _copy_relations(self) -> None:
+        """버퍼의 관계 행을 rsf_relations_stage COPY 블록 하나로 기록 (스킬 COPY가 닫힌 상태에서)"""
+        f = self._f
+        f.write(f"COPY rsf_relations_stage ({', '.join(RELATION_COLUMNS)}) FROM STDIN;\n")
+        for _row, relation in self._batch:
+            f.write("\t".join(copy_field(value) for value in relation) + "\n")
+        f.write("\\.\n\n")
+        self._batch = []
+
+    def _enabler_upsert(self) -> str:
+        values = ",\n".join(
+            f"    ({sql_literal(info['name_ko'])}, {sql_literal(domain)}, {sql_literal(info['name_en'])})"
+            for domain, info in DOMAINS.items()
+        )
+        return (
+            "INSERT INTO enablers (organization_id, name, code, description)\n"
+            "SELECT o.id, v.name, v.code, v.description\n"
+            f"FROM (VALUES\n{values}\n) AS v(name, code, description)\n"
+            f"JOIN organizations o ON o.code = {sql_literal(self.organization)}\n"
+            "ON CONFLICT (organization_id, code) DO UPDATE SET name = EXCLUDED.name, description = EXCLUDED.description;\n\n"
+        )
+
+    def _skill_upsert_tail(self) -> str:
+        updates = ", ".join(f"{column} = EXCLUDED.{column}" for column in SKILL_TABLE_COLUMNS if column != "uri")
+        return f"ON CONFLICT (uri) DO UPDATE SET {updates};\n"
+
+    def _relation_insert(self, source: str) -> str:
+        return (
+            "INSERT INTO skill_enabler_relations (skill_id, enabler_id, organization_id, proficiency, match_type)\n"
+            "SELECT s.id, e.id, o.id, v.proficiency, 'Direct'\n"
+            f"FROM {source}\n"
+            f"JOIN organizations o ON o.code = {sql_literal(self.organization)}\n"
+            "JOIN enablers e ON e.organization_id = o.id AND e.code = v.enabler_code\n"
+            "JOIN skills s ON s.uri = v.uri\n"
+            "ON CONFLICT (skill_id, enabler_id) DO UPDATE SET proficiency = EXCLUDED.proficiency, match_type = EXCLUDED.match_type;\n"
+        )
+
+    def add(self, skill: SkillRecord) -> None:
+        row = skill.to_dict()
+        relation = (row["esco_uri"], row["domain"], f"Level {row['proficiency_level']}")
+        self.rows += 1
+        self._open()
+        if self.mode == "copy":
+            if self.organization and self._batch:
+                if row["domain"] != self._batch[-1][1][1] or len(self._batch) >= self.batch_size:
+                    self._f.write("\\.\n")
+                    self._copy_relations()
+                    self._f.write(f"COPY rsf_skills_stage ({', '.join(SKILL_TABLE_COLUMNS)}) FROM STDIN;\n")
+            self._f.write("\t".join(copy_field(value) for value in skill_table_row(row)) + "\n")
+            if self.organization:
+                self._batch.append(((), relation))
+            return
+        self._batch.append((skill_table_row(row), relation))
+        if len(self._batch) >= self.batch_size:
+            self._flush_batch()
+
+    def _flush_batch(self) -> None:
+        if not self._batch:
+            return
+        f = self._f
+        values = ",\n".join("    (" + ", ".join(sql_literal(v) for v in row) + ")" for row, _relation in self._batch)
+        f.write(f"INSERT INTO skills ({', '.join(SKILL_TABLE_COLUMNS)}) VALUES\n{values}\n")
+        f.write(self._skill_upsert_tail())
+        if self.organization:
+            relations = ",\n".join(
+                "    (" + ", ".join(sql_literal(v) for v in relation) + ")" for _row, relation in self._batch
+            )
+            f.write(self._relation_insert(f"(VALUES\n{relations}\n) AS v({', '.join(RELATION_COLUMNS)})"))
+        f.write("\n")
+        self._batch = []
+
+    def write(self, _path: Path) -> List[Tuple[Path, int]]:
+        f = self._open()
+        if self.mode == "copy":
+            f.write("\\.\n\n")
+            if self.organization and self._batch:
+                self._copy_relations()
+            f.write(f"INSERT INTO skills ({', '.join(SKILL_TABLE_COLUMNS)})\n")
+            f.write(f"SELECT {', '.join(SKILL_TABLE_COLUMNS)} FROM rsf_skills_stage\n")
+            f.write(self._skill_upsert_tail())
+            if self.organization:
+                f.write(self._relation_insert("rsf_relations_stage v"))
+            f.write("\n")
+        else:
+            self._flush_batch()
+        f.write("COMMIT;\n")
+        f.close()
+        os.replace(self._tmp_path, self.path)
+        return [(self.path, self.path.stat().st_size)]
+
+
+# ==================== 컬럼 포맷 & 압축 사이드카 ====================
+
+COLUMNAR_VERSION = 1
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+
+
+def _split_prefix(value: str) -> Tuple[str, str]:
+    """마지막 '/' 또는 '-' 뒤에서 접두어/접미어로 분리 (URI, skill_id 공통 접두어 공유용)"""
+    cut = max(value.rfind("/"), value.rfind("-")) + 1
+    return value[:cut], value[cut:]
+
+
+def _dictionary_encode(values: Iterable[Any]) -> Tuple[List[Any], List[int]]:
+    table: List[Any] = []
+    codes: Dict[Any, int] = {}
+    encoded = []
+    for value in values:
+        key = json.dumps(value, ensure_ascii=False) if isinstance(value, list) else value
+        code = codes.get(key)
+        if code is None:
+            code = codes[key] = len(table)
+            table.append(value)
+        encoded.append(code)
+    return table, encoded
+
+
+def encode_column(values: List[Any], ordinals: Dict[str, int]) -> Dict[str, Any]:
+    """
+    값 분포를 보고 컬럼 인코딩을 고른다.
+
+      ref       - 다른 행의 skill_id 참조 → 행 번호 (null 허용)
+      ref_list  - skill_id 목록 → 행 번호 목록
+      dict      - 반복되는 값(문자열·목록) → 사전 + 코드
+      prefix    - 공통 접두어(URI, ID) → 접두어 사전 + 코드 + 접미어
+      plain     - 그대로
+    """
+    count = len(values)
+    present = [value for value in values if value is not None]
+
+    if present and all(isinstance(value, str) and value in ordinals for value in present):
+        return {"encoding": "ref", "values": [None if value is None else ordinals[value] for value in values]}
+    if present and all(isinstance(value, list) for value in present):
+        if all(item in ordinals for value in present for item in value):
+            return {"encoding": "ref_list", "values": [[ordinals[item] for item in value or []] for value in values]}
+    if present and all(isinstance(value, (str, list)) for value in present):
+        table, codes = _dictionary_encode(values)
+        if len(table) * 2 <= count:
+            return {"encoding": "dict", "dictionary": table, "values": codes}
+    if present and all(isinstance(value, str) for value in present) and len(present) == count:
+        prefixes, suffixes = zip(*(_split_prefix(value) for value in values))
+        table, codes = _dictionary_encode(prefixes)
+        # 접두어를 한 번만 저장해서 아끼는 글자 수가 행마다 붙는 코드 비용보다 커야 의미가 있다
+        saved = sum(len(prefix) for prefix in prefixes) - sum(len(prefix) for prefix in table)
+        if len(table) * 2 <= count and saved > 2 * count:
+            return {"encoding": "prefix", "dictionary": table, "values": codes, "suffixes": list(suffixes)}
+    return {"encoding": "plain", "values": values}
+
+
+def decode_columnar(payload: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """encode_column의 역변환 (검증 및 서버 측 리더용)"""
+    count = payload["count"]
+    ids = payload["columns"]["skill_id"]
+    skill_ids = decode_column(ids, count, [])
+    rows: List[Dict[str, Any]] = [{} for _ in range(count)]
+    for field in payload["fields"]:
+        for row, value in zip(rows, decode_column(payload["columns"][field], count, skill_ids)):
+            row[field] = value
+    return rows
+
+
+def decode_column(column: Dict[str, Any], count: int, skill_ids: List[str]) -> List[Any]:
+    encoding = column["encoding"]
+    values = column["values"]
+    if encoding == "ref":
+        return [None if value is None else skill_ids[value] for value in values]
+    if encoding == "ref_list":
+        return [[skill_ids[item] for item in value] for value in values]
+    if encoding == "dict":
+        return [column["dictionary"][code] for code in values]
+    if encoding == "prefix":
+        return [column["dictionary"][code] + suffix for code, suffix in zip(values, column["suffixes"])]
+    return list(values)
+
+
+def write_compressed_sidecars(path: Path) -> List[Tuple[Path, int]]:
+    """
+    이미 기록된 파일 옆에 .gz(항상)와 .br(brotli 설치 시)을 미리 압축해 둔다.
+
+    brotli가 없으면 이전 실행이 남긴 .br은 원본과 어긋나므로 지운다.
+    """
+    data = path.read_bytes()
+    written = []
+
+    gz_path = path.with_name(path.name + ".gz")
+    gz_data = gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+    atomic_write_bytes(gz_path, gz_data)
+    written.append((gz_path, len(gz_data)))
+
+    br_path = path.with_name(path.name + ".br")
+    if brotli is not None:
+        br_data = brotli.compress(data, quality=BROTLI_QUALITY)
+        atomic_write_bytes(br_path, br_data)
+        written.append((br_path, len(br_data)))
+    elif br_path.exists():
+        print(f"⚠️  brotli 미설치: 오래된 {br_path.name} 삭제")
+        br_path.unlink()
+    return written
+
+
+class CompactCatalogBuilder:
+    """
+    배포용 compact 카탈로그.
+
+    write(stem)은 <stem>.min.json(공백 없는 JSON 배열)과 <stem>.columnar.json
+    (컬럼별 배열 + 사전/접두어/행 참조 인코딩)을 쓰고 각각 .gz/.br 사이드카를 만든다.
+    """
+
+    def __init__(self):
+        self.fields: List[str] = []
+        self.columns: Dict[str, List[Any]] = {}
+        self.count = 0
+
+    def add(self, skill: SkillRecord) -> None:
+        row = skill.to_dict()
+        if not self.fields:
+            self.fields = list(row)
+            self.columns = {field: [] for field in self.fields}
+        for field in self.fields:
+            self.columns[field].append(row[field])
+        self.count += 1
+
+    def rows(self) -> Iterator[Dict[str, Any]]:
+        for i in range(self.count):
+            yield {field: self.columns[field][i] for field in self.fields}
+
+    def to_columnar(self) -> Dict[str, Any]:
+        ordinals = {skill_id: i for i, skill_id in enumerate(self.columns.get("skill_id", []))}
+        columns = {}
+        for field in self.fields:
+            # skill_id 자체는 행 번호로 참조할 수 없으므로 ref 인코딩 대상에서 제외
+            columns[field] = encode_column(self.columns[field], {} if field == "skill_id" else ordinals)
+        return {
+            "format": "robot-smartfactory-columnar",
+            "version": COLUMNAR_VERSION,
+            "count": self.count,
+            "fields": self.fields,
+            "columns": columns,
+        }
+
+    def write(self, stem: Path) -> List[Tuple[Path, int]]:
+        min_path = stem.with_name(stem.name + ".min.json")
+        columnar_path = stem.with_name(stem.name + ".columnar.json")
+        written = []
+        for path, payload in ((min_path, list(self.rows())), (columnar_path, self.to_columnar())):
+            written.append((path, write_artifact(path, payload)))
+            written.extend(write_compressed_sidecars(path))
+        return written
+
+
+# ==================== 유사 스킬 (MinHash/LSH) ====================
+
+DEFAULT_RELATED_TOP_K = 5
+DEFAULT_RELATED_THRESHOLD = 0.2
+DEFAULT_NEAR_DUPLICATE_THRESHOLD = 0.45
+MINHASH_PERMUTATIONS = 128
+# 큰 버킷(클론 묶음 등)에서는 순위가 가장 낮은 멤버 이만큼만 후보로 삼는다 (비용 상한)
+LSH_MAX_BUCKET = 8
+# 레코드마다 버킷 충돌 수가 많은 후보 이만큼만 실제 유사도를 계산한다
+LSH_MAX_CANDIDATES = 32
+# 레이블 포함 판정(중복 의심)에 필요한 최소 영문 레이블 토큰 수
+NEAR_DUPLICATE_MIN_LABEL_TOKENS = 2
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MINHASH_SEED = 20240601
+
+SIMILARITY_STOPWORDS = frozenset(
+    "a an and as at by etc for from in including into of on or such the to using with".split()
+)
+
+# 가벼운 어미 제거 규칙 (긴 것부터): optimization/optimize/optimized → optim
+_STEM_SUFFIXES = (
+    ("izations", ""), ("ization", ""), ("isation", ""), ("ations", ""), ("ation", ""),
+    ("ements", ""), ("ement", ""), ("ments", ""), ("ment", ""), ("ities", ""), ("ity", ""),
+    ("ating", ""), ("ated", ""), ("ates", ""), ("ate", ""), ("izing", ""), ("ized", ""), ("izes", ""),
+    ("ize", ""), ("ings", ""), ("ing", ""), ("ies", "y"), ("ers", ""), ("er", ""), ("ed", ""), ("es", ""), ("s", ""),
+)
+
+
+@functools.lru_cache(maxsize=1 << 16)
+def stem_token(token: str) -> str:
+    """영문 토큰의 어미를 떼어 표기가 다른 같은 어간을 맞춘다 (한글/숫자는 그대로)"""
+    if token[0] >= "가" or not token.isalpha():
+        return token
+    for suffix, replacement in _STEM_SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            if suffix == "s" and token.endswith(("ss", "us", "is")):
+                break
+            token = token[: -len(suffix)] + replacement
+            break
+    # planning → plann → plan
+    if len(token) > 3 and token[-1] == token[-2] and token[-1] not in "lsz":
+        token = token[:-1]
+    return token
+
+
+@functools.lru_cache(maxsize=4)
+def _minhash_params(num_perm: int) -> Tuple[Tuple[int, int], ...]:
+    rng = random.Random(_MINHASH_SEED)
+    return tuple((rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME)) for _ in range(num_perm))
+
+
+@functools.lru_cache(maxsize=1 << 16)
+def _shingle_hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+@functools.lru_cache(maxsize=1 << 15)
+def _token_minhashes(token_hash: int, num_perm: int) -> Tuple[int, ...]:
+    """토큰 하나의 순열별 해시 (어휘가 반복되므로 서명은 캐시된 벡터의 원소별 최솟값)"""
+    return tuple(((a * token_hash + b) % _MERSENNE_PRIME) & 0xFFFFFFFF for a, b in _minhash_params(num_perm))
+
+
+def _field_tokens(text: str) -> Tuple[List[str], List[str]]:
+    """(어간 처리한 영문 토큰, 한글 bigram) — 불용어 제거"""
+    english, korean = [], []
+    for token in search_tokens(text):
+        if token in SIMILARITY_STOPWORDS:
+            continue
+        if token[0] >= "가":
+            korean.append(token)
+        else:
+            english.append(stem_token(token))
+    return english, korean
+
+
+def similarity_shingles(skill: SkillRecord) -> Tuple[frozenset, frozenset, frozenset, frozenset]:
+    """
+    (영문 토큰, 한글 bigram, 영문 레이블, 한글 레이블) 해시 집합.
+
+    두 언어는 따로 비교해 한쪽의 잡음(한글 bigram 등)이 다른 쪽 일치를 희석하지 않게
+    하고, 레이블 토큰은 "^"를 붙인 사본을 한 번 더 넣어 설명보다 무겁게 센다.
+    """
+    label_en, label_ko = _field_tokens(f"{skill.label_en} {skill.label_ko}")
+    desc_en, desc_ko = _field_tokens(f"{skill.description_en} {skill.description_ko}")
+    english = {_shingle_hash(token) for token in label_en + desc_en}
+    english.update(_shingle_hash("^" + token) for token in label_en)
+    korean = {_shingle_hash(token) for token in label_ko + desc_ko}
+    korean.update(_shingle_hash("^" + token) for token in label_ko)
+    return (
+        frozenset(english),
+        frozenset(korean),
+        frozenset(_shingle_hash(token) for token in label_en),
+        frozenset(_shingle_hash(token) for token in label_ko),
+    )
+
+
+def _lsh_shape(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """(밴드 수, 밴드당 행 수) 중 근사 임계값 (1/b)^(1/r)이 threshold 이하인 가장 높은 것"""
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        if (1 / bands) ** (1 / rows) <= threshold:
+            best = (bands, rows)
+    return best
+
+
+def _jaccard(first: frozenset, second: frozenset) -> float:
+    if not first or not second:
+        return 0.0
+    common = len(first & second)
+    return common / (len(first) + len(second) - common)
+
+
+def _label_covered(entry: Tuple[Any, ...], other: Tuple[Any, ...]) -> bool:
+    """entry의 레이블 토큰이 한영 모두 other의 레이블·설명에 들어 있는지"""
+    _skill_id, _english, _korean, label_en, label_ko = entry[:5]
+    return (
+        len(label_en) >= NEAR_DUPLICATE_MIN_LABEL_TOKENS
+        and bool(label_ko)
+        and label_en <= other[1]
+        and label_ko <= other[2]
+    )
+
+
+SimilarityKey = Tuple[str, int]  # (도메인, 도메인 내 번호)
+BandKey = Tuple[int, Tuple[int, ...]]
+
+
+class RelatedSkillIndex:
+    """
+    MinHash 서명 + LSH 밴딩으로 related_skills와 중복 의심 스킬을 찾는다.
+
+    레코드마다 언어별 MinHash 서명과 토큰 해시 집합을 보관하고, 같은 밴드 버킷에
+    들어온 후보 쌍만 언어별 Jaccard 중 큰 값으로 채점한다. 큰 버킷(클론 묶음 등)은
+    버리지 않고 순위(skill_id 해시)가 가장 낮은 LSH_MAX_BUCKET개를 표본으로 삼고,
+    레코드마다 충돌 밴드가 많은 후보 LSH_MAX_CANDIDATES개만 채점하므로 비용이 스킬 수에
+    선형이다. 유사도가 near_duplicate_threshold 이상이거나 한 스킬의 레이블이 한영
+    모두 다른 스킬 텍스트에 그대로 들어 있으면 중복 의심으로 본다.
+
+    후보는 버킷 구성과 순위로만 정해져 삽입 순서와 무관하다. 레코드는 도메인 단위로
+    넣고 뺄 수 있고(set_domain/remove_domain), 표본이 바뀐 버킷의 멤버만 후보를 다시
+    구하므로 고친 결과가 처음부터 계산한 결과와 같다.
+    """
+
+    def __init__(
+        self,
+        top_k: int = DEFAULT_RELATED_TOP_K,
+        threshold: float = DEFAULT_RELATED_THRESHOLD,
+        near_duplicate_threshold: float = DEFAULT_NEAR_DUPLICATE_THRESHOLD,
+        num_perm: int = MINHASH_PERMUTATIONS,
+    ):
+        self.top_k = top_k
+        self.threshold = threshold
+        self.near_duplicate_threshold = near_duplicate_threshold
+        self.num_perm = num_perm
+        self.bands, self.rows = _lsh_shape(num_perm, threshold)
+        # 항목: (skill_id, 영문 집합, 한글 집합, 영문 레이블, 한글 레이블, 영문 서명, 한글 서명)
+        self.entries: Dict[SimilarityKey, Tuple[Any, ...]] = {}
+        self.domains: Dict[str, List[SimilarityKey]] = {}
+        # 버킷: (밴드 번호, 밴드의 서명 값들) → (멤버, 순위가 낮은 멤버 LSH_MAX_BUCKET + 1개의 표본)
+        self.buckets: Dict[BandKey, Tuple[Dict[SimilarityKey, None], List[Tuple[int, SimilarityKey]]]] = {}
+        self.candidates: Dict[SimilarityKey, frozenset] = {}
+        self.neighbors: Dict[SimilarityKey, Dict[SimilarityKey, float]] = {}
+        self.near: Dict[Tuple[SimilarityKey, SimilarityKey], Tuple[float, str]] = {}
+        self._annotations: Annotations = {}
+        self._dirty: set = set()
+        self._stale: set = set()
+        self._stale_buckets: set = set()
+        self._removed: set = set()
+
+    def signature(self, tokens: Iterable[int]) -> bytes:
+        vectors = [_token_minhashes(token, self.num_perm) for token in tokens]
+        if not vectors:
+            return b""
+        return array("I", map(min, zip(*vectors))).tobytes()
+
+    def entry(self, skill: SkillRecord) -> Tuple[Any, ...]:
+        english, korean, label_en, label_ko = similarity_shingles(skill)
+        return (skill.skill_id, english, korean, label_en, label_ko, self.signature(english), self.signature(korean))
+
+    def _band_keys(self, entry: Tuple[Any, ...]) -> Iterator[BandKey]:
+        band_format = f"<{self.rows}I"
+        return itertools.chain.from_iterable(
+            zip(range(lang * self.bands, (lang + 1) * self.bands), struct.iter_unpack(band_format, signature))
+            for lang, signature in enumerate(entry[5:7])
+        )
+
+    def add(self, skill: SkillRecord) -> None:
+        self.insert((skill.domain, skill.index), self.entry(skill))
+
+    def insert(self, key: SimilarityKey, entry: Tuple[Any, ...]) -> None:
+        self.entries[key] = entry
+        self.domains.setdefault(key[0], []).append(key)
+        ranked = (_shingle_hash(entry[0]), key)
+        for bucket_key in self._band_keys(entry):
+            bucket = self.buckets.get(bucket_key)
+            if bucket is None:
+                self.buckets[bucket_key] = ({key: None}, [ranked])
+                continue
+            members, sample = bucket
+            members[key] = None
+            if len(sample) <= LSH_MAX_BUCKET or ranked < sample[-1]:
+                # 표본이 바뀌면 이 버킷 멤버 모두의 후보가 바뀔 수 있다
+                bisect.insort(sample, ranked)
+                del sample[LSH_MAX_BUCKET + 1:]
+                self._stale_buckets.add(bucket_key)
+        self._stale.add(key)
+
+    def remove_domain(self, domain: str) -> None:
+        keys = self.domains.pop(domain, [])
+        for key in keys:
+            entry = self.entries.pop(key)
+            ranked = (_shingle_hash(entry[0]), key)
+            for bucket_key in self._band_keys(entry):
+                members, sample = self.buckets[bucket_key]
+                del members[key]
+                if not members:
+                    del self.buckets[bucket_key]
+                elif ranked in sample:
+                    sample[:] = heapq.nsmallest(
+                        LSH_MAX_BUCKET + 1, ((_shingle_hash(self.entries[other][0]), other) for other in members)
+                    )
+                    self._stale_buckets.add(bucket_key)
+            self.candidates.pop(key, None)
+            self._removed.add(key)
+            for other in self.neighbors.pop(key, {}):
+                self.neighbors.get(other, {}).pop(key, None)
+                self._dirty.add(other)
+            self._dirty.add(key)
+        if keys:
+            self.near = {pair: value for pair, value in self.near.items() if domain not in (pair[0][0], pair[1][0])}
+
+    def set_domain(self, domain: str, entries: Iterable[Tuple[SimilarityKey, Tuple[Any, ...]]]) -> None:
+        """도메인 하나의 레코드를 통째로 교체 (그 도메인이 닿는 버킷·이웃만 갱신)"""
+        self.remove_domain(domain)
+        for key, entry in entries:
+            self.insert(key, entry)
+
+    def _candidates(self, key: SimilarityKey) -> frozenset:
+        entry = self.entries[key]
+        colliding: List[Tuple[int, SimilarityKey]] = []
+        for bucket_key in self._band_keys(entry):
+            colliding.extend(self.buckets[bucket_key][1])
+        collisions = Counter(colliding)
+        del collisions[(_shingle_hash(entry[0]), key)]
+        # 같은 버킷에 많이 들어온 후보일수록 유사도가 높으므로 상위 후보만 채점한다
+        return frozenset(other for (_rank, other), _count in collisions.most_common(LSH_MAX_CANDIDATES))
+
+    def _resolve(self) -> None:
+        """
+        후보가 바뀔 수 있는 레코드의 후보를 다시 구하고, 생기거나 사라진 쌍만 채점/삭제.
+
+        쌍 (a, b)는 b가 a의 후보이거나 a가 b의 후보이면 채점된 상태다.
+        """
+        stale, removed = self._stale, self._removed
+        for bucket_key in self._stale_buckets:
+            if bucket_key in self.buckets:
+                stale.update(self.buckets[bucket_key][0])
+        self._stale, self._stale_buckets, self._removed = set(), set(), set()
+        candidates = self.candidates
+        empty: frozenset = frozenset()
+        previous = {key: candidates.pop(key, empty) for key in stale}
+        for key in stale:
+            if key in self.entries:
+                candidates[key] = self._candidates(key)
+
+        pairs = set()
+        for key, old in previous.items():
+            for other in old | candidates.get(key, empty):
+                pairs.add((key, other) if key <= other else (other, key))
+        for key, other in pairs:
+            now = other in candidates.get(key, empty) or key in candidates.get(other, empty)
+            # 뺐다가 다시 넣은 레코드는 이웃이 이미 지워졌으므로 이전 연결이 없던 것으로 본다
+            was = (
+                key not in removed
+                and other not in removed
+                and (other in previous.get(key, candidates.get(key, empty)) or key in previous.get(other, candidates.get(other, empty)))
+            )
+            if now and not was:
+                self._score(key, other)
+            elif was and not now:
+                self._unlink(key, other)
+
+    def _score(self, key: SimilarityKey, other: SimilarityKey) -> None:
+        first, second = self.entries[key], self.entries[other]
+        score = max(_jaccard(first[1], second[1]), _jaccard(first[2], second[2]))
+        reason = None
+        if score >= self.near_duplicate_threshold:
+            reason = "similarity"
+        elif _label_covered(first, second) or _label_covered(second, first):
+            reason = "label_coverage"
+        if score < self.threshold and reason is None:
+            return
+        self.neighbors.setdefault(key, {})[other] = score
+        self.neighbors.setdefault(other, {})[key] = score
+        self._dirty.update((key, other))
+        if reason:
+            pair = (key, other) if first[0] <= second[0] else (other, key)
+            self.near[pair] = (score, reason)
+
+    def _unlink(self, key: SimilarityKey, other: SimilarityKey) -> None:
+        for first, second in ((key, other), (other, key)):
+            if self.neighbors.get(first, {}).pop(second, None) is not None:
+                self._dirty.add(first)
+            self.near.pop((first, second), None)
+
+    def flush(self) -> set:
+        """이웃이 바뀐 레코드의 related_skills를 다시 정렬하고, 바뀐 도메인 집합을 돌려준다"""
+        self._resolve()
+        touched = set()
+        for key in self._dirty:
+            domain, index = key
+            touched.add(domain)
+            neighbors = self.neighbors.get(key)
+            if key in self.entries and neighbors:
+                ranked = heapq.nsmallest(
+                    self.top_k, neighbors.items(), key=lambda item: (-item[1], self.entries[item[0]][0])
+                )
+                related = [self.entries[other][0] for other, _score in ranked]
+                self._annotations.setdefault(domain, {})[index] = {"related_skills": related}
+            elif index in self._annotations.get(domain, {}):
+                del self._annotations[domain][index]
+                if not self._annotations[domain]:
+                    del self._annotations[domain]
+        self._dirty.clear()
+        return touched
+
+    def annotations(self) -> Annotations:
+        self.flush()
+        return self._annotations
+
+    def near_duplicates(self) -> List[Dict[str, Any]]:
+        pairs = [
+            {
+                "skill_ids": [self.entries[first][0], self.entries[second][0]],
+                "similarity": round(score, 3),
+                "reason": reason,
+            }
+            for (first, second), (score, reason) in self.near.items()
+        ]
+        pairs.sort(key=lambda pair: (-pair["similarity"], pair["skill_ids"]))
+        return pairs
+
+    def compute(self) -> Tuple[Annotations, List[Dict[str, Any]]]:
+        """(related_skills annotation, 중복 의심 쌍 목록)"""
+        return self.annotations(), self.near_duplicates()
+
+    def state(self) -> Dict[str, Any]:
+        """marshal로 저장할 수 있는 색인 상태 (flush 후)"""
+        self.flush()
+        return {
+            "entries": self.entries,
+            "domains": self.domains,
+            "buckets": self.buckets,
+            "candidates": self.candidates,
+            "neighbors": self.neighbors,
+            "near": self.near,
+            "annotations": self._annotations,
+        }
+
+    def restore(self, state: Dict[str, Any]) -> None:
+        self.entries = state["entries"]
+        self.domains = state["domains"]
+        self.buckets = state["buckets"]
+        self.candidates = state["candidates"]
+        self.neighbors = state["neighbors"]
+        self.near = state["near"]
+        self._annotations = state["annotations"]
+
+
+SIMILARITY_CACHE_VERSION = 1
+
+
+class RelatedSkillCache:
+    """
+    related_skills 색인과 도메인별 MinHash 항목 캐시 (cache_dir/similarity.marshal).
+
+    도메인 입력 해시(템플릿, ID 레지스트리 — 증분 빌드 manifest와 같은 해시)가 모두
+    그대로면 저장된 annotation과 중복 의심 쌍을 바로 돌려준다. 일부가 바뀌면 그
+    도메인만 다시 토큰화·서명하고 저장된 색인에서 그 도메인이 닿는 버킷과 이웃만
+    고친다 (결과는 캐시 없이 계산한 것과 같다). 인스턴스를 계속 쓰면(감시 모드)
+    파일을 다시 읽지 않는다.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path],
+        top_k: int = DEFAULT_RELATED_TOP_K,
+        threshold: float = DEFAULT_RELATED_THRESHOLD,
+        near_duplicate_threshold: float = DEFAULT_NEAR_DUPLICATE_THRESHOLD,
+    ):
+        self.path = path
+        self.top_k = top_k
+        self.threshold = threshold
+        self.near_duplicate_threshold = near_duplicate_threshold
+        self.fingerprint = _generator_fingerprint()
+        self.params = (
+            SIMILARITY_CACHE_VERSION,
+            marshal.version,
+            self.fingerprint,
+            top_k,
+            threshold,
+            near_duplicate_threshold,
+            MINHASH_PERMUTATIONS,
+        )
+        self.keys: Dict[str, str] = {}
+        self.index = RelatedSkillIndex(top_k, threshold, near_duplicate_threshold)
+        self.result: Optional[Tuple[Annotations, List[Dict[str, Any]]]] = None
+        self._loaded = path is None
+
+    def _load(self) -> None:
+        self._loaded = True
+        try:
+            state = marshal.loads(self.path.read_bytes())
+        except (OSError, EOFError, ValueError, TypeError):
+            return
+        if not isinstance(state, dict) or state.get("params") != self.params:
+            return
+        self.keys, self.result = state["keys"], state["result"]
+        self.index.restore(state["index"])
+
+    def _save(self) -> None:
+        if self.path is None:
+            return
+        state = {"params": self.params, "keys": self.keys, "index": self.index.state(), "result": self.result}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f".{self.path.name}.tmp")
+            tmp_path.write_bytes(marshal.dumps(state))
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass  # 캐시는 선택 사항: 읽기 전용 환경에서는 매번 계산
+
+    def compute(self, domains: Optional[Collection[str]] = None) -> Tuple[Annotations, List[Dict[str, Any]], List[str]]:
+        """
+        (related_skills annotation, 중복 의심 쌍, annotation이 바뀌었을 수 있는 도메인 목록).
+
+        domains를 주면 그 도메인만 입력 해시를 다시 구한다 (감시 모드: 바뀐 템플릿 파일만).
+        """
+        if not self._loaded:
+            self._load()
+        keys = {
+            domain: (
+                self.keys[domain]
+                if domains is not None and domain not in domains and domain in self.keys
+                else domain_input_hash(domain, "similarity", self.fingerprint)
+            )
+            for domain in DOMAINS
+        }
+        if keys == self.keys and self.result is not None:
+            return self.result[0], self.result[1], []
+
+        changed = [domain for domain, key in keys.items() if self.keys.get(domain) != key]
+        for stale in set(self.keys) - set(keys):
+            self.index.remove_domain(stale)
+        for domain in changed:
+            self.index.set_domain(
+                domain, [((skill.domain, skill.index), self.index.entry(skill)) for skill in iter_domain_catalog(domain)]
+            )
+        touched = self.index.flush()
+        self.keys = keys
+        self.result = self.index.compute()
+        self._save()
+        return self.result[0], self.result[1], [domain for domain in DOMAINS if domain in touched]
+
+
+# ==================== 임베딩 & 근사 최근접 색인 ====================
+
+DEFAULT_EMBEDDING_DIM = 512
+DEFAULT_EMBEDDING_TOP_K = 10
+# 랜덤 초평면 LSH: 테이블 수 × 테이블당 비트 수 (초평면은 시드로 재생성)
+ANN_TABLES = 8
+ANN_BITS = 8
+ANN_SEED = 20240601
+EMBEDDING_LABEL_WEIGHT = 2
+NPY_MAGIC = b"\x93NUMPY\x01\x00"
+
+
+def embedding_terms(label: str, description: str) -> Dict[str, int]:
+    """레이블(가중치 2)과 설명의 토큰 빈도 (유사 스킬과 같은 토큰 규칙·불용어)"""
+    counts: Dict[str, int] = {}
+    for text, weight in ((label, EMBEDDING_LABEL_WEIGHT), (description, 1)):
+        for token in search_tokens(text):
+            if token not in SIMILARITY_STOPWORDS:
+                counts[token] = counts.get(token, 0) + weight
+    return counts
+
+
+def hashed_tfidf(terms: Dict[str, int], idf: List[float], dim: int) -> List[float]:
+    """
+    해싱 벡터라이저: 토큰 해시로 차원과 부호를 정하고 (1 + log tf) × idf 가중 후 L2 정규화.
+    어휘 사전이 없어 질의도 같은 함수로 바로 벡터화된다.
+    """
+    vector = [0.0] * dim
+    for token, tf in terms.items():
+        h = _shingle_hash(token)
+        bucket = h % dim
+        weight = (1.0 + math.log(tf)) * idf[bucket]
+        vector[bucket] += -weight if h >> 63 else weight
+    norm = math.sqrt(sum(v * v for v in vector))
+    return [v / norm for v in vector] if norm else vector
+
+
+@functools.lru_cache(maxsize=4)
+def _ann_planes(dim: int, tables: int, bits: int, seed: int) -> Tuple[Tuple[Tuple[float, ...], ...], ...]:
+    rng = random.Random(seed)
+    return tuple(tuple(tuple(rng.gauss(0.0, 1.0) for _ in range(dim)) for _ in range(bits)) for _ in range(tables))
+
+
+def ann_codes(vector: List[float], dim: int, tables: int = ANN_TABLES, bits: int = ANN_BITS, seed: int = ANN_SEED) -> List[int]:
+    """테이블별 버킷 코드 (초평면 양/음 부호 비트)"""
+    nonzero = [(i, v) for i, v in enumerate(vector) if v]
+    codes = []
+    for planes in _ann_planes(dim, tables, bits, seed):
+        code = 0
+        for bit, plane in enumerate(planes):
+            if sum(plane[i] * v for i, v in nonzero) >= 0:
+                code |= 1 << bit
+        codes.append(code)
+    return codes
+
+
+def write_npy_float32(path: Path, values: array, rows: int, cols: int) -> int:
+    """float32 행렬을 .npy(v1.0)로 기록 (numpy 없이, numpy.load(mmap_mode="r")로 읽힘)"""
+    header = f"{{'descr': '<f4', 'fortran_order': False, 'shape': ({rows}, {cols}), }}"
+    # 매직 + 버전 + 길이(10바이트) 포함 64바이트 정렬, 개행으로 끝나야 한다
+    header += " " * ((64 - (len(NPY_MAGIC) + 2 + len(header) + 1) % 64) % 64) + "\n"
+    if sys.byteorder != "little":
+        values = array("f", values)
+        values.byteswap()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(NPY_MAGIC + struct.pack("<H", len(header)) + header.encode("latin1"))
+        f.write(values.tobytes())
+    os.replace(tmp_path, path)
+    return path.stat().st_size
+
+
+class EmbeddingIndexBuilder:
+    """
+    스킬별 로컬 벡터(한영 레이블·설명의 해싱 TF-IDF)와 근사 최근접 색인.
+
+      <stem>.npy        - float32 (스킬 수 × dim), L2 정규화. numpy.load(mmap_mode="r") 가능
+      <stem>.index.json - skill_ids, idf, LSH 파라미터와 테이블별 버킷 → 순번 목록
+
+    네트워크 없이 결정적으로 만들어지며, 질의는 같은 벡터라이저로 벡터화한 뒤
+    LSH 버킷 후보만 내적으로 재정렬한다 (SkillVectorIndex).
+    """
+
+    def __init__(self, dim: int = DEFAULT_EMBEDDING_DIM):
+        self.dim = dim
+        self.skill_ids: List[str] = []
+        self.terms: List[Dict[str, int]] = []
+
+    def add(self, skill: SkillRecord) -> None:
+        self.skill_ids.append(skill.skill_id)
+        self.terms.append(
+            embedding_terms(f"{skill.label_en} {skill.label_ko}", f"{skill.description_en} {skill.description_ko}")
+        )
+
+    def write(self, path: Path) -> List[Tuple[Path, int]]:
+        count = len(self.skill_ids)
+        df = [0] * self.dim
+        for terms in self.terms:
+            for bucket in {_shingle_hash(token) % self.dim for token in terms}:
+                df[bucket] += 1
+        idf = [math.log((1 + count) / (1 + n)) + 1.0 for n in df]
+
+        matrix = array("f")
+        buckets: List[Dict[str, List[int]]] = [{} for _ in range(ANN_TABLES)]
+        for ordinal, terms in enumerate(self.terms):
+            vector = hashed_tfidf(terms, idf, self.dim)
+            matrix.extend(vector)
+            for table, code in zip(buckets, ann_codes(vector, self.dim)):
+                table.setdefault(str(code), []).append(ordinal)
+
+        npy_path = path.with_suffix(".npy")
+        index_path = path.with_suffix(".index.json")
+        npy_size = write_npy_float32(npy_path, matrix, count, self.dim)
+        index = {
+            "version": 1,
+            "dim": self.dim,
+            "matrix": npy_path.name,
+            "skill_ids": self.skill_ids,
+            "idf": [round(value, 6) for value in idf],
+            "ann": {"tables": ANN_TABLES, "bits": ANN_BITS, "seed": ANN_SEED, "buckets": buckets},
+        }
+        return [(npy_path, npy_size), (index_path, write_artifact(index_path, index))]
+
+
+class SkillVectorIndex:
+    """EmbeddingIndexBuilder 출력의 질의기 (행렬은 mmap, numpy가 있으면 행렬 연산)"""
+
+    def __init__(self, index_path: Path):
+        with open(index_path, encoding="utf-8") as f:
+            index = json.load(f)
+        self.dim = index["dim"]
+        self.skill_ids = index["skill_ids"]
+        self.idf = index["idf"]
+        self.ann = index["ann"]
+        matrix_path = index_path.with_name(index["matrix"])
+        if numpy is not None:
+            self.matrix = numpy.load(matrix_path, mmap_mode="r")
+        else:
+            self._file = open(matrix_path, "rb")
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            header_len = struct.unpack_from("<H", self._mm, len(NPY_MAGIC))[0]
+            self.matrix = memoryview(self._mm)[len(NPY_MAGIC) + 2 + header_len :].cast("f")
+
+    def _row_dot(self, ordinal: int, vector: List[float]) -> float:
+        start = ordinal * self.dim
+        return sum(self.matrix[start + i] * v for i, v in enumerate(vector) if v)
+
+    def query(self, text: str, top_k: int = DEFAULT_EMBEDDING_TOP_K) -> List[Tuple[str, float]]:
+        """텍스트와 가까운 스킬 (skill_id, 코사인 유사도) 상위 top_k"""
+        vector = hashed_tfidf(embedding_terms(text, ""), self.idf, self.dim)
+        ann = self.ann
+        candidates = set()
+        for table, code in zip(ann["buckets"], ann_codes(vector, self.dim, ann["tables"], ann["bits"], ann["seed"])):
+            candidates.update(table.get(str(code), ()))
+
+        scored = self._score(sorted(candidates), vector)
+        if len(scored) < top_k and len(candidates) < len(self.skill_ids):
+            # 버킷 후보 중 유사도가 양수인 것이 모자라면 전체 재정렬
+            scored = self._score(range(len(self.skill_ids)), vector)
+        scored.sort(key=lambda item: (-item[1], item[0]))
+        return [(self.skill_ids[ordinal], round(score, 6)) for ordinal, score in scored[:top_k]]
+
+    def _score(self, ordinals: Iterable[int], vector: List[float]) -> List[Tuple[int, float]]:
+        """(순번, 내적) 중 양수인 것만"""
+        ordinals = list(ordinals)
+        if numpy is not None:
+            scores = (self.matrix[ordinals] @ numpy.asarray(vector, dtype=numpy.float32)).tolist()
+        else:
+            scores = [self._row_dot(ordinal, vector) for ordinal in ordinals]
+        return [(ordinal, score) for ordinal, score in zip(ordinals, scores) if score > 0]
+
+
+# ==================== ESCO 수집 ====================
+
+DEFAULT_ESCO_SOURCE = Path("public/data/skills.json")
+ESCO_STREAM_CHUNK = 1 << 16
+# 도메인 키워드 점수 (레이블 출현 2점, 설명 출현 1점) 최소값
+ESCO_MIN_DOMAIN_SCORE = 2
+# ESCO 계층 관계 필드 (ESCON 덤프의 broader, ESCO API의 broaderSkill/broaderHierarchyConcept)
+ESCO_BROADER_FIELDS = ("broader", "broaderSkill", "broaderHierarchyConcept")
+
+# ESCO 스킬을 로봇테크 도메인 후보로 분류하는 키워드 (단어 경계 기준, 소문자)
+DOMAIN_KEYWORDS = {
+    "industrial-robot-control": (
+        "industrial robot", "industrial robots", "robot programming", "program robots", "robotic arm",
+        "robot arm", "teach pendant", "kinematics", "motion control", "trajectory", "servo", "end effector",
+        "robot controller", "automotive robot", "robotics",
+    ),
+    "machine-vision-sensor": (
+        "machine vision", "computer vision", "image processing", "vision system", "camera sensors",
+        "sensor", "sensors", "optical inspection", "lidar", "image recognition", "calibrate sensors",
+    ),
+    "collaborative-robot": (
+        "collaborative robot", "collaborative robots", "cobot", "cobots", "human-robot collaboration",
+        "human-robot interaction", "ergonomics", "ergonomic",
+    ),
+    "autonomous-mobile-robot": (
+        "autonomous vehicle", "autonomous vehicles", "mobile robot", "mobile robots", "agv",
+        "automated guided vehicle", "automated guided vehicles", "navigation", "localisation",
+        "localization", "slam", "path planning", "fleet management",
+    ),
+    "robot-maintenance-diagnostics": (
+        "maintain robotic equipment", "predictive maintenance", "preventive maintenance",
+        "condition monitoring", "diagnose", "diagnostic", "diagnostics", "troubleshoot", "troubleshooting",
+        "fault diagnosis", "repair robots",
+    ),
+    "digital-twin-simulation": (
+        "digital twin", "digital twin technology", "simulation", "simulations", "simulate",
+        "virtual commissioning", "cad software", "3d modelling", "3d modeling", "offline programming",
+    ),
+}
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick 다중 패턴 매처.
+
+    키워드마다 substring 검사를 반복하지 않고 텍스트를 한 번 훑어 모든 키워드
+    출현을 찾는다 (텍스트 길이 + 출현 수에 비례). 앞뒤가 영숫자인 출현은 버린다.
+    """
+
+    def __init__(self, keywords: Dict[str, Iterable[str]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[str, str]]] = [[]]
+
+        for label, terms in keywords.items():
+            for term in terms:
+                term = term.lower()
+                state = 0
+                for ch in term:
+                    nxt = self._goto[state].get(ch)
+                    if nxt is None:
+                        nxt = len(self._goto)
+                        self._goto[state][ch] = nxt
+                        self._goto.append({})
+                        self._fail.append(0)
+                        self._out.append([])
+                    state = nxt
+                self._out[state].append((term, label))
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, str, str]]:
+        """(시작 위치, 키워드, 레이블)을 출현 순서대로"""
+        goto, fail, out = self._goto, self._fail, self._out
+        text = text.lower()
+        state = 0
+        for end, ch in enumerate(text, 1):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for term, label in out[state]:
+                start = end - len(term)
+                if (start == 0 or not text[start - 1].isalnum()) and (end == len(text) or not text[end].isalnum()):
+                    yield start, term, label
+
+
+class _JsonStream:
+    """청크 단위로 읽으며 JSON 값을 하나씩 꺼내는 최소한의 증분 파서"""
+
+    def __init__(self, f: TextIO, chunk_size: int = ESCO_STREAM_CHUNK):
+        self._f = f
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+
+    def _fill(self) -> bool:
+        data = self._f.read(self._chunk_size)
+        if not data:
+            return False
+        self._buf = self._buf[self._pos:] + data
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in " \t\r\n":
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def consume(self, expected: str) -> None:
+        if self.peek() != expected:
+            raise ValueError(f"JSON 스트림 파싱 실패: '{expected}' 위치에 '{self.peek()}'")
+        self._pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # 버퍼 끝에서 끝난 값(숫자 등)은 다음 청크에 이어질 수 있다
+            if end == len(self._buf) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def array(self) -> Iterator[Any]:
+        self.consume("[")
+        if self.peek() == "]":
+            self.consume("]")
+            return
+        while True:
+            yield self.value()
+            if self.peek() == "]":
+                self.consume("]")
+                return
+            self.consume(",")
+
+
+def iter_esco_skills(path: Path) -> Iterator[Tuple[Optional[str], Dict[str, Any]]]:
+    """
+    ESCO skills.json을 전체 로드 없이 스킬 단위로 읽는다.
+
+    {"그룹": [스킬, ...], ...} (ESCON skills.json)과 [스킬, ...] 두 형태를 지원하며
+    (그룹 키 또는 None, 스킬 dict)를 돌려준다.
+    """
+    with open(path, encoding="utf-8") as f:
+        stream = _JsonStream(f)
+        if stream.peek() == "[":
+            for skill in stream.array():
+                yield None, skill
+            return
+
+        stream.consume("{")
+        if stream.peek() == "}":
+            return
+        while True:
+            group = stream.value()
+            stream.consume(":")
+            if stream.peek() == "[":
+                for skill in stream.array():
+                    yield group, skill
+            else:
+                stream.value()
+            if stream.peek() == "}":
+                return
+            stream.consume(",")
+
+
+def _content_tokens(text: str) -> frozenset:
+    """영문 내용어 토큰 (불용어 제거, 어간 추출)"""
+    return frozenset(
+        stem_token(token)
+        for token in search_tokens(text)
+        if token not in SIMILARITY_STOPWORDS and token[0] < "가"
+    )
+
+
+def _esco_labels(value: Any) -> List[str]:
+    """ESCO 레이블 필드 (문자열, 문자열 목록, {"label", "language"} 목록) 중 영문 레이블"""
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, dict):
+        value = [value]
+    if not isinstance(value, list):
+        return []
+    labels = []
+    for item in value:
+        if isinstance(item, str):
+            labels.append(item)
+        elif isinstance(item, dict) and item.get("language", "en") == "en" and isinstance(item.get("label"), str):
+            labels.append(item["label"])
+    return labels
+
+
+def _esco_broader_uris(skill: Dict[str, Any]) -> List[str]:
+    """ESCO 스킬 dict에 실린 상위 개념 URI (ESCO_BROADER_FIELDS 및 _links 아래 같은 이름)"""
+    sources = [skill]
+    if isinstance(skill.get("_links"), dict):
+        sources.append(skill["_links"])
+    uris = []
+    for source in sources:
+        for field in ESCO_BROADER_FIELDS:
+            value = source.get(field)
+            for item in value if isinstance(value, list) else [value]:
+                if isinstance(item, dict):
+                    item = item.get("uri") or item.get("href")
+                if isinstance(item, str) and item not in uris:
+                    uris.append(item)
+    return uris
+
+
+class EscoLinker:
+    """
+    ESCO 스킬을 도메인 후보로 분류하고 로봇테크 스킬에 ESCO URI를 연결한다.
+
+    분류는 KeywordMatcher 한 번의 스캔, 연결은 레이블(대체 레이블 포함) 토큰 역색인으로
+    후보를 좁힌 뒤 어간 토큰 집합이 같은 개념을 고른다. 수집 비용은 입력 크기에 선형이다.
+
+    esco_broader는 계층 관계에서만 나온다: 연결된 ESCO 개념의 상위 개념(broader),
+    없으면 상위 스킬(parent_skill_id)에 연결된 ESCO 개념. 레이블이 일부만 겹치는
+    후보는 상위 개념이라는 근거가 없으므로 연결하지 않고 partial로만 집계한다.
+    """
+
+    def __init__(self, keywords: Dict[str, Iterable[str]] = DOMAIN_KEYWORDS, min_score: int = ESCO_MIN_DOMAIN_SCORE):
+        self.matcher = KeywordMatcher(keywords)
+        self.min_score = min_score
+        self.scanned = 0
+        self.candidates: List[Tuple[str, frozenset]] = []
+        self.broader: Dict[str, List[str]] = {}
+        # 도메인별 연결 근거 집계 (uri / hierarchy / parent / partial)
+        self.provenance: Dict[str, Counter] = {}
+        self.uris: set = set()
+        self._by_domain_token: Dict[Tuple[str, str], List[int]] = {}
+
+    def classify(self, label: str, description: str) -> Dict[str, int]:
+        """도메인별 키워드 점수 (레이블 출현 2점, 설명 출현 1점, 키워드별 한 번)"""
+        text = f"{label}\n{description}"
+        seen = set()
+        scores: Dict[str, int] = {}
+        for start, term, domain in self.matcher.finditer(text):
+            weight = 2 if start < len(label) else 1
+            if (term, domain, weight) in seen:
+                continue
+            seen.add((term, domain, weight))
+            scores[domain] = scores.get(domain, 0) + weight
+        return scores
+
+    def add(self, skill: Dict[str, Any]) -> None:
+        self.scanned += 1
+        if not isinstance(skill, dict):
+            return
+        uri = skill.get("uri")
+        label = skill.get("label") or ""
+        if not uri or uri in self.uris:
+            return
+        domains = [
+            domain
+            for domain, score in self.classify(label, skill.get("description") or "").items()
+            if score >= self.min_score
+        ]
+        if not domains:
+            return
+        self.uris.add(uri)
+        broader = _esco_broader_uris(skill)
+        if broader:
+            self.broader[uri] = broader
+        for alias in [label] + _esco_labels(skill.get("altLabel") or skill.get("altLabels")):
+            tokens = _content_tokens(alias)
+            if not tokens:
+                continue
+            ordinal = len(self.candidates)
+            self.candidates.append((uri, tokens))
+            for domain in domains:
+                for token in tokens:
+                    self._by_domain_token.setdefault((domain, token), []).append(ordinal)
+
+    def ingest(self, path: Path) -> int:
+        for _group, skill in iter_esco_skills(path):
+            self.add(skill)
+        return len(self.candidates)
+
+    def best_match(self, domain: str, label_en: str) -> Optional[Tuple[str, float]]:
+        tokens = _content_tokens(label_en)
+        best: Optional[Tuple[str, float]] = None
+        for ordinal in sorted({o for token in tokens for o in self._by_domain_token.get((domain, token), ())}):
+            uri, candidate_tokens = self.candidates[ordinal]
+            score = len(tokens & candidate_tokens) / len(tokens | candidate_tokens)
+            if best is None or score > best[1]:
+                best = (uri, score)
+        return best
+
+    def link(self, skills: Iterable[SkillRecord]) -> Annotations:
+        """esco_uri(레이블 토큰 일치) / esco_broader(ESCO 계층 또는 상위 스킬의 연결) annotation"""
+        skills = list(skills)
+        for domain in {skill.domain for skill in skills}:
+            self.provenance[domain] = Counter()
+        matched: Dict[Tuple[str, int], str] = {}
+        for skill in skills:
+            counts = self.provenance[skill.domain]
+            match = self.best_match(skill.domain, skill.label_en)
+            if match is None:
+                continue
+            if match[1] >= 1.0:
+                matched[skill.domain, skill.index] = match[0]
+                counts["uri"] += 1
+            else:
+                counts["partial"] += 1
+
+        annotations: Annotations = {}
+        for skill in skills:
+            fields = {}
+            uri = matched.get((skill.domain, skill.index))
+            if uri:
+                fields["esco_uri"] = uri
+                broader = self.broader.get(uri)
+                if broader:
+                    fields["esco_broader"] = broader[0]
+                    self.provenance[skill.domain]["hierarchy"] += 1
+            elif skill.parent_index and (skill.domain, skill.parent_index) in matched:
+                fields["esco_broader"] = matched[skill.domain, skill.parent_index]
+                self.provenance[skill.domain]["parent"] += 1
+            if fields:
+                annotations.setdefault(skill.domain, {})[skill.index] = fields
+        return annotations
+
+
+# ==================== 조직 일괄 생성 ====================
+
+DEFAULT_ORGANIZATION_OUTPUT_DIR = DEFAULT_ARTIFACT_DIR / "organizations"
+ORGANIZATION_BATCH_VERSION = 1
+# 공유 스킬 저장소의 콘텐츠 해시 길이 (hex)
+CONTENT_HASH_LENGTH = 20
+
+
+@contextlib.contextmanager
+def use_templates(domains: Dict[str, Any], store: TemplateStore) -> Iterator[None]:
+    """생성 함수들이 참조하는 도메인/템플릿 전역을 잠시 다른 템플릿 세트로 바꾼다"""
+    global DOMAINS, KNOWLEDGE_SKILLS, SKILL_COMPETENCE_TEMPLATES
+    saved = (DOMAINS, KNOWLEDGE_SKILLS, SKILL_COMPETENCE_TEMPLATES)
+    DOMAINS = domains
+    KNOWLEDGE_SKILLS = DomainTemplates(store, domains, ("knowledge",))
+    SKILL_COMPETENCE_TEMPLATES = DomainTemplates(store, domains, ("skill", "competence"))
+    try:
+        yield
+    finally:
+        DOMAINS, KNOWLEDGE_SKILLS, SKILL_COMPETENCE_TEMPLATES = saved
+
+
+@contextlib.contextmanager
+def use_id_registry(registry: IdRegistry) -> Iterator[None]:
+    """skill_id 번호를 배정·조회하는 레지스트리 전역을 잠시 다른 레지스트리로 바꾼다"""
+    global ID_REGISTRY
+    saved = ID_REGISTRY
+    ID_REGISTRY = registry
+    try:
+        yield
+    finally:
+        ID_REGISTRY = saved
+
+
+class MemoryTemplateStore(TemplateStore):
+    """파일 대신 메모리의 {이름: 데이터}를 제공하는 템플릿 저장소 (use_templates용)"""
+
+    def __init__(self, files: Dict[str, Any]):
+        super().__init__(TEMPLATE_DIR, None)
+        self.files = files
+
+    def load(self, name: str) -> Any:
+        try:
+            return self.files[name]
+        except KeyError:
+            raise KeyError(name) from None
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        pass
+
+
+def replicated_templates(target: int) -> Tuple[Dict[str, Any], TemplateStore]:
+    """
+    현재 도메인 세트를 통째로 복제해 target개 이상 스킬이 되는 (도메인, 템플릿 저장소).
+
+    복제본 n번째의 도메인 키는 "<원본>-n", 코드는 "<원본코드>n" (ID/URI 충돌 없음).
+    레이블에는 복제 번호를 붙여 문자열이 서로 공유되지 않게 한다. use_templates와 함께 쓴다.
+    """
+    base_count = sum(1 for domain, info in DOMAINS.items() for _ in iter_domain_records(domain, info))
+    copies = max(1, math.ceil(target / max(1, base_count)))
+
+    domains: Dict[str, Any] = {}
+    files: Dict[str, Any] = {"domains": domains}
+    for copy in range(copies):
+        for domain, info in DOMAINS.items():
+            key = f"{domain}-{copy}"
+            domains[key] = dict(info, code=f"{info['code']}{copy}")
+            files[key] = {
+                "knowledge": [
+                    dict(item, label_en=f"{item['label_en']} #{copy}") for item in KNOWLEDGE_SKILLS.get(domain, [])
+                ],
+                **{
+                    kind: [[ko, f"{en} #{copy}", desc_ko, desc_en] for ko, en, desc_ko, desc_en in items]
+                    for kind, items in SKILL_COMPETENCE_TEMPLATES.get(domain, {}).items()
+                },
+            }
+    return domains, MemoryTemplateStore(files)
+
+
+def organization_templates(spec: Dict[str, Any], spec_path: Path) -> Tuple[Dict[str, Any], TemplateStore]:
+    """
+    조직 명세 → (도메인 목록, 템플릿 저장소).
+
+    "templates" 디렉터리(명세 파일 기준 상대 경로)의 파일이 공유 템플릿을 덮어쓰고,
+    그 domains.json의 도메인이 공유 도메인 뒤에 추가된다. "domains"가 있으면 그 도메인만
+    그 순서대로 쓴다.
+    """
+    store = TEMPLATES
+    domains = dict(TEMPLATES.load("domains"))
+    if spec.get("templates"):
+        source_dir = (spec_path.parent / spec["templates"]).resolve()
+        digest = hashlib.sha256(str(source_dir).encode("utf-8")).hexdigest()[:12]
+        store = TemplateStore(source_dir, TEMPLATE_CACHE_DIR / digest, fallback=TEMPLATES)
+        if (source_dir / "domains.json").exists():
+            domains.update(store.load("domains"))
+    if spec.get("domains"):
+        domains = {domain: domains[domain] for domain in spec["domains"]}
+    return domains, store
+
+
+class OrganizationBatch:
+    """
+    여러 조직의 카탈로그를 한 번에 생성하고 공유 스킬을 한 번만 저장.
+
+      skills.json              - {"skills": {콘텐츠 해시: 레코드}} (중복 없이 한 번씩)
+      <조직 id>.json           - 조직 정보 + 레코드 순서대로의 콘텐츠 해시 목록
+                                 + related_skills (skill_id → 관련 스킬 목록)
+      manifest.json            - 조직 목록, 고유 스킬 수, 전체 참조 수
+
+    도메인 입력 해시(템플릿, ID 레지스트리, annotation)가 같은 도메인은 다른 조직에서
+    이미 만든 해시 목록을 재사용하므로, 생성 시간과 저장 공간은 조직 수 × 스킬 수가 아니라
+    고유 스킬 수에 비례한다. 레코드 본문은 처음 볼 때 바로 skills.json에 흘려 쓴다.
+    related_skills는 조직마다 카탈로그 구성에 따라 달라지므로 본문(콘텐츠 해시)에서 빼고
+    조직 파일에 둔다.
+
+    조직 전용 도메인·스킬의 번호는 명세 옆 ids/<조직 id>.json에 따로 기록하고
+    (IdRegistry의 base = 공유 레지스트리), 공유 레지스트리는 읽기만 한다.
+    """
+
+    def __init__(self, output_dir: Path, compute_annotations: Callable[[], Annotations]):
+        self.output_dir = output_dir
+        self.compute_annotations = compute_annotations
+        self.fingerprint = _generator_fingerprint()
+        self.domain_refs: Dict[str, List[str]] = {}
+        self.seen: set = set()
+        self.references = 0
+        self.organizations: Dict[str, Dict[str, Any]] = {}
+        output_dir.mkdir(parents=True, exist_ok=True)
+        self._skills_path = output_dir / "skills.json"
+        self._tmp_path = output_dir / ".skills.json.tmp"
+        self._skills = open(self._tmp_path, "w", encoding="utf-8")
+        self._skills.write(f'{{"version":{ORGANIZATION_BATCH_VERSION},"skills":{{')
+
+    def _store(self, skill: SkillRecord) -> str:
+        body = json.dumps(skill.to_dict(), ensure_ascii=False, separators=(",", ":"))
+        digest = hashlib.sha256(body.encode("utf-8")).hexdigest()[:CONTENT_HASH_LENGTH]
+        if digest not in self.seen:
+            self._skills.write(f'{"," if self.seen else ""}"{digest}":{body}')
+            self.seen.add(digest)
+        return digest
+
+    def add(self, spec: Dict[str, Any], spec_path: Path) -> Dict[str, Any]:
+        domains, store = organization_templates(spec, spec_path)
+        registry = IdRegistry(
+            spec_path.parent / "ids" / f"{spec['id']}.json", base=ID_REGISTRY, offset=ORGANIZATION_ID_OFFSET
+        )
+        refs: List[str] = []
+        related: Dict[str, List[str]] = {}
+        reused = 0
+        with use_templates(domains, store), use_id_registry(registry):
+            assign_skill_ids()
+            annotations = self.compute_annotations()
+            body: Annotations = {}
+            for domain in domains:
+                for index, fields in sorted(annotations.get(domain, {}).items()):
+                    if "related_skills" in fields:
+                        related[generate_skill_id(domains[domain]["code"], index)] = fields["related_skills"]
+                    rest = {name: value for name, value in fields.items() if name != "related_skills"}
+                    if rest:
+                        body.setdefault(domain, {})[index] = rest
+
+            for domain in domains:
+                key = domain_input_hash(domain, "json", self.fingerprint, body.get(domain))
+                if key in self.domain_refs:
+                    reused += 1
+                else:
+                    self.domain_refs[key] = [self._store(skill) for skill in iter_domain_catalog(domain, body)]
+                refs.extend(self.domain_refs[key])
+
+        organization = {key: value for key, value in spec.items() if key not in ("templates", "domains")}
+        path = self.output_dir / f"{spec['id']}.json"
+        write_artifact(
+            path,
+            {"organization": organization, "domains": list(domains), "skill_refs": refs, "related_skills": related},
+        )
+        self.references += len(refs)
+        entry = {"file": path.name, "skills": len(refs), "domains": len(domains), "reused_domains": reused}
+        self.organizations[spec["id"]] = entry
+        return entry
+
+    def finish(self) -> Dict[str, Any]:
+        self._skills.write("}}")
+        self._skills.close()
+        os.replace(self._tmp_path, self._skills_path)
+        manifest = {
+            "version": ORGANIZATION_BATCH_VERSION,
+            "skills_file": self._skills_path.name,
+            "unique_skills": len(self.seen),
+            "total_references": self.references,
+            "organizations": self.organizations,
+        }
+        write_artifact(self.output_dir / "manifest.json", manifest)
+        return manifest
+
+
+def build_organizations(spec_dir: Path, output_dir: Path, compute_annotations: Callable[[], Annotations]) -> Dict[str, Any]:
+    """spec_dir의 조직 명세(*.json, 파일 이름 순)를 모두 생성"""
+    batch = OrganizationBatch(output_dir, compute_annotations)
+    for spec_path in sorted(spec_dir.glob("*.json")):
+        with open(spec_path, encoding="utf-8") as f:
+            spec = json.load(f)
+        spec.setdefault("id", spec_path.stem)
+        entry = batch.add(spec, spec_path)
+        print(f"   🏭 {spec.get('name', spec['id'])}: {entry['skills']}개 스킬 (도메인 재사용 {entry['reused_domains']}/{entry['domains']})")
+    return batch.finish()
+
+
+# ==================== 합성 대용량 카탈로그 ====================
+
+DEFAULT_SYNTHETIC_DIR = DEFAULT_CACHE_DIR / "synthetic"
+DEFAULT_SYNTHETIC_SEED = 42
+
+# 복제본 레이블/설명에 섞는 (한국어, 영어) 수식어와 적용 현장
+SYNTHETIC_QUALIFIERS = (
+    ("기초", "Foundational"),
+    ("응용", "Applied"),
+    ("고급", "Advanced"),
+    ("현장", "On-site"),
+    ("통합", "Integrated"),
+    ("예측형", "Predictive"),
+)
+SYNTHETIC_SITES = (
+    ("자동차 차체 라인", "an automotive body line"),
+    ("반도체 팹", "a semiconductor fab"),
+    ("2차전지 셀 공정", "a battery cell process"),
+    ("전자 조립 라인", "an electronics assembly line"),
+    ("식음료 포장 라인", "a food and beverage packaging line"),
+    ("물류 센터", "a logistics center"),
+)
+
+
+def synthetic_quotas(count: int, domains: Iterable[str]) -> Dict[str, int]:
+    """총 레코드 수를 도메인에 고르게 나눈다 (나머지는 앞 도메인부터 하나씩)"""
+    domains = list(domains)
+    base, extra = divmod(count, len(domains))
+    return {domain: base + (1 if i < extra else 0) for i, domain in enumerate(domains)}
+
+
+def iter_synthetic_domain(domain: str, quota: int, seed: int) -> Iterator[SkillRecord]:
+    """
+    도메인 템플릿을 블록 단위로 복제해 quota개 레코드를 만든다.
+
+    블록 b의 번호는 b * 블록 크기 + 템플릿 위치이고 parent_index도 같은 블록 안으로
+    옮기므로 부모가 항상 자식보다 먼저 나온다 (마지막 블록을 잘라도 계층이 유효).
+    타입·숙련도·역할은 템플릿 그대로라 분포가 실제 카탈로그와 같다.
+    """
+    template = list(iter_domain_records(domain, DOMAINS[domain]))
+    if not template or quota <= 0:
+        return
+    rng = random.Random(f"{seed}:{domain}")
+    size = len(template)
+    block = 0
+    emitted = 0
+    while emitted < quota:
+        offset = block * size
+        for skill in template[: quota - emitted]:
+            qualifier_ko, qualifier_en = rng.choice(SYNTHETIC_QUALIFIERS)
+            site_ko, site_en = rng.choice(SYNTHETIC_SITES)
+            yield SkillRecord(
+                skill.domain_idx,
+                skill.type_idx,
+                offset + skill.index,
+                f"{qualifier_ko} {skill.label_ko} {block + 1}",
+                f"{qualifier_en} {skill.label_en} {block + 1}",
+                f"{skill.description_ko} ({site_ko} 적용)",
+                f"{skill.description_en} (applied to {site_en})",
+                skill.proficiency_level,
+                skill.role_mask,
+                parent_index=offset + skill.parent_index if skill.parent_index else 0,
+            )
+        emitted += min(size, quota - emitted)
+        block += 1
+
+
+def iter_synthetic_records(count: int, seed: int = DEFAULT_SYNTHETIC_SEED) -> Iterator[SkillRecord]:
+    """
+    부하 테스트용 합성 카탈로그를 스트리밍으로 생성 (같은 seed면 같은 출력).
+
+    실제 DOMAINS/템플릿과 generate_skill_id/generate_esco_uri를 그대로 쓰므로 ID·URI
+    형식과 JSON 스키마가 실제 데이터와 같다. ID 레지스트리는 건드리지 않는다.
+    """
+    for domain, quota in synthetic_quotas(count, DOMAINS).items():
+        yield from iter_synthetic_domain(domain, quota, seed)
+
+
+# ==================== 프로파일링 ====================
+
+DEFAULT_PROFILE_PATH = DEFAULT_CACHE_DIR / "profile.json"
+PROFILE_VERSION = 1
+
+
+def preload_templates() -> int:
+    """모든 도메인 템플릿을 미리 읽는다 (생성 단계 시간에 파일 로딩이 섞이지 않게)"""
+    for domain in DOMAINS:
+        KNOWLEDGE_SKILLS.get(domain)
+    return len(DOMAINS)
+
+
+class RunProfiler:
+    """
+    단계별 wall/CPU 시간과 tracemalloc 피크 메모리를 기록하는 --profile 계측기.
+
+    enabled가 False면 phase()/records()는 아무것도 재지 않는다. records()는 직렬
+    스트림에서 next() 시간만 따로 재서 도메인별 생성 시간을 모으고, 빌드 단계의
+    나머지 시간을 직렬화(+ 통계 누적, 부가 산출물 전달)로 본다.
+    """
+
+    def __init__(self, enabled: bool, pstats_path: Optional[Path] = None):
+        self.enabled = enabled
+        self.pstats_path = pstats_path
+        self.phases: List[Dict[str, Any]] = []
+        self.domains: Dict[str, Dict[str, Any]] = {}
+        self._cprofile: Optional[cProfile.Profile] = None
+        if not enabled:
+            return
+        tracemalloc.start()
+        self._started = (time.perf_counter(), time.process_time())
+        if pstats_path:
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[Dict[str, Any]]:
+        """단계 하나를 잰다. yield된 dict에 records/bytes 같은 값을 덧붙일 수 있다"""
+        info: Dict[str, Any] = {"name": name}
+        if not self.enabled:
+            yield info
+            return
+        tracemalloc.reset_peak()
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield info
+        finally:
+            current, peak = tracemalloc.get_traced_memory()
+            info["wall_s"] = round(time.perf_counter() - wall, 6)
+            info["cpu_s"] = round(time.process_time() - cpu, 6)
+            info["peak_bytes"] = peak
+            info["current_bytes"] = current
+            if info.get("records") and info["wall_s"] > 0:
+                info["records_per_sec"] = round(info["records"] / info["wall_s"], 1)
+            self.phases.append(info)
+
+    def records(self, skills: Iterable[SkillRecord]) -> Iterator[SkillRecord]:
+        return self._timed(skills) if self.enabled else iter(skills)
+
+    def _timed(self, skills: Iterable[SkillRecord]) -> Iterator[SkillRecord]:
+        iterator = iter(skills)
+        while True:
+            start = time.perf_counter()
+            try:
+                skill = next(iterator)
+            except StopIteration:
+                return
+            entry = self.domains.setdefault(skill.domain, {"records": 0, "generation_s": 0.0})
+            entry["records"] += 1
+            entry["generation_s"] += time.perf_counter() - start
+            yield skill
+
+    @property
+    def generation_seconds(self) -> float:
+        return sum(entry["generation_s"] for entry in self.domains.values())
+
+    def finish(self, path: Path) -> Dict[str, Any]:
+        """계측을 멈추고 JSON 보고서를 기록"""
+        if self._cprofile:
+            self._cprofile.disable()
+            self.pstats_path.parent.mkdir(parents=True, exist_ok=True)
+            self._cprofile.dump_stats(str(self.pstats_path))
+        tracemalloc.stop()
+
+        wall = time.perf_counter() - self._started[0]
+        records = max((phase.get("records", 0) for phase in self.phases), default=0)
+        report = {
+            "version": PROFILE_VERSION,
+            "python": sys.version.split()[0],
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "totals": {
+                "wall_s": round(wall, 6),
+                "cpu_s": round(time.process_time() - self._started[1], 6),
+                "records": records,
+                "records_per_sec": round(records / wall, 1) if wall > 0 else None,
+                "bytes_written": sum(phase.get("bytes", 0) for phase in self.phases),
+                "peak_bytes": max((phase["peak_bytes"] for phase in self.phases), default=0),
+            },
+            "phases": self.phases,
+            "domains": {
+                domain: dict(entry, generation_s=round(entry["generation_s"], 6)) for domain, entry in self.domains.items()
+            },
+            "pstats": str(self.pstats_path) if self.pstats_path else None,
+        }
+        atomic_write_text(path, json.dumps(report, ensure_ascii=False, indent=2))
+        return report
+
+    @staticmethod
+    def print_report(report: Dict[str, Any]) -> None:
+        print("\n⏱️  단계별 프로파일:")
+        for phase in report["phases"]:
+            print(
+                f"   {phase['name']}: {phase['wall_s']:.3f}s (CPU {phase['cpu_s']:.3f}s,"
+                f" 피크 {phase['peak_bytes'] / 1_048_576:.1f} MiB)"
+            )
+        totals = report["totals"]
+        print(
+            f"   합계: {totals['wall_s']:.3f}s, {totals['records_per_sec'] or 0:,.0f} rec/s,"
+            f" {totals['bytes_written']:,} bytes 기록"
+        )
+
+
+# ==================== 메인 실행 ====================
+
+DEFAULT_OUTPUT_PATH = Path("public/data/robot-smartfactory.json")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="로봇테크 for 스마트팩토리 스킬 데이터 생성")
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="출력 경로 (기본: public/data/robot-smartfactory.json, ndjson은 .ndjson)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default="json",
+        help="json: 점진 기록되는 JSON 배열, ndjson: 한 줄에 스킬 하나",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="입력 해시가 바뀐 도메인만 다시 생성하고 나머지는 캐시에서 재사용",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=DEFAULT_CACHE_DIR,
+        help="증분 빌드·유사 스킬 캐시 디렉터리 (기본: .cache/robot-smartfactory)",
+    )
+    parser.add_argument(
+        "--search-index",
+        type=Path,
+        nargs="?",
+        const=DEFAULT_ARTIFACT_DIR / "search-index.json",
+        default=None,
+        help="역색인을 함께 기록 (경로 생략 시 public/data/robot-smartfactory/search-index.json)",
+    )
+    parser.add_argument(
+        "--route-search-index",
+        type=Path,
+        nargs="?",
+        const=DEFAULT_ROUTE_SEARCH_INDEX,
+        default=None,
+        help=f"검색 API(app/api/search/route.ts)가 읽는 {ROUTE_SEARCH_SOURCE}의 역색인을 기록"
+        f" (경로 생략 시 {DEFAULT_ROUTE_SEARCH_INDEX})",
+    )
+    parser.add_argument(
+        "--korean-keys",
+        type=Path,
+        nargs="?",
+        const=DEFAULT_ARTIFACT_DIR / "korean-keys.json",
+        default=None,
+        help="한글 접두어/초성 검색 키 테이블을 함께 기록 (경로 생략 시 public/data/robot-smartfactory/korean-keys.json)",
+    )
+    parser.add_argument(
+        "--hierarchy-index",
+        type=Path,
+        nargs="?",
+        const=DEFAULT_ARTIFACT_DIR / "hierarchy.json",
+        default=None,
+        help="계층 인덱스(자식 목록, 깊이, 전위 구간)를 함께 기록 (경로 생략 시 public/data/robot-smartfactory/hierarchy.json)",
+    )
+    parser.add_argument(
+        "--validate",
+        action="store_true",
+        help="출력 전에 생성 스트림을 검증하고, 오류가 있으면 아무것도 기록하지 않고 종료 코드 1",
+    )
+    parser.add_argument(
+        "--validation-report",
+        type=Path,
+        default=None,
+        help="검증 보고서 JSON 경로 (--validate와 함께 사용)",
+    )
+    parser.add_argument(
+        "--snapshot",
+        type=Path,
+        nargs="?",
+        const=DEFAULT_SNAPSHOT_DIR,
+        default=None,
+        help=f"카탈로그가 바뀌었으면 스냅샷 체인에 새 버전(base 또는 델타)을 추가 (경로 생략 시 {DEFAULT_SNAPSHOT_DIR})",
+    )
+    parser.add_argument(
+        "--snapshot-compact-every",
+        type=int,
+        default=DEFAULT_SNAPSHOT_COMPACT_EVERY,
+        help=f"델타가 이만큼 이어지면 base로 압축 (기본: {DEFAULT_SNAPSHOT_COMPACT_EVERY})",
+    )
+    parser.add_argument(
+        "--snapshot-sql",
+        type=Path,
+        default=None,
+        help="지난 내보내기 이후 추가된 스냅샷 버전을 ontology_snapshots 적재 스크립트로 기록 (--snapshot 생략 시 기본 경로의 체인, 새 버전이 없으면 파일 유지)",
+    )
+    parser.add_argument(
+        "--snapshot-sql-since",
+        type=int,
+        default=None,
+        metavar="SEQ",
+        help="--snapshot-sql에 이 sequence 뒤의 버전을 모두 기록 (0이면 체인 전체, 적재를 빠뜨렸을 때)",
+    )
+    parser.add_argument(
+        "--restore-snapshot",
+        type=int,
+        default=None,
+        metavar="SEQ",
+        help="생성하지 않고 스냅샷 체인의 SEQ 버전을 --output에 복원",
+    )
+    parser.add_argument(
+        "--shards",
+        type=Path,
+        nargs="?",
+        const=DEFAULT_SHARD_DIR,
+        default=None,
+        help=f"도메인별 콘텐츠 해시 샤드와 manifest.json을 기록 (경로 생략 시 {DEFAULT_SHARD_DIR})",
+    )
+    parser.add_argument(
+        "--shard-by-type",
+        action="store_true",
+        help="--shards를 도메인 × skill_type 단위로 나눈다",
+    )
+    parser.add_argument(
+        "--pack",
+        type=Path,
+        nargs="?",
+        const=DEFAULT_ARTIFACT_DIR / "skills.pack",
+        default=None,
+        help="skill_id 정렬 색인이 붙은 단일 패킹 아카이브를 기록 (경로 생략 시 public/data/robot-smartfactory/skills.pack)",
+    )
+    parser.add_argument(
+        "--embeddings",
+        type=Path,
+        nargs="?",
+        const=DEFAULT_ARTIFACT_DIR / "embeddings",
+        default=None,
+        help="스킬 벡터(.npy)와 근사 최근접 색인(.index.json)을 기록할 경로 stem (경로 생략 시 public/data/robot-smartfactory/embeddings)",
+    )
+    parser.add_argument(
+        "--embedding-dim",
+        type=int,
+        default=DEFAULT_EMBEDDING_DIM,
+        help=f"해싱 벡터 차원 (기본: {DEFAULT_EMBEDDING_DIM})",
+    )
+    parser.add_argument(
+        "--match",
+        default=None,
+        metavar="TEXT",
+        help="생성하지 않고 --embeddings 색인에서 TEXT와 가까운 스킬 후보를 출력",
+    )
+    parser.add_argument(
+        "--bitmaps",
+        type=Path,
+        nargs="?",
+        const=DEFAULT_ARTIFACT_DIR / "bitmaps.json",
+        default=None,
+        help="역할/숙련도/타입/도메인 비트맵 색인을 기록 (경로 생략 시 public/data/robot-smartfactory/bitmaps.json)",
+    )
+    parser.add_argument(
+        "--bitmap-encoding",
+        choices=BITMAP_ENCODINGS,
+        default="dense",
+        help="비트맵 인코딩: dense(base64) 또는 roaring(청크별 array/run/bitmap 컨테이너)",
+    )
+    parser.add_argument(
+        "--cube",
+        type=Path,
+        nargs="?",
+        const=DEFAULT_ARTIFACT_DIR / "cube.json",
+        default=None,
+        help="도메인×타입×역할×숙련도 집계 큐브를 기록 (경로 생략 시 public/data/robot-smartfactory/cube.json)",
+    )
+    parser.add_argument(
+        "--emit-sql",
+        type=Path,
+        default=None,
+        help="skills 테이블용 배치 INSERT ... ON CONFLICT 스크립트 경로",
+    )
+    parser.add_argument(
+        "--emit-copy",
+        type=Path,
+        default=None,
+        help="skills 테이블용 COPY FROM STDIN 적재 스크립트 경로 (psql -f로 실행)",
+    )
+    parser.add_argument(
+        "--sql-batch-size",
+        type=int,
+        default=DEFAULT_SQL_BATCH_SIZE,
+        help=f"--emit-sql의 INSERT 한 문장당 행 수, copy 모드는 관계 COPY 블록당 최대 행 수 (기본: {DEFAULT_SQL_BATCH_SIZE})",
+    )
+    parser.add_argument(
+        "--sql-organization",
+        default=None,
+        help="도메인을 이 조직 코드의 enabler로 upsert하고 skill_enabler_relations까지 적재",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="출력 옆에 .min.json, .columnar.json과 .gz/.br 사전 압축본을 함께 기록",
+    )
+    parser.add_argument(
+        "--related-top-k",
+        type=int,
+        default=DEFAULT_RELATED_TOP_K,
+        help=f"스킬당 related_skills 최대 개수 (기본: {DEFAULT_RELATED_TOP_K}, 0이면 계산 안 함)",
+    )
+    parser.add_argument(
+        "--related-threshold",
+        type=float,
+        default=DEFAULT_RELATED_THRESHOLD,
+        help=f"related_skills로 연결할 최소 추정 Jaccard 유사도 (기본: {DEFAULT_RELATED_THRESHOLD})",
+    )
+    parser.add_argument(
+        "--near-duplicate-threshold",
+        type=float,
+        default=DEFAULT_NEAR_DUPLICATE_THRESHOLD,
+        help=f"중복 의심으로 표시할 유사도 (기본: {DEFAULT_NEAR_DUPLICATE_THRESHOLD})",
+    )
+    parser.add_argument(
+        "--near-duplicates",
+        type=Path,
+        default=None,
+        help="중복 의심 스킬 쌍을 JSON으로 기록할 경로",
+    )
+    parser.add_argument(
+        "--esco-source",
+        type=Path,
+        nargs="?",
+        const=DEFAULT_ESCO_SOURCE,
+        default=None,
+        help="ESCO skills.json을 스트리밍 수집해 esco_uri/esco_broader 연결 (경로 생략 시 public/data/skills.json)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="도메인 단위 병렬 생성 프로세스 수 (기본: 1, 0이면 CPU 코어 수)",
+    )
+    parser.add_argument(
+        "--organizations",
+        type=Path,
+        default=None,
+        metavar="SPEC_DIR",
+        help="조직 명세(*.json) 디렉터리의 모든 조직을 공유 스킬 저장소와 함께 일괄 생성",
+    )
+    parser.add_argument(
+        "--organizations-output",
+        type=Path,
+        default=DEFAULT_ORGANIZATION_OUTPUT_DIR,
+        help=f"--organizations 출력 디렉터리 (기본: {DEFAULT_ORGANIZATION_OUTPUT_DIR})",
+    )
+    parser.add_argument(
+        "--synthetic",
+        type=int,
+        default=None,
+        metavar="N",
+        help=f"템플릿을 복제한 합성 카탈로그 N개를 생성 (부하 테스트용, 기본 출력: {DEFAULT_SYNTHETIC_DIR})",
+    )
+    parser.add_argument(
+        "--synthetic-seed",
+        type=int,
+        default=DEFAULT_SYNTHETIC_SEED,
+        help=f"--synthetic 난수 seed (기본: {DEFAULT_SYNTHETIC_SEED})",
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        nargs="?",
+        const=DEFAULT_PROFILE_PATH,
+        default=None,
+        help=f"단계별 시간·메모리 프로파일을 JSON으로 기록 (경로 생략 시 {DEFAULT_PROFILE_PATH})",
+    )
+    parser.add_argument(
+        "--profile-pstats",
+        type=Path,
+        default=None,
+        help="--profile과 함께 cProfile 결과(pstats)를 이 경로에 저장",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="생성 후 템플릿 파일을 감시하며 바뀐 도메인만 다시 생성해 출력을 교체",
+    )
+    parser.add_argument(
+        "--watch-interval",
+        type=float,
+        default=DEFAULT_WATCH_INTERVAL,
+        help=f"--watch 폴링 간격 초 (기본: {DEFAULT_WATCH_INTERVAL})",
+    )
+    args = parser.parse_args(argv)
+    if args.synthetic is not None and (args.incremental or args.watch or args.organizations):
+        parser.error("--synthetic은 --incremental/--watch/--organizations와 함께 쓸 수 없습니다")
+    return args
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    print("🚀 로봇테크 for 스마트팩토리 스킬 데이터 생성 시작...")
+    TEMPLATES.enable_persist()
+
+    output_path = args.output
+    if output_path is None:
+        output_path = DEFAULT_OUTPUT_PATH
+        if args.synthetic is not None:
+            # 실제 카탈로그를 덮어쓰지 않도록 합성 데이터는 캐시 디렉터리에 둔다
+            output_path = DEFAULT_SYNTHETIC_DIR / f"robot-smartfactory-{args.synthetic}.json"
+        if args.format == "ndjson":
+            output_path = output_path.with_suffix(".ndjson")
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    workers = args.workers or os.cpu_count() or 1
+    if args.synthetic is not None:
+        workers = 1  # 합성 스트림은 도메인 조각으로 나누지 않고 한 번에 기록
+
+    if args.restore_snapshot is not None:
+        snapshot_dir = args.snapshot or DEFAULT_SNAPSHOT_DIR
+        count = restore_snapshot(snapshot_dir, args.restore_snapshot, output_path, args.format)
+        print(f"⏪ 스냅샷 {args.restore_snapshot} 복원: {output_path} ({count}개 스킬)")
+        return 0
+
+    if args.match is not None:
+        embeddings = args.embeddings or DEFAULT_ARTIFACT_DIR / "embeddings"
+        index = SkillVectorIndex(embeddings.with_suffix(".index.json"))
+        print(f"🎯 후보 스킬: {args.match}")
+        for skill_id, score in index.query(args.match):
+            print(f"   {skill_id} ({score:.3f})")
+        return 0
+
+    profiler = RunProfiler(bool(args.profile), args.profile_pstats)
+    with profiler.phase("templates") as phase:
+        phase["domains"] = preload_templates()
+
+    with profiler.phase("ids"):
+        assigned = assign_skill_ids()
+    if assigned:
+        print(f"🆔 새 skill_id 배정: {assigned}개 ({ID_REGISTRY.path})")
+
+    esco_linker = None
+    if args.esco_source:
+        with profiler.phase("esco_ingest"):
+            esco_linker = EscoLinker()
+            esco_linker.ingest(args.esco_source)
+
+    if args.synthetic is not None:
+        print(f"🧪 합성 카탈로그: {args.synthetic:,}개 (seed {args.synthetic_seed})")
+
+        def catalog_records(annotations: Optional[Annotations] = None) -> Iterator[SkillRecord]:
+            return iter_synthetic_records(args.synthetic, args.synthetic_seed)
+
+    else:
+        catalog_records = iter_skill_records
+
+    # 감시 모드·조직 일괄 생성에서 매번 다시 쓰므로 색인을 메모리에 들고 있는다
+    related = RelatedSkillCache(
+        args.cache_dir / "similarity.marshal", args.related_top_k, args.related_threshold, args.near_duplicate_threshold
+    )
+
+    esco_links: Annotations = {}
+
+    def catalog_annotations(
+        domains: Optional[Collection[str]] = None,
+    ) -> Tuple[Annotations, List[Dict[str, Any]], List[str]]:
+        """(annotation, 중복 의심 쌍, annotation이 바뀌었을 수 있는 도메인). domains를 주면 그 도메인만 다시 연결"""
+        annotations: Annotations = {}
+        near_duplicates: List[Dict[str, Any]] = []
+        touched: List[str] = []
+        if args.synthetic is not None:
+            # 합성 레코드는 번호가 템플릿과 달라 annotation을 적용할 수 없다
+            return annotations, near_duplicates, touched
+        if args.related_top_k > 0:
+            annotations, near_duplicates, touched = related.compute(domains)
+        if esco_linker:
+            for stale in set(esco_links) - set(DOMAINS):
+                del esco_links[stale]
+            relinked = list(DOMAINS if domains is None else domains)
+            for domain in relinked:
+                esco_links[domain] = esco_linker.link(iter_domain_catalog(domain)).get(domain, {})
+            touched = [domain for domain in DOMAINS if domain in touched or domain in relinked]
+            annotations = merge_annotations(annotations, esco_links)
+        return annotations, near_duplicates, touched
+
+    if args.organizations:
+        print(f"🏢 조직 일괄 생성: {args.organizations}")
+        manifest = build_organizations(
+            args.organizations, args.organizations_output, lambda: catalog_annotations()[0]
+        )
+        print(
+            f"✅ {len(manifest['organizations'])}개 조직, 참조 {manifest['total_references']}개"
+            f" → 고유 스킬 {manifest['unique_skills']}개 ({args.organizations_output})"
+        )
+        return 0
+
+    # 레코드 스트림을 함께 소비하는 부가 산출물 (빌더, 경로)
+    artifacts = []
+    if args.search_index:
+        artifacts.append((SearchIndexBuilder(), args.search_index))
+    if args.korean_keys:
+        artifacts.append((KoreanKeyTableBuilder(), args.korean_keys))
+    if args.hierarchy_index:
+        artifacts.append((HierarchyIndexBuilder(), args.hierarchy_index))
+    if args.compact:
+        artifacts.append((CompactCatalogBuilder(), output_path.with_suffix("")))
+    if args.shards:
+        artifacts.append((ShardedCatalogBuilder(args.shard_by_type), args.shards))
+    if args.pack:
+        artifacts.append((PackedArchiveBuilder(), args.pack))
+    if args.bitmaps:
+        artifacts.append((BitmapIndexBuilder(args.bitmap_encoding), args.bitmaps))
+    if args.embeddings:
+        artifacts.append((EmbeddingIndexBuilder(args.embedding_dim), args.embeddings))
+    if args.snapshot or args.snapshot_sql:
+        recorder = SnapshotRecorder(args.snapshot_compact_every, args.snapshot_sql, args.snapshot_sql_since)
+        artifacts.append((recorder, args.snapshot or DEFAULT_SNAPSHOT_DIR))
+    if args.emit_sql:
+        writer = SqlExportWriter(args.emit_sql, "sql", args.sql_batch_size, args.sql_organization)
+        artifacts.append((writer, args.emit_sql))
+    if args.emit_copy:
+        writer = SqlExportWriter(args.emit_copy, "copy", args.sql_batch_size, args.sql_organization)
+        artifacts.append((writer, args.emit_copy))
+    sinks = [builder for builder, _path in artifacts]
+
+    # 1차 패스: 직렬화 없이 서명만 모아 related_skills를 계산
+    with profiler.phase("annotations"):
+        annotations, near_duplicates, _touched = catalog_annotations()
+
+    if args.validate:
+        # 직렬화 없이 생성만 한 번 더 돌려 검증하고, 실패하면 출력을 건드리기 전에 멈춘다
+        with profiler.phase("validate"):
+            report = validate_records(catalog_records(annotations))
+        if args.validation_report:
+            write_artifact(args.validation_report, report)
+        if not report["ok"]:
+            print(f"❌ 검증 실패: {report['total']}개 스킬")
+            for check, details in report["errors"].items():
+                print(f"   - {check}: {report['counts'][check]}건 (예: {details[0]})")
+            return 1
+        print(f"🔍 검증 통과: {report['total']}개 스킬, 경고 {sum(report['counts'][c] for c in report['warnings'])}건")
+
+    with profiler.phase("build") as phase:
+        if args.incremental:
+            stats, rebuilt = build_incremental(output_path, args.format, args.cache_dir, workers, annotations)
+            print(f"♻️  증분 빌드: {len(rebuilt)}/{len(DOMAINS)}개 도메인 재생성")
+            for domain in rebuilt:
+                print(f"   - {DOMAINS[domain]['name_ko']}")
+        elif workers > 1:
+            stats = build_parallel(output_path, args.format, workers, annotations)
+            print(f"⚡ 병렬 생성: {workers}개 프로세스")
+        else:
+            # 생성 → 통계 → 기록을 한 번의 스트림으로 처리
+            stats = SkillStats()
+            with open(output_path, "w", encoding="utf-8") as f:
+                skills = profiler.records(catalog_records(annotations))
+                write_records(stats.track(feed_sinks(skills, sinks)), f, args.format)
+            sinks = []  # 직렬 스트림에서 이미 전달됨
+            phase["generation_s"] = round(profiler.generation_seconds, 6)
+        phase["records"] = stats.total
+        phase["bytes"] = output_path.stat().st_size
+
+    with profiler.phase("artifacts") as phase:
+        # 병렬/증분 빌드는 부모 프로세스에 레코드가 없으므로 직렬화 없이 한 번 더 생성해서 전달
+        if sinks:
+            for _skill in feed_sinks(catalog_records(annotations), sinks):
+                pass
+
+        print(f"✅ 데이터 생성 완료: {output_path}")
+        print(f"   총 스킬 수: {stats.total}개")
+        phase["bytes"] = 0
+        for builder, path in artifacts:
+            for written, size in builder.write(path):
+                print(f"   부가 산출물: {written} ({size:,} bytes)")
+                phase["bytes"] += size
+        if args.cube:
+            # 통계 셀에서 바로 만들므로 병렬/증분 빌드도 재생성 패스가 필요 없다
+            size = write_artifact(args.cube, stats.to_cube())
+            print(f"   집계 큐브: {args.cube} ({size:,} bytes)")
+            phase["bytes"] += size
+        if args.route_search_index:
+            # 생성 카탈로그가 아니라 검색 API가 읽는 skills.json을 색인한다
+            for written, size in write_route_search_index(ROUTE_SEARCH_SOURCE, args.route_search_index):
+                print(f"   검색 API 역색인: {written} ({size:,} bytes)")
+                phase["bytes"] += size
+
+    if esco_linker:
+        provenance = sum((esco_linker.provenance.get(domain, Counter()) for domain in DOMAINS), Counter())
+        print(
+            f"\n🇪🇺 ESCO 수집: {esco_linker.scanned}개 중 후보 {len(esco_linker.uris)}개"
+            f" → esco_uri {provenance['uri']}개,"
+            f" esco_broader {provenance['hierarchy'] + provenance['parent']}개"
+            f" (ESCO 계층 {provenance['hierarchy']}, 상위 스킬 {provenance['parent']}),"
+            f" 부분 일치 미연결 {provenance['partial']}개"
+        )
+
+    if args.related_top_k > 0:
+        linked = sum(
+            "related_skills" in fields
+            for domain_annotations in annotations.values()
+            for fields in domain_annotations.values()
+        )
+        print(f"\n🔗 related_skills 연결: {linked}개 스킬")
+        if near_duplicates:
+            print(f"⚠️  중복 의심 스킬: {len(near_duplicates)}쌍")
+            for pair in near_duplicates[:10]:
+                first, second = pair["skill_ids"]
+                print(f"   {first} ↔ {second} (유사도 {pair['similarity']})")
+        if args.near_duplicates:
+            write_artifact(args.near_duplicates, near_duplicates)
+
+    with profiler.phase("stats"):
+        stats.print_report()
+
+    if args.profile:
+        RunProfiler.print_report(profiler.finish(args.profile))
+        print(f"   프로파일: {args.profile}" + (f", pstats: {args.profile_pstats}" if args.profile_pstats else ""))
+
+    print("\n✨ 데이터 생성 완료!")
+
+    if args.watch:
+
+        def watch_annotations(domains: Optional[Collection[str]]) -> Tuple[Annotations, List[str]]:
+            annotations, _near_duplicates, touched = catalog_annotations(domains)
+            return annotations, touched
+
+        session = WatchSession(output_path, args.format, watch_annotations)
+        session.rebuild(write=False)
+        session.run(args.watch_interval)
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+생성기 테스트 공용 도우미
+
+generate-robot-smartfactory-data.py(하이픈 이름)를 모듈로 한 번만 로드하고
+실제 카탈로그 레코드와 임시 디렉터리 TestCase를 제공한다.
+"""
+
+import contextlib
+import importlib.util
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+REPO_ROOT = SCRIPTS_DIR.parent
+GENERATOR_PATH = SCRIPTS_DIR / "generate-robot-smartfactory-data.py"
+
+
+def load_generator():
+    """하이픈이 들어간 스크립트 파일을 모듈로 로드"""
+    spec = importlib.util.spec_from_file_location("generate_robot_smartfactory_data", GENERATOR_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+gen = load_generator()
+SKILLS = list(gen.iter_skill_records())
+RECORDS = [skill.to_dict() for skill in SKILLS]
+
+
+def build(builder, skills=SKILLS):
+    for skill in skills:
+        builder.add(skill)
+    return builder
+
+
+def run_generator(*args, cwd=REPO_ROOT) -> subprocess.CompletedProcess:
+    """생성기 CLI를 별도 프로세스로 실행 (실패하면 출력과 함께 예외)"""
+    result = subprocess.run(
+        [sys.executable, str(GENERATOR_PATH), *map(str, args)], cwd=cwd, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise AssertionError(f"생성기 실패 ({result.returncode}):\n{result.stdout}\n{result.stderr}")
+    return result
+
+
+class TempDirTestCase(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+
+class TemplateCopyTestCase(TempDirTestCase):
+    """
+    템플릿 디렉터리와 ID 레지스트리를 임시 복사본으로 바꿔 실행하는 TestCase.
+
+    테스트 동안 생성 함수들은 self.source의 템플릿과 self.registry를 쓰므로
+    템플릿을 고쳐도 저장소의 원본은 바뀌지 않는다.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.source = self.tmp / "templates"
+        shutil.copytree(gen.TEMPLATE_DIR, self.source)
+        shutil.copy(gen.ID_REGISTRY_PATH, self.tmp / "ids.json")
+        self.store = gen.TemplateStore(self.source, None)
+        self.domains = self.store.load("domains")
+        self.registry = gen.IdRegistry(self.tmp / "ids.json")
+        stack = contextlib.ExitStack()
+        stack.enter_context(gen.use_templates(self.domains, self.store))
+        stack.enter_context(gen.use_id_registry(self.registry))
+        self.addCleanup(stack.close)
+
+    def read_template(self, name):
+        return json.loads((self.source / f"{name}.json").read_text(encoding="utf-8"))
+
+    def write_template(self, name, data):
+        text = json.dumps(data, ensure_ascii=False, indent=2)
+        (self.source / f"{name}.json").write_text(text, encoding="utf-8")
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+"""벤치마크: 청크로 나눠도 생성 스트림 전체를 그대로 처리하고, 단계별 결과를 모두 기록"""
+
+import importlib.util
+import unittest
+
+from support import SCRIPTS_DIR, gen
+
+
+def load_benchmark():
+    path = SCRIPTS_DIR / "benchmark-robot-smartfactory.py"
+    spec = importlib.util.spec_from_file_location("benchmark_robot_smartfactory", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+bench = load_benchmark()
+
+
+class BenchmarkTest(unittest.TestCase):
+    def test_record_chunks_cover_the_stream(self):
+        chunks = list(bench.record_chunks(gen, 10))
+        self.assertTrue(all(0 < len(chunk) <= 10 for chunk in chunks))
+        flattened = [skill.to_dict() for chunk in chunks for skill in chunk]
+        self.assertEqual(flattened, [skill.to_dict() for skill in gen.iter_skill_records()])
+
+    def test_run_scale_reports_every_phase(self):
+        result = bench.run_scale(gen, 500, 1, True)
+        self.assertGreaterEqual(result["records"], 500)
+        self.assertEqual(tuple(result["phases"]), bench.PHASES)
+        for metrics in result["phases"].values():
+            self.assertGreater(metrics["seconds"], 0)
+            self.assertIsNotNone(metrics["peak_bytes"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+"""비트맵 색인 갭 질의 = 선형 스캔 (dense / roaring)"""
+
+import unittest
+
+from support import RECORDS, TempDirTestCase, build, gen
+
+
+class BitmapIndexTest(TempDirTestCase):
+    def scan(self, role=None, min_level=None, domain=None, skill_type=None, held=()):
+        return [
+            record["skill_id"]
+            for record in RECORDS
+            if (role is None or role in record["role_mapping"])
+            and (min_level is None or record["proficiency_level"] >= min_level)
+            and (domain is None or record["domain"] == domain)
+            and (skill_type is None or record["skill_type"] == skill_type)
+            and record["skill_id"] not in held
+        ]
+
+    def test_gap_matches_scan(self):
+        held = {record["skill_id"] for record in RECORDS[::3]}
+        for encoding in gen.BITMAP_ENCODINGS:
+            path = self.tmp / f"bitmaps.{encoding}.json"
+            build(gen.BitmapIndexBuilder(encoding)).write(path)
+            index = gen.BitmapIndex.load(path)
+            for role in (None, *gen.ROLES):
+                for min_level in (None, 0, 1, 2, 3, 4, 5):
+                    for domain in (None, *gen.DOMAINS):
+                        query = dict(role=role, min_level=min_level, domain=domain)
+                        self.assertEqual(index.gap(**query), self.scan(**query), (encoding, query))
+            for skill_type in gen.SKILL_TYPES:
+                query = dict(role="engineer", min_level=3, skill_type=skill_type, held=held)
+                self.assertEqual(index.gap(**query), self.scan(**query), (encoding, query))
+
+    def test_min_level_below_lowest_matches_all(self):
+        path = self.tmp / "bitmaps.json"
+        build(gen.BitmapIndexBuilder()).write(path)
+        index = gen.BitmapIndex.load(path)
+        self.assertEqual(index.gap(min_level=-1), [record["skill_id"] for record in RECORDS])
+
+
+if __name__ == "__main__":
+    unittest.main()
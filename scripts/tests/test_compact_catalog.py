@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""compact 카탈로그: .min.json과 .columnar.json 디코드 결과가 전체 카탈로그와 같고, 사이드카는 원본의 압축"""
+
+import gzip
+import json
+import unittest
+
+from support import RECORDS, TempDirTestCase, build, gen, run_generator
+
+
+class CompactCatalogTest(TempDirTestCase):
+    def test_cli_outputs_decode_to_catalog(self):
+        output = self.tmp / "catalog.json"
+        run_generator("--output", output, "--compact", "--cache-dir", self.tmp / "cache")
+        catalog = json.loads(output.read_text(encoding="utf-8"))
+        # related_skills까지 채워진 실제 카탈로그로 ref/ref_list 인코딩을 함께 확인
+        self.assertTrue(any(record["related_skills"] for record in catalog))
+
+        min_path = self.tmp / "catalog.min.json"
+        columnar_path = self.tmp / "catalog.columnar.json"
+        self.assertEqual(json.loads(min_path.read_text(encoding="utf-8")), catalog)
+        columnar = json.loads(columnar_path.read_text(encoding="utf-8"))
+        decoded = gen.decode_columnar(columnar)
+        self.assertEqual(decoded, catalog)
+        self.assertEqual([list(row) for row in decoded], [list(record) for record in catalog])
+
+        encodings = {column["encoding"] for column in columnar["columns"].values()}
+        self.assertTrue({"ref", "ref_list", "dict", "prefix"} <= encodings, encodings)
+
+        for path in (min_path, columnar_path):
+            sidecar = path.with_name(path.name + ".gz")
+            self.assertEqual(gzip.decompress(sidecar.read_bytes()), path.read_bytes())
+
+    def test_columnar_roundtrip_in_process(self):
+        builder = build(gen.CompactCatalogBuilder())
+        self.assertEqual(list(builder.rows()), RECORDS)
+        self.assertEqual(gen.decode_columnar(builder.to_columnar()), RECORDS)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""임베딩 색인: .npy 행렬이 정규화된 벡터이고, LSH 질의 결과가 전수 내적 순위와 일치"""
+
+import struct
+import unittest
+from array import array
+from unittest import mock
+
+from support import SKILLS, TempDirTestCase, build, gen
+
+
+def read_npy(path):
+    data = path.read_bytes()
+    header_len = struct.unpack_from("<H", data, len(gen.NPY_MAGIC))[0]
+    header = data[len(gen.NPY_MAGIC) + 2 : len(gen.NPY_MAGIC) + 2 + header_len].decode("latin1")
+    values = array("f")
+    values.frombytes(data[len(gen.NPY_MAGIC) + 2 + header_len :])
+    return header, values
+
+
+class EmbeddingIndexTest(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.dim = 256
+        written = build(gen.EmbeddingIndexBuilder(self.dim)).write(self.tmp / "embeddings.json")
+        self.index_path = self.tmp / "embeddings.index.json"
+        self.assertEqual([path.name for path, _size in written], ["embeddings.npy", "embeddings.index.json"])
+
+    def cosines(self, index, text, rows):
+        vector = gen.hashed_tfidf(gen.embedding_terms(text, ""), index.idf, self.dim)
+        return {
+            skill_id: sum(a * b for a, b in zip(rows[i * self.dim : (i + 1) * self.dim], vector))
+            for i, skill_id in enumerate(index.skill_ids)
+        }
+
+    def test_matrix_is_normalized(self):
+        header, rows = read_npy(self.tmp / "embeddings.npy")
+        self.assertIn(f"'shape': ({len(SKILLS)}, {self.dim})", header)
+        self.assertEqual(len(rows), len(SKILLS) * self.dim)
+        for i in range(len(SKILLS)):
+            norm = sum(v * v for v in rows[i * self.dim : (i + 1) * self.dim])
+            self.assertAlmostEqual(norm, 1.0, places=4)
+
+    def test_queries_rank_by_cosine(self):
+        _header, rows = read_npy(self.tmp / "embeddings.npy")
+        # numpy가 있으면 행렬 연산 경로와 순수 파이썬 경로를 모두 확인
+        for numpy in {gen.numpy, None}:
+            with self.subTest(numpy=numpy is not None), mock.patch.object(gen, "numpy", numpy):
+                index = gen.SkillVectorIndex(self.index_path)
+                for skill in SKILLS:
+                    # 스킬 자신의 전체 문구로 질의하면 항상 그 스킬이 1위
+                    text = f"{skill.label_en} {skill.label_ko} {skill.description_en} {skill.description_ko}"
+                    self.assertEqual(index.query(text, 5)[0][0], skill.skill_id, text)
+
+                for skill in SKILLS[::5]:
+                    # LSH 후보를 전수 내적과 같은 점수로 재정렬
+                    results = index.query(skill.label_en, 5)
+                    self.assertTrue(results, skill.label_en)
+                    cosines = self.cosines(index, skill.label_en, rows)
+                    for skill_id, score in results:
+                        self.assertAlmostEqual(score, cosines[skill_id], places=5)
+                    self.assertEqual(results, sorted(results, key=lambda item: -item[1]))
+
+    def test_stopword_query_returns_nothing(self):
+        index = gen.SkillVectorIndex(self.index_path)
+        self.assertEqual(index.query("the and of", 5), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""ESCO 스트리밍 파서 (작은 청크)와 계층 기반 esco_broader 연결"""
+
+import io
+import json
+import unittest
+
+from support import REPO_ROOT, SKILLS, gen
+
+
+class EscoStreamTest(unittest.TestCase):
+    SKILLS = [
+        {"uri": "http://x/1", "label": "robot \"kinematics\"", "description": "줄바꿈\n탭\t, ] } 괄호"},
+        {"uri": "http://x/2", "label": "motion control", "score": 12345678, "flag": True, "none": None},
+        {"uri": "http://x/3", "label": "ü ß 日本", "nested": {"a": [1, 2.5e-3, {"b": []}]}},
+    ]
+
+    def stream(self, payload, chunk_size):
+        return gen._JsonStream(io.StringIO(payload), chunk_size=chunk_size)
+
+    def test_small_chunks(self):
+        grouped = {"robotics": self.SKILLS[:2], "empty": [], "meta": {"v": 1}, "control": self.SKILLS[2:]}
+        expected = [(group, skill) for group, skills in grouped.items() if isinstance(skills, list) for skill in skills]
+        for indent in (None, 2):
+            payload = json.dumps(grouped, ensure_ascii=False, indent=indent)
+            for chunk_size in (1, 2, 3, 7, 64):
+                stream = self.stream(payload, chunk_size)
+                stream.consume("{")
+                seen = []
+                while True:
+                    group = stream.value()
+                    stream.consume(":")
+                    if stream.peek() == "[":
+                        seen.extend((group, skill) for skill in stream.array())
+                    else:
+                        stream.value()
+                    if stream.peek() == "}":
+                        break
+                    stream.consume(",")
+                self.assertEqual(seen, expected, (indent, chunk_size))
+
+    def test_top_level_array(self):
+        payload = json.dumps(self.SKILLS)
+        for chunk_size in (1, 5):
+            self.assertEqual(list(self.stream(payload, chunk_size).array()), self.SKILLS)
+
+    def test_bundled_skills_json(self):
+        source = REPO_ROOT / gen.DEFAULT_ESCO_SOURCE
+        with open(source, encoding="utf-8") as f:
+            expected = [(group, skill) for group, skills in json.load(f).items() for skill in skills]
+        self.assertEqual(list(gen.iter_esco_skills(source)), expected)
+
+
+class EscoLinkerTest(unittest.TestCase):
+    def test_broader_from_hierarchy(self):
+        parent = next(skill for skill in SKILLS if skill.parent_index == 0 and skill.domain == "industrial-robot-control")
+        children = [skill for skill in SKILLS if skill.domain == parent.domain and skill.parent_index == parent.index]
+        self.assertTrue(children)
+        linker = gen.EscoLinker()
+        linker.add({
+            "uri": "http://x/exact",
+            "label": "unrelated label",
+            "altLabel": [{"label": parent.label_en, "language": "en"}],
+            "description": "industrial robot kinematics",
+            "_links": {"broaderSkill": [{"href": "http://x/parent"}]},
+        })
+        linker.add({"uri": "http://x/partial", "label": f"{parent.label_en} audit", "description": "industrial robot"})
+
+        links = linker.link(gen.iter_domain_catalog(parent.domain)).get(parent.domain, {})
+        self.assertEqual(links[parent.index], {"esco_uri": "http://x/exact", "esco_broader": "http://x/parent"})
+        for child in children:
+            self.assertEqual(links[child.index], {"esco_broader": "http://x/exact"})
+        # 일부만 겹치는 레이블은 상위 개념 근거가 아니다
+        self.assertNotIn("http://x/partial", [value for fields in links.values() for value in fields.values()])
+        self.assertEqual(linker.provenance[parent.domain]["hierarchy"], 1)
+        self.assertEqual(linker.provenance[parent.domain]["parent"], len(children))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""ID 레지스트리: 템플릿 항목을 끼워 넣거나 순서를 바꿔도 기존 skill_id 유지, 새 항목은 뒤 번호"""
+
+import unittest
+
+from support import TemplateCopyTestCase, gen
+
+
+class IdRegistryTest(TemplateCopyTestCase):
+    def catalog(self, domain):
+        return {
+            (record["skill_type"], record["preferred_label_en"]): record
+            for record in (skill.to_dict() for skill in gen.iter_skill_records())
+            if record["domain"] == domain
+        }
+
+    def test_insert_and_reorder_keep_existing_ids(self):
+        domain = list(self.domains)[3]
+        before = self.catalog(domain)
+        last = max(self.registry.domain_ids(domain).values())
+
+        data = self.read_template(domain)
+        data["knowledge"].insert(0, dict(data["knowledge"][0], label_en="Fleet Telemetry Basics"))
+        data["skill"].reverse()
+        data["competence"].insert(1, ["현장 안전 점검", "Site Safety Audit", "작업 전 안전 점검", "Audit site safety"])
+        self.write_template(domain, data)
+        self.store.invalidate(domain)
+
+        self.assertEqual(gen.assign_skill_ids([domain]), 2)
+        after = self.catalog(domain)
+        for key, record in before.items():
+            self.assertEqual(after[key]["skill_id"], record["skill_id"], key)
+            self.assertEqual(after[key]["esco_uri"], record["esco_uri"], key)
+
+        code = self.domains[domain]["code"]
+        added = {key: after[key]["skill_id"] for key in set(after) - set(before)}
+        self.assertEqual(
+            added,
+            {
+                ("knowledge", "Fleet Telemetry Basics"): gen.generate_skill_id(code, last + 1),
+                ("competence", "Site Safety Audit"): gen.generate_skill_id(code, last + 2),
+            },
+        )
+        # 다시 읽어도 같은 번호 (레지스트리 파일에 기록됨)
+        reloaded = gen.IdRegistry(self.registry.path).domain_ids(domain)
+        self.assertEqual(reloaded, self.registry.domain_ids(domain))
+
+    def test_other_domains_untouched(self):
+        domains = list(self.domains)
+        before = {domain: dict(self.registry.domain_ids(domain)) for domain in domains}
+        data = self.read_template(domains[0])
+        data["skill"].insert(0, ["새 기술", "New Technique", "설명", "Description"])
+        self.write_template(domains[0], data)
+        self.store.invalidate(domains[0])
+
+        gen.assign_skill_ids()
+        for domain in domains[1:]:
+            self.assertEqual(self.registry.domain_ids(domain), before[domain])
+
+
+if __name__ == "__main__":
+    unittest.main()
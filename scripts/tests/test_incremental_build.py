@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""증분 빌드: 템플릿 하나를 고치면 그 도메인만 재생성되고 출력은 전체 빌드와 같은 바이트"""
+
+import unittest
+
+from support import TemplateCopyTestCase, gen
+
+
+class IncrementalBuildTest(TemplateCopyTestCase):
+    def edit_knowledge(self, domain):
+        data = self.read_template(domain)
+        data["knowledge"][0]["description_en"] += " (revised)"
+        self.write_template(domain, data)
+        self.store.invalidate(domain)
+
+    def test_only_edited_domain_is_rebuilt(self):
+        domain = list(self.domains)[2]
+        for fmt in ("json", "ndjson"):
+            with self.subTest(fmt=fmt):
+                output = self.tmp / f"incremental.{fmt}"
+                cache = self.tmp / f"cache-{fmt}"
+                gen.assign_skill_ids()
+
+                _stats, rebuilt = gen.build_incremental(output, fmt, cache)
+                self.assertEqual(rebuilt, list(self.domains))
+                _stats, rebuilt = gen.build_incremental(output, fmt, cache)
+                self.assertEqual(rebuilt, [])
+
+                self.edit_knowledge(domain)
+                stats, rebuilt = gen.build_incremental(output, fmt, cache)
+                self.assertEqual(rebuilt, [domain])
+
+                full = self.tmp / f"full.{fmt}"
+                full_stats = gen.build_parallel(full, fmt, 1)
+                self.assertEqual(output.read_bytes(), full.read_bytes())
+                self.assertEqual(stats.to_dict(), full_stats.to_dict())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""한글 자모/초성 키 조회 = 원문 전수 확인"""
+
+import unittest
+
+from support import RECORDS, TempDirTestCase, build, gen
+
+
+class KoreanKeyTableTest(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        path = self.tmp / "korean-keys.json"
+        build(gen.KoreanKeyTableBuilder()).write(path)
+        self.table = gen.KoreanKeyTable(path)
+
+    def brute_force(self, query):
+        convert = gen.hangul_choseong if gen.is_choseong_query(query) else gen.hangul_jamo
+        key = convert(query)
+        matches = []
+        for field in gen.KOREAN_KEY_FIELDS:
+            for record in RECORDS:
+                text = record["preferred_label_ko" if field == "label" else "description_ko"]
+                if any(convert(suffix).startswith(key) for suffix in gen.korean_word_suffixes(text)):
+                    matches.append((record["skill_id"], field))
+        return matches
+
+    def test_choseong_queries(self):
+        for query in ("ㄹㅂ", "ㄹ ㅂ", "ㅅㅁㅌㅍㅌㄹ", "ㅈ", "ㄷㅈㅌㅇ ㅅㅁㄹㅇㅅ ㅎㄱ ㄱㅊ ㅁ ㅇㅇ"):
+            with self.subTest(query=query):
+                self.assertEqual(self.table.lookup(query), self.brute_force(query))
+        self.assertTrue(self.table.lookup("ㄹㅂ"))
+
+    def test_jamo_prefix_queries(self):
+        label = RECORDS[0]["preferred_label_ko"]
+        for query in ("로", "롭", "로봇", "로봇 구", label, "Robot", "없는질의"):
+            with self.subTest(query=query):
+                self.assertEqual(self.table.lookup(query), self.brute_force(query))
+
+    def test_conversions(self):
+        self.assertEqual(gen.hangul_choseong("로봇 제어"), "ㄹㅂㅈㅇ")
+        self.assertEqual(gen.hangul_jamo("각"), "ㄱㅏㄱ")
+        self.assertTrue(gen.is_choseong_query("ㄹ ㅂ"))
+        self.assertFalse(gen.is_choseong_query("ㄹ봇"))
+        self.assertEqual(self.table.lookup("   "), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""조직 일괄 생성: 공유 스킬은 한 번만 저장, 조직 전용 번호는 901부터, 공유 레지스트리는 그대로"""
+
+import json
+import unittest
+
+from support import RECORDS, TempDirTestCase, gen, run_generator
+
+
+def without_related(record):
+    """related_skills는 조직 파일에 따로 두므로 본문 비교에서 뺀다"""
+    return {key: value for key, value in record.items() if key != "related_skills"}
+
+
+class OrganizationBatchTest(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.shared = list(gen.DOMAINS)
+        specs = self.tmp / "orgs"
+        (specs / "acme-templates").mkdir(parents=True)
+        self.write(specs / "alpha.json", {"name": "Alpha"})
+        self.write(specs / "beta.json", {"name": "Beta", "domains": self.shared[:2]})
+        self.write(specs / "acme.json", {"name": "Acme", "templates": "acme-templates"})
+
+        # 조직 전용 도메인 하나와, 공유 도메인 하나에 항목을 끼워 넣은 덮어쓰기
+        self.write(
+            specs / "acme-templates" / "domains.json",
+            {"acme-welding": {"name_ko": "용접 자동화", "name_en": "Welding Automation", "code": "AWA", "target_count": 2}},
+        )
+        knowledge = {"label_ko": "아크 용접", "label_en": "Arc Welding", "description_ko": "아크 용접 원리",
+                     "description_en": "Arc welding principles", "proficiency": 1}
+        self.write(specs / "acme-templates" / "acme-welding.json", {"knowledge": [knowledge], "skill": [], "competence": []})
+        override = json.loads((gen.TEMPLATE_DIR / f"{self.shared[0]}.json").read_text(encoding="utf-8"))
+        override["knowledge"].insert(0, dict(knowledge, label_en="Acme Cell Safety", label_ko="셀 안전"))
+        self.write(specs / "acme-templates" / f"{self.shared[0]}.json", override)
+
+        self.shared_registry = gen.ID_REGISTRY_PATH.read_bytes()
+        self.output = self.tmp / "out"
+        run_generator("--organizations", specs, "--organizations-output", self.output, "--cache-dir", self.tmp / "cache")
+        self.specs = specs
+
+    def write(self, path, data):
+        path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+    def read(self, name):
+        return json.loads((self.output / name).read_text(encoding="utf-8"))
+
+    def records(self, organization):
+        skills = self.read("skills.json")["skills"]
+        return [skills[ref] for ref in self.read(f"{organization}.json")["skill_refs"]]
+
+    def test_shared_skills_are_stored_once(self):
+        manifest = self.read("manifest.json")
+        skills = self.read("skills.json")["skills"]
+        organizations = manifest["organizations"]
+        self.assertEqual(manifest["total_references"], sum(entry["skills"] for entry in organizations.values()))
+        self.assertEqual(manifest["unique_skills"], len(skills))
+        # 본문이 같은 레코드는 조직이 달라도 한 번만 저장
+        distinct = {
+            json.dumps(record, ensure_ascii=False, sort_keys=True)
+            for organization in organizations
+            for record in self.records(organization)
+        }
+        self.assertEqual(len(skills), len(distinct))
+        self.assertLess(len(skills), len(RECORDS) * 2)
+
+        self.assertEqual(
+            [without_related(record) for record in self.records("alpha")], [without_related(record) for record in RECORDS]
+        )
+        self.assertEqual(
+            self.records("beta"), [record for record in self.records("alpha") if record["domain"] in self.shared[:2]]
+        )
+        # 명세는 파일 이름 순(acme → alpha → beta): alpha는 acme가 덮어쓰지 않은 도메인을 재사용
+        self.assertEqual(organizations["acme"]["reused_domains"], 0)
+        self.assertEqual(organizations["alpha"]["reused_domains"], len(self.shared) - 1)
+        self.assertEqual(organizations["beta"]["reused_domains"], 2)
+
+    def test_organization_only_ids_start_after_offset(self):
+        acme = self.records("acme")
+        self.assertEqual([r["domain"] for r in acme[-1:]], ["acme-welding"])
+        self.assertEqual(acme[-1]["skill_id"], f"RSF-AWA-{gen.ORGANIZATION_ID_OFFSET + 1}")
+
+        shared_ids = {record["skill_id"] for record in RECORDS}
+        added = [record for record in acme if record["skill_id"] not in shared_ids]
+        self.assertEqual(
+            sorted(record["skill_id"] for record in added),
+            sorted([f"RSF-AWA-{gen.ORGANIZATION_ID_OFFSET + 1}", f"RSF-IRC-{gen.ORGANIZATION_ID_OFFSET + 1}"]),
+        )
+        # 덮어쓴 도메인의 기존 스킬은 공유 번호를 그대로 쓴다
+        acme_first = {r["preferred_label_en"]: r["skill_id"] for r in acme if r["domain"] == self.shared[0]}
+        for record in RECORDS:
+            if record["domain"] == self.shared[0]:
+                self.assertEqual(acme_first[record["preferred_label_en"]], record["skill_id"])
+
+        self.assertEqual(gen.ID_REGISTRY_PATH.read_bytes(), self.shared_registry)
+        own = json.loads((self.specs / "ids" / "acme.json").read_text(encoding="utf-8"))["domains"]
+        self.assertEqual(own["acme-welding"], {"knowledge|Arc Welding": gen.ORGANIZATION_ID_OFFSET + 1})
+        self.assertEqual(own[self.shared[0]], {"knowledge|Acme Cell Safety": gen.ORGANIZATION_ID_OFFSET + 1})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+"""패킹 아카이브 쓰기 → mmap 조회 왕복"""
+
+import unittest
+
+from support import RECORDS, TempDirTestCase, build, gen
+
+
+class PackedArchiveTest(TempDirTestCase):
+    def test_round_trip(self):
+        path = self.tmp / "skills.pack"
+        build(gen.PackedArchiveBuilder()).write(path)
+        with gen.PackedArchive(path) as archive:
+            self.assertEqual(len(archive), len(RECORDS))
+            for record in RECORDS:
+                self.assertEqual(archive.get(record["skill_id"]), record)
+            self.assertIsNone(archive.get("RSF-IRC-999"))
+            self.assertIsNone(archive.get("RSF-IRC-0001-TOO-LONG"))
+            self.assertIsNone(archive.get(""))
+
+    def test_rejects_other_files(self):
+        path = self.tmp / "not.pack"
+        path.write_bytes(b"\0" * gen.PACK_HEADER.size)
+        with self.assertRaises(ValueError):
+            gen.PackedArchive(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
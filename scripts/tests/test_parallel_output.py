@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+"""--workers 병렬 생성 출력 = 직렬 출력 (json / ndjson 바이트 단위)"""
+
+import unittest
+
+from support import TempDirTestCase, gen, run_generator
+
+
+class ParallelOutputTest(TempDirTestCase):
+    def generate(self, fmt, workers):
+        path = self.tmp / f"catalog.{workers}.{fmt}"
+        run_generator("--output", path, "--format", fmt, "--workers", workers, "--cache-dir", self.tmp / "cache")
+        return path.read_bytes()
+
+    def test_workers_match_serial(self):
+        for fmt in gen.OUTPUT_FORMATS:
+            with self.subTest(fmt=fmt):
+                serial = self.generate(fmt, 1)
+                self.assertTrue(serial)
+                self.assertEqual(self.generate(fmt, 3), serial)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""검색 역색인: route.ts와 같은 가산점 상수, skills.json 색인이 route.ts 평탄화 순서·가산점과 일치"""
+
+import hashlib
+import json
+import re
+import unittest
+
+from support import REPO_ROOT, SKILLS, TempDirTestCase, build, gen
+
+ROUTE_PATH = REPO_ROOT / "app" / "api" / "search" / "route.ts"
+
+
+def route_constants():
+    """route.ts의 SMART_FACTORY_DOMAIN_BOOSTS / SMART_FACTORY_KEYWORDS"""
+    source = ROUTE_PATH.read_text(encoding="utf-8")
+    domains_block = re.search(r"SMART_FACTORY_DOMAIN_BOOSTS[^{]*\{(.*?)\};", source, re.S).group(1)
+    keywords_block = re.search(r"SMART_FACTORY_KEYWORDS[^\[]*\[\s*(.*?)\];", source, re.S).group(1)
+    domains = {key: int(value) for key, value in re.findall(r"(\w+):\s*(\d+)", domains_block)}
+    keywords = [(term, int(weight)) for term, weight in re.findall(r"term: '([^']+)', weight: (\d+)", keywords_block)]
+    return domains, keywords
+
+
+class SearchIndexTest(TempDirTestCase):
+    def test_constants_match_route(self):
+        domains, keywords = route_constants()
+        self.assertEqual(gen.SMART_FACTORY_DOMAIN_BOOSTS, domains)
+        self.assertEqual(list(gen.SMART_FACTORY_KEYWORDS), keywords)
+
+    def test_route_index_matches_flattened_skills(self):
+        source = REPO_ROOT / gen.ROUTE_SEARCH_SOURCE
+        path = self.tmp / "skills-search-index.json"
+        gen.write_route_search_index(source, path)
+        index = json.loads(path.read_text(encoding="utf-8"))
+        self.assertEqual(index["source"]["sha256"], hashlib.sha256(source.read_bytes()).hexdigest())
+
+        # route.ts의 flattenSkills 순서와 calculateSmartFactoryBoost를 그대로 따라 계산
+        domain_boosts, keywords = route_constants()
+        data = json.loads(source.read_text(encoding="utf-8"))
+        flat = [(domain, skill) for domain, skills in data.items() for skill in skills]
+        self.assertEqual(index["skill_ids"], [skill["uri"] or f"{domain}:{skill['label']}" for domain, skill in flat])
+        expected = []
+        for domain, skill in flat:
+            haystack = f"{skill['label']} {skill['description']}".lower()
+            expected.append(sum(weight for term, weight in keywords if term in haystack) + domain_boosts.get(domain, 0))
+        self.assertEqual(index["boosts"], expected)
+
+        for ordinal in (0, len(flat) // 2, len(flat) - 1):
+            token = gen.search_tokens(flat[ordinal][1]["label"])[0]
+            self.assertIn(ordinal, [posting[0] for posting in index["postings"][token]])
+
+        # 배포된 색인이 현재 skills.json과 맞아야 route.ts가 사용한다
+        self.assertEqual((REPO_ROOT / gen.DEFAULT_ROUTE_SEARCH_INDEX).read_bytes(), path.read_bytes())
+
+    def test_catalog_index_postings(self):
+        index = build(gen.SearchIndexBuilder()).to_dict()
+        self.assertEqual(index["skill_ids"], [skill.skill_id for skill in SKILLS])
+        for ordinal, skill in enumerate(SKILLS):
+            for text in (skill.label_en, skill.label_ko):
+                for token in gen.search_tokens(text):
+                    scores = dict(map(tuple, index["postings"][token]))
+                    self.assertGreaterEqual(scores[ordinal], gen.SEARCH_LABEL_WEIGHT)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""도메인 샤드: 샤드 내용 = 카탈로그, 도메인이 많아도 파일 핸들 수 일정, 매니페스트 후 GC"""
+
+import json
+import resource
+import unittest
+
+from support import RECORDS, TempDirTestCase, build, gen
+
+
+class ShardedCatalogTest(TempDirTestCase):
+    def read_shards(self, directory):
+        manifest = json.loads((directory / "manifest.json").read_text(encoding="utf-8"))
+        shards = {}
+        for entry in manifest["shards"]:
+            records = json.loads((directory / entry["file"]).read_text(encoding="utf-8"))
+            self.assertEqual(len(records), entry["records"])
+            shards[entry["file"].rsplit(".", 2)[0]] = records
+        return manifest, shards
+
+    def expected(self, records, by_type):
+        shards = {}
+        for record in records:
+            key = f"{record['domain']}.{record['skill_type']}" if by_type else record["domain"]
+            shards.setdefault(key, []).append(record)
+        return shards
+
+    def test_shards_match_catalog(self):
+        for by_type in (False, True):
+            directory = self.tmp / f"shards-{by_type}"
+            build(gen.ShardedCatalogBuilder(by_type)).write(directory)
+            manifest, shards = self.read_shards(directory)
+            self.assertEqual(manifest["total"], len(RECORDS))
+            self.assertEqual(shards, self.expected(RECORDS, by_type))
+
+    def test_many_domains_under_low_fd_limit(self):
+        domains, store = gen.replicated_templates(len(RECORDS) * 60)
+        registry = gen.IdRegistry(self.tmp / "ids.json")
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (min(256, hard), hard))
+        try:
+            with gen.use_templates(domains, store), gen.use_id_registry(registry):
+                self.assertGreater(len(gen.DOMAINS), 300)
+                builder = gen.ShardedCatalogBuilder(by_type=True)
+                records = []
+                for skill in gen.iter_skill_records():
+                    builder.add(skill)
+                    records.append(skill.to_dict())
+                builder.write(self.tmp / "shards")
+                manifest, shards = self.read_shards(self.tmp / "shards")
+        finally:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (soft, hard))
+        self.assertEqual(len(manifest["shards"]), len(gen.SKILL_TYPES) * len(domains))
+        self.assertEqual(shards, self.expected(records, True))
+
+    def test_manifest_replaced_before_stale_shards_removed(self):
+        directory = self.tmp / "shards"
+        build(gen.ShardedCatalogBuilder()).write(directory)
+        first = {path.name for path in directory.iterdir()}
+        orphan = directory / f"{RECORDS[0]['domain']}.{'0' * gen.SHARD_HASH_LENGTH}.json"
+        orphan.write_text("[]", encoding="utf-8")
+        (directory / "notes.json").write_text("{}", encoding="utf-8")
+
+        build(gen.ShardedCatalogBuilder(), [skill for skill in gen.iter_skill_records() if skill.skill_type != "competence"]).write(directory)
+        manifest, _shards = self.read_shards(directory)
+        current = {entry["file"] for entry in manifest["shards"]}
+        remaining = {path.name for path in directory.iterdir()}
+        self.assertEqual(remaining, current | {"manifest.json", "notes.json"})
+        self.assertFalse(orphan.exists())
+        self.assertTrue(first - remaining)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+"""스냅샷 체인 델타 재생 (base 압축 포함)과 ontology_snapshots 적재 스크립트"""
+
+import unittest
+
+from support import RECORDS, TempDirTestCase, gen
+
+
+def versions():
+    """레이블 변경, 삭제, 추가, 순서 변경을 섞은 연속 버전"""
+    v1 = [dict(record) for record in RECORDS]
+    v2 = [dict(record) for record in v1[1:]]
+    v2[0]["preferred_label_en"] += " (rev)"
+    v3 = v2 + [dict(v1[0], skill_id="RSF-IRC-901")]
+    v4 = list(reversed(v3))
+    v5 = [dict(record, related_skills=[]) for record in v4[:50]]
+    return [v1, v2, v3, v4, v5]
+
+
+class SnapshotChainTest(TempDirTestCase):
+    def test_delta_replay(self):
+        chain = gen.SnapshotChain(self.tmp)
+        for records in versions():
+            self.assertIsNotNone(chain.record(records, compact_every=2))
+        self.assertIsNone(chain.record(versions()[-1], compact_every=2))
+
+        chain = gen.SnapshotChain(self.tmp)
+        self.assertEqual([entry["kind"] for entry in chain.entries], ["base", "delta", "delta", "base", "delta"])
+        for seq, records in enumerate(versions(), 1):
+            self.assertEqual(chain.restore(seq), records, seq)
+        self.assertEqual(chain.restore(), versions()[-1])
+
+    def test_diff_apply_inverse(self):
+        previous, current = versions()[1:3]
+        self.assertEqual(gen.apply_delta(previous, gen.diff_catalogs(previous, current)), current)
+
+
+class SnapshotSqlTest(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.chain = gen.SnapshotChain(self.tmp / "chain")
+        self.path = self.tmp / "snapshots.sql"
+
+    def export(self, since=None):
+        count = gen.SnapshotChain(self.tmp / "chain").write_sql(self.path, since)
+        return count, self.path.read_text(encoding="utf-8") if self.path.exists() else ""
+
+    def test_full_export(self):
+        for records in versions()[:3]:
+            self.chain.record(records)
+        count, sql = self.export()
+        self.assertEqual(count, 3)
+        self.assertEqual(sql.count("INSERT INTO ontology_snapshots"), 3)
+        self.assertEqual(sql.count("ON CONFLICT (domain_id, sequence) DO NOTHING"), 3)
+        self.assertIn("'base', 1, NULL,", sql)
+        self.assertIn("'delta', 3, (SELECT id FROM ontology_snapshots WHERE domain_id = ", sql)
+        self.assertTrue(sql.rstrip().endswith("COMMIT;"))
+
+    def test_exports_only_new_versions(self):
+        all_versions = versions()
+        for records in all_versions[:3]:
+            self.chain.record(records)
+        self.assertEqual(self.export()[0], 3)
+
+        # 새 버전이 없으면 지난 스크립트를 그대로 둔다
+        before = self.path.read_text(encoding="utf-8")
+        self.assertEqual(self.export()[0], 0)
+        self.assertEqual(self.path.read_text(encoding="utf-8"), before)
+
+        self.chain = gen.SnapshotChain(self.tmp / "chain")
+        self.chain.record(all_versions[3])
+        count, sql = self.export()
+        self.assertEqual(count, 1)
+        self.assertEqual(sql.count("INSERT INTO ontology_snapshots"), 1)
+        # 잘린 범위의 첫 델타도 직전 sequence를 부모로 가리킨다
+        self.assertIn("'delta', 4, (SELECT id FROM ontology_snapshots WHERE domain_id = 'robot-smartfactory' AND sequence = 3)", sql)
+        self.assertNotIn('"records"', sql)
+
+        count, sql = self.export(since=0)
+        self.assertEqual(count, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
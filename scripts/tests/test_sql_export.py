@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""DB 일괄 적재: SQL 스크립트를 SQLite에 실제로 적용(재실행 멱등), COPY 스크립트 구조, 검증 실패 시 잔여 파일 없음"""
+
+import contextlib
+import io
+import sqlite3
+import unittest
+
+from support import RECORDS, SKILLS, TempDirTestCase, TemplateCopyTestCase, build, gen
+
+# database/supabase_schema.sql의 skills 테이블을 SQLite 타입으로 옮긴 것
+SQLITE_SKILLS_TABLE = """
+CREATE TABLE skills (
+    id INTEGER PRIMARY KEY,
+    label TEXT NOT NULL,
+    korean_label TEXT,
+    english_label TEXT,
+    type TEXT NOT NULL CHECK (type IN ('knowledge', 'skill/competence', 'attitude')),
+    uri TEXT UNIQUE,
+    description TEXT
+);
+"""
+
+
+def unescape_copy_field(value):
+    if value == "\\N":
+        return None
+    escapes = {"\\\\": "\\", "\\t": "\t", "\\n": "\n", "\\r": "\r"}
+    out, i = [], 0
+    while i < len(value):
+        pair = value[i : i + 2]
+        if pair in escapes:
+            out.append(escapes[pair])
+            i += 2
+        else:
+            out.append(value[i])
+            i += 1
+    return "".join(out)
+
+
+class SqlExportTest(TempDirTestCase):
+    def export(self, mode, batch_size=gen.DEFAULT_SQL_BATCH_SIZE, organization=None):
+        path = self.tmp / f"skills.{mode}.sql"
+        written = build(gen.SqlExportWriter(path, mode, batch_size, organization)).write(path)
+        self.assertEqual(written, [(path, path.stat().st_size)])
+        self.assertFalse(path.with_name(f".{path.name}.tmp").exists())
+        return path.read_text(encoding="utf-8")
+
+    def test_sql_loads_into_sqlite_and_rerun_is_idempotent(self):
+        expected = sorted(gen.skill_table_row(record) for record in RECORDS)
+        for batch_size in (gen.DEFAULT_SQL_BATCH_SIZE, 7):
+            with self.subTest(batch_size=batch_size):
+                script = self.export("sql", batch_size)
+                db = sqlite3.connect(":memory:")
+                db.executescript(SQLITE_SKILLS_TABLE)
+                columns = ", ".join(gen.SKILL_TABLE_COLUMNS)
+                for _run in range(2):
+                    db.executescript(script)
+                    rows = sorted(db.execute(f"SELECT {columns} FROM skills"))
+                    self.assertEqual(rows, expected)
+                ids = [row[0] for row in db.execute("SELECT id FROM skills ORDER BY id")]
+                self.assertEqual(ids, list(range(1, len(RECORDS) + 1)))
+                db.close()
+
+    def test_copy_script_structure(self):
+        lines = self.export("copy").splitlines()
+        columns = ", ".join(gen.SKILL_TABLE_COLUMNS)
+        start = lines.index(f"COPY rsf_skills_stage ({columns}) FROM STDIN;")
+        end = lines.index("\\.", start)
+        rows = [tuple(unescape_copy_field(field) for field in line.split("\t")) for line in lines[start + 1 : end]]
+        self.assertEqual(rows, [gen.skill_table_row(record) for record in RECORDS])
+
+        self.assertEqual(lines[1], "BEGIN;")
+        self.assertIn("CREATE TEMP TABLE rsf_skills_stage (", lines[:start])
+        self.assertIn(f"SELECT {columns} FROM rsf_skills_stage", lines[end:])
+        self.assertTrue(any(line.startswith("ON CONFLICT (uri) DO UPDATE SET") for line in lines[end:]))
+        self.assertEqual(lines[-1], "COMMIT;")
+
+    def test_copy_script_with_organization_relations(self):
+        lines = self.export("copy", 10, "ACME").splitlines()
+        skill_rows, relation_blocks, block = [], [], None
+        for line in lines:
+            if line.startswith("COPY rsf_skills_stage"):
+                block = skill_rows
+            elif line.startswith("COPY rsf_relations_stage"):
+                block = []
+                relation_blocks.append(block)
+            elif line == "\\.":
+                block = None
+            elif block is not None:
+                block.append(line.split("\t"))
+        self.assertEqual(len(skill_rows), len(RECORDS))
+        self.assertEqual(
+            [row for block in relation_blocks for row in block],
+            [[record["esco_uri"], record["domain"], f"Level {record['proficiency_level']}"] for record in RECORDS],
+        )
+        # 관계 블록은 batch_size 이하이고 도메인 경계를 넘지 않는다
+        for block in relation_blocks:
+            self.assertLessEqual(len(block), 10)
+            self.assertEqual(len({row[1] for row in block}), 1)
+        self.assertIn("INSERT INTO enablers (organization_id, name, code, description)", lines)
+        self.assertEqual(lines[-1], "COMMIT;")
+
+    def test_no_file_until_first_record(self):
+        path = self.tmp / "out" / "skills.sql"
+        writer = gen.SqlExportWriter(path, "sql")
+        self.assertFalse((self.tmp / "out").exists())
+        writer.add(SKILLS[0])
+        self.assertTrue(path.with_name(f".{path.name}.tmp").exists())
+        writer.write(path)
+        self.assertFalse(path.with_name(f".{path.name}.tmp").exists())
+
+
+class SqlExportValidationTest(TemplateCopyTestCase):
+    def test_failed_validation_leaves_no_files(self):
+        domain = next(iter(self.domains))
+        data = self.read_template(domain)
+        data["knowledge"][0]["label_ko"] = ""
+        self.write_template(domain, data)
+
+        emit_sql, emit_copy = self.tmp / "skills.sql", self.tmp / "skills.copy.sql"
+        argv = [
+            "--output", str(self.tmp / "catalog.json"),
+            "--cache-dir", str(self.tmp / "cache"),
+            "--validate",
+            "--emit-sql", str(emit_sql),
+            "--emit-copy", str(emit_copy),
+        ]
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            self.assertEqual(gen.main(argv), 1)
+        self.assertIn("missing_field", out.getvalue())
+        leftovers = {path.name for path in self.tmp.iterdir()} - {"templates", "ids.json", "cache"}
+        self.assertEqual(leftovers, set())
+
+
+if __name__ == "__main__":
+    unittest.main()
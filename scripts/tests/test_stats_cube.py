@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""집계 큐브: 모든 칸(각 축의 값과 "*" 조합)이 카탈로그를 직접 센 값과 같다"""
+
+import itertools
+import json
+import unittest
+
+from support import RECORDS, SKILLS, TempDirTestCase, gen, run_generator
+
+
+def brute_force_count(domain, skill_type, role, level):
+    return sum(
+        1
+        for record in RECORDS
+        if domain in (gen.CUBE_ALL, record["domain"])
+        and skill_type in (gen.CUBE_ALL, record["skill_type"])
+        and (role == gen.CUBE_ALL or role in record["role_mapping"])
+        and level in (gen.CUBE_ALL, record["proficiency_level"])
+    )
+
+
+class StatsCubeTest(TempDirTestCase):
+    def assert_cube_matches_catalog(self, cube):
+        names = [dimension["name"] for dimension in cube["dimensions"]]
+        self.assertEqual(names, ["domain", "skill_type", "role", "proficiency_level"])
+        values = [dimension["values"] for dimension in cube["dimensions"]]
+        self.assertEqual(len(cube["counts"]), len(list(itertools.product(*values))))
+        for index, key in zip(itertools.product(*(range(len(axis)) for axis in values)), itertools.product(*values)):
+            offset = sum(i * stride for i, stride in zip(index, cube["strides"]))
+            self.assertEqual(cube["counts"][offset], brute_force_count(*key), key)
+
+    def test_cube_cells_equal_brute_force_counts(self):
+        stats = gen.SkillStats()
+        for skill in SKILLS:
+            stats.add(skill)
+        cube = stats.to_cube()
+        self.assert_cube_matches_catalog(cube)
+        all_index = sum((len(d["values"]) - 1) * s for d, s in zip(cube["dimensions"], cube["strides"]))
+        self.assertEqual(cube["counts"][all_index], len(RECORDS))
+
+    def test_parallel_cli_cube_matches_serial(self):
+        cubes = []
+        for workers in (1, 3):
+            path = self.tmp / f"cube-{workers}.json"
+            run_generator(
+                "--output", self.tmp / f"catalog-{workers}.json",
+                "--cube", path,
+                "--workers", workers,
+                "--cache-dir", self.tmp / "cache",
+            )
+            cubes.append(json.loads(path.read_text(encoding="utf-8")))
+        self.assertEqual(cubes[0], cubes[1])
+        self.assert_cube_matches_catalog(cubes[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
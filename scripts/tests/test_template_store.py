@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""템플릿 스냅샷 캐시: import만으로는 캐시를 쓰지 않고, 켜면 미뤄 둔 스냅샷을 기록"""
+
+import json
+import shutil
+import unittest
+
+from support import TempDirTestCase, gen
+
+
+class TemplateStoreTest(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.source = self.tmp / "templates"
+        shutil.copytree(gen.TEMPLATE_DIR, self.source)
+        self.cache = self.tmp / "cache"
+
+    def test_cache_dir_is_anchored_to_repo(self):
+        self.assertTrue(gen.TEMPLATE_CACHE_DIR.is_absolute())
+        self.assertEqual(gen.TEMPLATE_CACHE_DIR.parents[2], gen.TEMPLATE_DIR.parents[2])
+
+    def test_no_writes_until_enabled(self):
+        store = gen.TemplateStore(self.source, self.cache, persist=False)
+        domains = store.load("domains")
+        self.assertFalse(self.cache.exists())
+
+        store.enable_persist()
+        self.assertTrue((self.cache / "domains.marshal").exists())
+        # 스냅샷만으로 같은 내용을 읽는다
+        self.assertEqual(gen.TemplateStore(self.source, self.cache).load("domains"), domains)
+
+    def test_snapshot_follows_source_edits(self):
+        gen.TemplateStore(self.source, self.cache).load("domains")
+        domains = json.loads((self.source / "domains.json").read_text(encoding="utf-8"))
+        first = next(iter(domains))
+        domains[first]["name_en"] += " (edited)"
+        (self.source / "domains.json").write_text(json.dumps(domains, ensure_ascii=False), encoding="utf-8")
+        self.assertEqual(gen.TemplateStore(self.source, self.cache).load("domains"), domains)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""감시 모드: 바뀐 템플릿의 도메인만 재생성, 깨진 JSON은 알리고 이전 출력 유지"""
+
+import contextlib
+import io
+import unittest
+
+from support import TemplateCopyTestCase, gen
+
+
+class WatchSessionTest(TemplateCopyTestCase):
+    def setUp(self):
+        super().setUp()
+        self.output = self.tmp / "watch.json"
+        self.session = gen.WatchSession(self.output, "json", lambda domains: ({}, []), self.store)
+        self.assertEqual(self.session.rebuild(), list(self.domains))
+
+    def step(self):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            rebuilt = self.session.step()
+        return rebuilt, out.getvalue()
+
+    def assert_matches_full_build(self):
+        full = self.tmp / "full.json"
+        gen.build_parallel(full, "json", 1)
+        self.assertEqual(self.output.read_bytes(), full.read_bytes())
+
+    def test_edit_rebuilds_only_that_domain(self):
+        self.assertEqual(self.step(), (None, ""))
+
+        domain = list(self.domains)[1]
+        data = self.read_template(domain)
+        data["skill"][0][3] += " (revised)"
+        self.write_template(domain, data)
+
+        rebuilt, log = self.step()
+        self.assertEqual(rebuilt, [domain])
+        self.assertIn(self.domains[domain]["name_ko"], log)
+        self.assert_matches_full_build()
+
+    def test_malformed_json_is_reported_and_session_continues(self):
+        domain = list(self.domains)[0]
+        before = self.output.read_bytes()
+        data = self.read_template(domain)
+        (self.source / f"{domain}.json").write_text('{"knowledge": [', encoding="utf-8")
+
+        rebuilt, log = self.step()
+        self.assertIsNone(rebuilt)
+        self.assertIn("템플릿 오류", log)
+        self.assertEqual(self.output.read_bytes(), before)
+
+        # 다음 저장에서 고친 템플릿을 다시 읽는다
+        data["knowledge"][0]["label_en"] += " II"
+        self.write_template(domain, data)
+        rebuilt, _log = self.step()
+        self.assertEqual(rebuilt, [domain])
+        self.assertNotEqual(self.output.read_bytes(), before)
+        self.assert_matches_full_build()
+
+
+if __name__ == "__main__":
+    unittest.main()